@@ -119,10 +119,14 @@ from dotenv import load_dotenv
 
 # ייבוא Sports API לקבלת תאריכים אמיתיים
 try:
-    from backend.sports_api import SportsAPIManager
+    from sports_api import get_sports_api
     SPORTS_API_AVAILABLE = True
 except ImportError:
-    SPORTS_API_AVAILABLE = False
+    try:
+        from backend.sports_api import get_sports_api
+        SPORTS_API_AVAILABLE = True
+    except ImportError:
+        SPORTS_API_AVAILABLE = False
 
 # 
 # CONFIGURATION & INITIALIZATION
@@ -480,7 +484,7 @@ def analyze_match(home: str, away: str, league: str,
                 print(f"✅ Phase 2: Context fetched - API calls: {live_context['metadata']['api_calls_used']}, Cache: {live_context['metadata']['cache_efficiency']}")
             else:
                 # Fallback: Legacy mode (רק תאריך)
-                sports_api = SportsAPIManager()
+                sports_api = get_sports_api()
                 try:
                     loop = asyncio.get_running_loop()
                     import concurrent.futures
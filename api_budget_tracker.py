@@ -1,7 +1,7 @@
 """
 💰 API Budget Tracker - Smart Cost Control
 Created by: Rafael & AI Assistant (Phase 2)
-Version: 1.0 - Production Ready
+Version: 2.0 - Upstream rate-limit headers
 
 מטרה:
 מעקב אחר שימוש ב-API-Sports למניעת חריגה ממכסת 100 קריאות/יום (Free Tier)
@@ -14,6 +14,11 @@ Version: 1.0 - Production Ready
 ✅ Per-endpoint tracking (standings, form, h2h)
 ✅ Warning alerts למשתמש
 ✅ Metrics export ל-/api/api-budget/status
+✅ כותרות x-ratelimit-* של API-Sports (יומי + לדקה) מסנכרנות את המונים -
+   המקור האמיתי הוא ה-upstream, לא ספירה מקומית
+✅ Token bucket לדקה - ממתינים מקומית לפני שה-upstream מחזיר 429
+✅ reserve(n) / release(r) - שריון תקציב לכמה קריאות במכה אחת (fetch מקבילי);
+   מחזיק השריון מנצל אותו בלי נעילה, וכל השאר רואים total_calls + reserved
 
 עקרונות:
 - ב-80% מהמכסה: אזהרה
@@ -22,9 +27,12 @@ Version: 1.0 - Production Ready
 """
 
 import asyncio
+import contextvars
 import logging
+import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -51,6 +59,103 @@ class EndpointType(str, Enum):
     OTHER = "other"
 
 
+class TokenBucket:
+    """
+    🪣 Token bucket - capacity טוקנים, מתמלא ב-refill_per_second
+
+    sync() מיישר את הדלי למה שה-upstream דיווח (X-RateLimit-Remaining),
+    כך שגם קריאות מ-workers אחרים נלקחות בחשבון.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def wait_time(self, amount: float = 1) -> float:
+        """כמה שניות עד שיהיו amount טוקנים (0 = עכשיו)"""
+        missing = amount - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.refill_per_second if self.refill_per_second > 0 else float("inf")
+
+    def try_take(self, amount: float = 1) -> bool:
+        if self.tokens >= amount:
+            self._tokens -= amount
+            return True
+        return False
+
+    def sync(self, remaining: float, capacity: Optional[float] = None) -> None:
+        """יישור לפי ה-upstream (capacity חדש → גם קצב המילוי מתעדכן לפי דקה)"""
+        remaining = max(0.0, float(remaining))
+        self._refill()
+        if capacity and capacity != self.capacity:
+            # מכסה חדשה (למשל tier בתשלום) - מאמצים את מה שה-upstream דיווח
+            self.capacity = capacity
+            self.refill_per_second = capacity / 60.0
+            self._tokens = min(capacity, remaining)
+            return
+        # בקשות שעדיין בטיסה לא מופיעות ב-remaining - לא מגדילים מעבר למקומי
+        self._tokens = min(self._tokens, remaining)
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class BudgetReservation:
+    """
+    🎟️ שריון שחזר מ-reserve() - קריאות שכבר הובטחו לתוכנית אחת
+
+    בתוך `with reservation:` (וב-tasks שנוצרים בתוכו) acquire מנצל את השריון
+    בלי נעילה, ו-record_call מוריד את הקריאה מ-reserved - כך שקריאה משוריינת
+    נספרת פעם אחת. בסוף: await tracker.release(reservation).
+    """
+
+    __slots__ = ("granted", "spent", "recorded", "_token")
+
+    def __init__(self, granted: int):
+        self.granted = granted
+        self.spent = 0       # acquire שעבר על חשבון השריון
+        self.recorded = 0    # מתוכם - נרשמו ב-record_call
+        self._token = None
+
+    @property
+    def remaining(self) -> int:
+        return self.granted - self.spent
+
+    def __enter__(self) -> "BudgetReservation":
+        self._token = _active_reservation.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _active_reservation.reset(self._token)
+        self._token = None
+
+
+# השריון של התוכנית הנוכחית (עובר אוטומטית ל-tasks שנוצרים בתוך ה-with)
+_active_reservation: contextvars.ContextVar[Optional[BudgetReservation]] = contextvars.ContextVar(
+    "budget_reservation", default=None
+)
+
+
 @dataclass
 class DailyUsage:
     """
@@ -106,6 +211,19 @@ class APIBudgetTracker:
         TierType.UNLIMITED: 999999
     }
 
+    # Per-minute limits (עד שה-upstream מדווח X-RateLimit-Limit)
+    TIER_MINUTE_LIMITS = {
+        TierType.FREE: 10,
+        TierType.PAID: 300,
+        TierType.UNLIMITED: 450
+    }
+
+    # כותרות API-Sports (direct וגם RapidAPI)
+    DAILY_LIMIT_HEADER = "x-ratelimit-requests-limit"
+    DAILY_REMAINING_HEADER = "x-ratelimit-requests-remaining"
+    MINUTE_LIMIT_HEADER = "x-ratelimit-limit"
+    MINUTE_REMAINING_HEADER = "x-ratelimit-remaining"
+
     # Cost per call (in USD)
     COST_PER_CALL = {
         TierType.FREE: 0.0,  # Free tier = $0
@@ -123,6 +241,16 @@ class APIBudgetTracker:
         self.tier = TierType(tier.lower())
         self.daily_limit = self.TIER_LIMITS[self.tier]
 
+        # Per-minute limiter (מסונכרן מכותרות x-ratelimit-*)
+        minute_limit = self.TIER_MINUTE_LIMITS[self.tier]
+        self.minute_bucket = TokenBucket(minute_limit, minute_limit / 60.0)
+
+        # מה שה-upstream דיווח בתשובה האחרונה
+        self._upstream: Dict[str, Any] = {}
+        self._reserved = 0
+        self._throttled = 0
+        self._throttle_wait = 0.0
+
         # Current day usage
         self._current_usage = DailyUsage(tier=self.tier)
 
@@ -144,6 +272,8 @@ class APIBudgetTracker:
         """
         ✅ בדוק אם ניתן לבצע קריאת API
 
+        קריאות ששוריינו (reserve) ועוד לא נרשמו שמורות למי ששריין אותן.
+
         Args:
             endpoint: סוג ה-endpoint (אופציונלי, למטרות לוגים)
 
@@ -155,8 +285,11 @@ class APIBudgetTracker:
             await self._check_and_reset_if_needed()
 
             # Check if limit reached
-            if self._current_usage.total_calls >= self.daily_limit:
-                logger.error(f"⛔ API Budget EXCEEDED: {self._current_usage.total_calls}/{self.daily_limit}")
+            if self._current_usage.total_calls + self._reserved >= self.daily_limit:
+                logger.error(
+                    f"⛔ API Budget EXCEEDED: {self._current_usage.total_calls}/{self.daily_limit} "
+                    f"(reserved={self._reserved})"
+                )
                 return False
 
             # Warning at 80%
@@ -172,6 +305,129 @@ class APIBudgetTracker:
 
             return True
 
+    async def reserve(self, calls: int, endpoint: Optional[EndpointType] = None) -> BudgetReservation:
+        """
+        🎟️ שריון עד calls קריאות מהתקציב היומי - נעילה אחת לכל התוכנית
+
+        מי שמתכנן כמה fetches במקביל משריין מראש, כך ששני מתכננים לא מתחייבים
+        על אותן קריאות אחרונות. בתוך `with reservation:` הקריאות עצמן עוברות
+        acquire בלי נעילה ונרשמות כרגיל (record_call מוריד אותן מהשריון),
+        ובסוף משחררים את מה שלא נוצל עם release.
+
+        Returns:
+            BudgetReservation (granted = כמה קריאות שוריינו בפועל, 0..calls)
+        """
+        if calls <= 0:
+            return BudgetReservation(0)
+        async with self._lock:
+            await self._check_and_reset_if_needed()
+            available = self.daily_limit - self._current_usage.total_calls - self._reserved
+            granted = max(0, min(calls, available))
+            self._reserved += granted
+
+        if granted < calls:
+            endpoint_name = endpoint.value if endpoint else "plan"
+            logger.warning(f"🎟️ Budget reservation for {endpoint_name}: {granted}/{calls} granted")
+        return BudgetReservation(granted)
+
+    async def release(self, reservation: BudgetReservation) -> None:
+        """
+        🎟️ שחרור מה שלא נרשם מהשריון (בסוף התוכנית)
+
+        קריאה שעוד בטיסה אחרי release נרשמת כקריאה רגילה (לא מורידה שוב מ-reserved).
+        """
+        async with self._lock:
+            self._reserved = max(0, self._reserved - (reservation.granted - reservation.recorded))
+            reservation.granted = reservation.spent = reservation.recorded
+
+    async def acquire(self, endpoint: Optional[EndpointType] = None, max_wait: float = 5.0) -> bool:
+        """
+        🪣 לפני כל בקשה ל-upstream: תקציב יומי + טוקן מהדלי של הדקה
+
+        אם אין טוקן - ממתינים מקומית (עד max_wait בסך הכל, גם כשמתחרים לוקחים
+        את הטוקן שהתפנה) במקום לקבל 429 מה-upstream.
+        בתוך `with reservation:` עם שריון פנוי - הקריאה כבר מובטחת, בלי נעילה.
+
+        Returns:
+            False אם התקציב היומי נגמר או שההמתנה הכוללת הייתה עוברת את max_wait
+        """
+        reservation = _active_reservation.get()
+        if reservation is not None and reservation.remaining > 0:
+            reservation.spent += 1  # כבר בתוך reserved - אף אחד אחר לא יקבל אותה
+        else:
+            reservation = None
+            if not await self.can_make_call(endpoint):
+                return False
+
+        deadline = time.monotonic() + max_wait
+        while not self.minute_bucket.try_take():
+            wait = self.minute_bucket.wait_time()
+            if time.monotonic() + wait > deadline:
+                logger.warning(f"🪣 Per-minute limit reached - next slot in {wait:.1f}s (max_wait={max_wait:.1f}s)")
+                if reservation is not None:
+                    reservation.spent -= 1
+                return False
+            self._throttled += 1
+            started = time.monotonic()
+            await asyncio.sleep(wait)
+            self._throttle_wait += time.monotonic() - started
+        return True
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        📡 סנכרון מכותרות x-ratelimit-* של תשובת API-Sports
+
+        היומי: daily_limit והשימוש של היום מתיישרים למה שה-upstream סופר
+        (כולל קריאות של workers / תהליכים אחרים). לדקה: הדלי מתיישר.
+        """
+        daily_limit = _header_int(headers, self.DAILY_LIMIT_HEADER)
+        daily_remaining = _header_int(headers, self.DAILY_REMAINING_HEADER)
+        minute_limit = _header_int(headers, self.MINUTE_LIMIT_HEADER)
+        minute_remaining = _header_int(headers, self.MINUTE_REMAINING_HEADER)
+
+        if daily_limit is None and daily_remaining is None and minute_remaining is None:
+            return
+
+        if daily_limit:
+            self.daily_limit = daily_limit
+        if daily_remaining is not None:
+            self._current_usage.total_calls = max(0, self.daily_limit - daily_remaining)
+        if minute_remaining is not None:
+            self.minute_bucket.sync(minute_remaining, minute_limit)
+
+        self._upstream = {
+            "daily_limit": daily_limit,
+            "daily_remaining": daily_remaining,
+            "minute_limit": minute_limit,
+            "minute_remaining": minute_remaining,
+            "updated_at": datetime.now().isoformat()
+        }
+
+    @property
+    def calls_used(self) -> int:
+        """קריאות שנרשמו היום (לפי record_call / כותרות ה-upstream)"""
+        return self._current_usage.total_calls
+
+    @property
+    def calls_remaining(self) -> int:
+        return max(0, self.daily_limit - self._current_usage.total_calls)
+
+    def quota(self) -> Dict[str, Any]:
+        """
+        📊 המכסה הנוכחית (סינכרוני - ל-get_stats / metrics)
+        """
+        return {
+            "daily_limit": self.daily_limit,
+            "calls_used": self._current_usage.total_calls,
+            "calls_remaining": self.calls_remaining,
+            "reserved": self._reserved,
+            "minute_limit": self.minute_bucket.capacity,
+            "minute_tokens": round(self.minute_bucket.tokens, 2),
+            "throttled": self._throttled,
+            "throttle_wait_seconds": round(self._throttle_wait, 2),
+            "upstream": self._upstream or None
+        }
+
     async def record_call(
         self,
         endpoint: EndpointType = EndpointType.OTHER,
@@ -194,6 +450,12 @@ class APIBudgetTracker:
 
             self._current_usage.total_calls += 1
 
+            # קריאה על חשבון שריון - עוברת מ-reserved ל-total_calls (נספרת פעם אחת)
+            reservation = _active_reservation.get()
+            if reservation is not None and reservation.recorded < reservation.spent:
+                reservation.recorded += 1
+                self._reserved = max(0, self._reserved - 1)
+
             # Track by endpoint
             endpoint_name = endpoint.value
             if endpoint_name not in self._current_usage.by_endpoint:
@@ -216,7 +478,7 @@ class APIBudgetTracker:
             await self._check_and_reset_if_needed()
 
             calls_used = self._current_usage.total_calls
-            calls_remaining = self.daily_limit - calls_used
+            calls_remaining = self.calls_remaining
             usage_percent = (calls_used / self.daily_limit * 100) if self.daily_limit > 0 else 0
 
             # Status indicator
@@ -240,6 +502,7 @@ class APIBudgetTracker:
                 "usage_percent": round(usage_percent, 1),
                 "status": status,
                 "by_endpoint": self._current_usage.by_endpoint,
+                "rate_limit": self.quota(),
                 "cost_today_usd": round(estimated_cost_today, 3),
                 "cost_month_estimate_usd": round(estimated_cost_month, 2),
                 "warnings": {
@@ -313,6 +576,8 @@ class APIBudgetTracker:
             old_tier = self.tier
             self.tier = TierType(new_tier.lower())
             self.daily_limit = self.TIER_LIMITS[self.tier]
+            minute_limit = self.TIER_MINUTE_LIMITS[self.tier]
+            self.minute_bucket = TokenBucket(minute_limit, minute_limit / 60.0)
             self._current_usage.tier = self.tier
 
             logger.info(f"🎚️ Tier changed: {old_tier.value} → {self.tier.value} (limit: {self.daily_limit})")
@@ -336,8 +601,8 @@ class APIBudgetTracker:
 
 
 # 🌍 Global instance (singleton)
-# ברירת מחדל: Free Tier (100 calls/day)
-api_budget_tracker = APIBudgetTracker(tier="free")
+# ברירת מחדל: Free Tier (100 calls/day) - הכותרות של ה-upstream מתקנות את המכסה
+api_budget_tracker = APIBudgetTracker(tier=os.getenv("API_SPORTS_TIER", "free"))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,370 @@
+"""
+📼 API Replay - הקלטה והשמעה של תשובות API-Sports (load testing בלי מכסה)
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+אי אפשר לעשות load test בלי לשרוף מכסה אמיתית, ו-DEMO mode מחזיר mock אקראי
+(_get_mock_live_matches) - לא משהו שאפשר להשוות בין ריצות. כאן:
+
+✅ ResponseRecorder - כל תשובת 200 אמיתית נשמרת לדיסק (API_RECORD_DIR)
+✅ ReplayStore - טוען את ההקלטות, התאמה לפי path + params
+✅ שרת replay מקומי - latency (+jitter), הזרקת שגיאות ו-timeouts, seed קבוע
+✅ SportsAPIManager מצביע עליו דרך API_SPORTS_BASE_URL - בלי לשנות קוד
+
+Usage:
+    # 1. הקלטה - מריצים את השרת / סקריפט רגיל מול ה-API האמיתי
+    API_RECORD_DIR=data/api_recordings uvicorn backend.app:app
+
+    # 2. השמעה - בלי רשת, עם latency ושגיאות
+    python api_replay.py serve --dir data/api_recordings --port 8099 \\
+        --latency-ms 80 --jitter-ms 40 --error-rate 0.02 --timeout-rate 0.01
+
+    # 3. הפניית ה-client לשרת ה-replay
+    API_SPORTS_BASE_URL=http://127.0.0.1:8099 API_SPORTS_KEY=replay uvicorn backend.app:app
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_RECORD_DIR = os.getenv("API_RECORD_DIR", "data/api_recordings")
+
+# כותרות שנשמרות עם ההקלטה (השאר לא רלוונטיות להשמעה)
+RECORDED_HEADERS = (
+    "x-ratelimit-requests-limit",
+    "x-ratelimit-requests-remaining",
+    "x-ratelimit-limit",
+    "x-ratelimit-remaining"
+)
+
+_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_params(params: Optional[Mapping[str, Any]]) -> Tuple[Tuple[str, str], ...]:
+    """params כ-tuple ממוין של מחרוזות (httpx שולח הכל כמחרוזת)"""
+    return tuple(sorted((str(key), str(value)) for key, value in (params or {}).items() if value is not None))
+
+
+def recording_key(path: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    🔑 שם קובץ יציב לבקשה: "fixtures-3f2a9c1b7e4d.json"
+
+    אותו path + params (בכל סדר) → אותו קובץ.
+    """
+    path = "/" + path.strip("/")
+    digest = hashlib.sha1(repr((path, normalize_params(params))).encode("utf-8")).hexdigest()[:12]
+    slug = _SLUG.sub("-", path.lower()).strip("-") or "root"
+    return f"{slug}-{digest}"
+
+
+# ============================================================
+# 🎙️ Recorder
+# ============================================================
+
+class ResponseRecorder:
+    """
+    🎙️ שומר תשובות API-Sports לדיסק - קובץ JSON אחד לכל בקשה
+
+    הקלטה חוזרת של אותה בקשה דורסת את הקודמת (הגרסה האחרונה נשמרת).
+    """
+
+    def __init__(self, directory: str = DEFAULT_RECORD_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._recorded = 0
+        self._errors = 0
+        logger.info(f"🎙️ Recording API responses to {directory}")
+
+    def record(
+        self,
+        path: str,
+        params: Optional[Mapping[str, Any]],
+        status_code: int,
+        headers: Mapping[str, str],
+        body: Any
+    ) -> Optional[str]:
+        """
+        שמור תשובה אחת (כתיבה אטומית)
+
+        Returns:
+            נתיב הקובץ, או None אם הכתיבה נכשלה
+        """
+        entry = {
+            "path": "/" + path.strip("/"),
+            "params": dict(normalize_params(params)),
+            "status": status_code,
+            "headers": {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            "recorded_at": datetime.now().isoformat(),
+            "body": body
+        }
+        target = os.path.join(self.directory, recording_key(path, params) + ".json")
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            self._errors += 1
+            logger.warning(f"⚠️ Recording failed for {path}: {e}")
+            return None
+
+        self._recorded += 1
+        return target
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"directory": self.directory, "recorded": self._recorded, "errors": self._errors}
+
+
+# ============================================================
+# 📼 Store
+# ============================================================
+
+class ReplayStore:
+    """
+    📼 ההקלטות בזיכרון
+
+    התאמה מדויקת לפי path + params; עם fallback=True בקשה בלי הקלטה מדויקת
+    מקבלת הקלטה כלשהי של אותו path (מספיק לבדיקות עומס).
+    """
+
+    def __init__(self, directory: str = DEFAULT_RECORD_DIR, fallback: bool = False):
+        self.directory = directory
+        self.fallback = fallback
+        self._entries: Dict[str, Dict] = {}
+        self._by_path: Dict[str, List[str]] = {}
+        self.load()
+
+    def load(self) -> int:
+        """טען (מחדש) את כל קבצי ההקלטה מהתיקייה"""
+        self._entries.clear()
+        self._by_path.clear()
+        if not os.path.isdir(self.directory):
+            logger.warning(f"⚠️ Replay directory not found: {self.directory}")
+            return 0
+
+        for filename in sorted(os.listdir(self.directory)):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename), encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Skipping bad recording {filename}: {e}")
+                continue
+            key = recording_key(entry["path"], entry.get("params"))
+            self._entries[key] = entry
+            self._by_path.setdefault(entry["path"], []).append(key)
+
+        logger.info(f"📼 Loaded {len(self._entries)} recordings from {self.directory}")
+        return len(self._entries)
+
+    def lookup(self, path: str, params: Optional[Mapping[str, Any]] = None) -> Optional[Dict]:
+        entry = self._entries.get(recording_key(path, params))
+        if entry is None and self.fallback:
+            keys = self._by_path.get("/" + path.strip("/"))
+            if keys:
+                entry = self._entries[keys[0]]
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def summary(self) -> Dict[str, int]:
+        """כמה הקלטות לכל path"""
+        return {path: len(keys) for path, keys in sorted(self._by_path.items())}
+
+
+# ============================================================
+# 🎛️ Fault injection
+# ============================================================
+
+class FaultInjector:
+    """
+    🎛️ latency, שגיאות ו-timeouts מוזרקים - עם seed כדי שריצות יהיו משוחזרות
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (500,),
+        timeout_rate: float = 0.0,
+        hang_seconds: float = 30.0,
+        retry_after: Optional[int] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            latency_ms: השהיה בסיסית לכל תשובה
+            jitter_ms: תוספת אקראית 0..jitter_ms
+            error_rate: שיעור התשובות שיוחלפו בשגיאה (0..1)
+            error_statuses: קודי השגיאה להגרלה (לדוגמה 500, 503, 429)
+            timeout_rate: שיעור הבקשות ש"נתקעות" hang_seconds (מעבר ל-timeout של ה-client)
+            retry_after: ערך Retry-After לשגיאות 429/503
+            seed: seed ל-random (ריצות משוחזרות)
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+
+        # Statistics
+        self._errors = 0
+        self._timeouts = 0
+
+    def delay(self) -> float:
+        """השהיה לתשובה הזו, בשניות"""
+        return (self.latency_ms + self._random.uniform(0, self.jitter_ms)) / 1000.0
+
+    def should_hang(self) -> bool:
+        if self.timeout_rate and self._random.random() < self.timeout_rate:
+            self._timeouts += 1
+            return True
+        return False
+
+    def error_status(self) -> Optional[int]:
+        if self.error_rate and self._random.random() < self.error_rate:
+            self._errors += 1
+            return self._random.choice(self.error_statuses)
+        return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "latency_ms": self.latency_ms,
+            "jitter_ms": self.jitter_ms,
+            "error_rate": self.error_rate,
+            "timeout_rate": self.timeout_rate,
+            "injected_errors": self._errors,
+            "injected_timeouts": self._timeouts
+        }
+
+
+# ============================================================
+# 🖥️ Replay server
+# ============================================================
+
+def create_replay_app(store: ReplayStore, faults: Optional[FaultInjector] = None, quota: int = 1_000_000):
+    """
+    🖥️ אפליקציית FastAPI שמגישה את ההקלטות במקום v3.football.api-sports.io
+
+    Args:
+        store: ההקלטות
+        faults: הזרקת latency / שגיאות (None = בלי)
+        quota: ערך כותרות x-ratelimit-* (גבוה - כדי שה-limiter המקומי לא יאט את הבדיקה)
+    """
+    from fastapi import FastAPI, Request
+    from fastapi.responses import JSONResponse
+
+    faults = faults or FaultInjector()
+    app = FastAPI(title="API-Sports Replay", docs_url=None, redoc_url=None)
+    stats = {"requests": 0, "hits": 0, "misses": 0, "started_at": datetime.now().isoformat()}
+    rate_headers = {
+        "x-ratelimit-requests-limit": str(quota),
+        "x-ratelimit-requests-remaining": str(quota),
+        "x-ratelimit-limit": str(quota),
+        "x-ratelimit-remaining": str(quota)
+    }
+
+    @app.get("/_replay/stats")
+    async def replay_stats():
+        return {**stats, "recordings": len(store), "faults": faults.get_stats()}
+
+    @app.get("/{path:path}")
+    async def replay(path: str, request: Request):
+        stats["requests"] += 1
+        started = time.monotonic()
+
+        if faults.should_hang():
+            await asyncio.sleep(faults.hang_seconds)
+
+        await asyncio.sleep(faults.delay())
+
+        status = faults.error_status()
+        if status is not None:
+            headers = dict(rate_headers)
+            if status in (429, 503) and faults.retry_after is not None:
+                headers["Retry-After"] = str(faults.retry_after)
+            return JSONResponse({"errors": {"replay": f"injected {status}"}, "response": []},
+                                status_code=status, headers=headers)
+
+        entry = store.lookup(path, dict(request.query_params))
+        if entry is None:
+            stats["misses"] += 1
+            logger.warning(f"📼 No recording for /{path}?{request.query_params}")
+            return JSONResponse(
+                {"errors": {"replay": "no recording"}, "results": 0, "response": []},
+                status_code=404, headers=rate_headers
+            )
+
+        stats["hits"] += 1
+        logger.debug(f"📼 /{path} served in {time.monotonic() - started:.3f}s")
+        return JSONResponse(entry["body"], status_code=entry.get("status", 200), headers=rate_headers)
+
+    return app
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI Interface
+# ═══════════════════════════════════════════════════════════════════════════════
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SmartSports API-Sports record/replay")
+    parser.add_argument("action", choices=["serve", "list"], help="Action to perform")
+    parser.add_argument("--dir", default=DEFAULT_RECORD_DIR, help="Recordings directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", default="500", help="Comma separated, e.g. 500,503,429")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--retry-after", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--fallback", action="store_true", help="Serve any recording of the same path on a miss")
+
+    args = parser.parse_args()
+    replay_store = ReplayStore(args.dir, fallback=args.fallback)
+
+    if args.action == "list":
+        print(f"📼 {len(replay_store)} recordings in {args.dir}")
+        for endpoint_path, count in replay_store.summary().items():
+            print(f"  {endpoint_path}: {count}")
+
+    elif args.action == "serve":
+        import uvicorn
+
+        injector = FaultInjector(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            error_statuses=tuple(int(code) for code in args.error_status.split(",") if code.strip()),
+            timeout_rate=args.timeout_rate,
+            hang_seconds=args.hang_seconds,
+            retry_after=args.retry_after,
+            seed=args.seed
+        )
+        print(f"📼 Replaying {len(replay_store)} recordings on http://{args.host}:{args.port}")
+        print(f"   API_SPORTS_BASE_URL=http://{args.host}:{args.port}")
+        uvicorn.run(create_replay_app(replay_store, injector), host=args.host, port=args.port, log_level="warning")
@@ -155,10 +155,11 @@ import asyncio
 import hashlib
 import secrets
 import re
+import time
 import random  # 🎲 ליצירת נתונים אקראיים (למשל: אחוזי ניצחון, סטטיסטיקות demo)
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
-from typing import Optional, List, Dict, Any, Union, Callable, Annotated
+from typing import Optional, List, Dict, Any, Tuple, Union, Callable, Annotated
 from contextlib import asynccontextmanager
 from functools import lru_cache, wraps
 from enum import Enum
@@ -178,9 +179,11 @@ from fastapi import (
     Response,
     BackgroundTasks,
     status,
-    Body
+    Body,
+    WebSocket,
+    WebSocketDisconnect
 )
-from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
@@ -205,6 +208,18 @@ import feedparser
 from bs4 import BeautifulSoup
 import httpx
 
+# HTTP client משותף (connection pool + keep-alive + HTTP/2) - נפתח ב-lifespan
+try:
+    from http_client import http_client
+    from fanout import fan_out, FetchTask
+    from records import to_json
+    from match_aggregates import FixtureHistory, batch_form
+except ImportError:
+    from backend.http_client import http_client
+    from backend.fanout import fan_out, FetchTask
+    from backend.records import to_json
+    from backend.match_aggregates import FixtureHistory, batch_form
+
 # Security - JWT והצפנה
 from passlib.context import CryptContext
 from jose import jwt, JWTError
@@ -343,6 +358,30 @@ class Settings(BaseSettings):
     news_max_articles_per_source: int = 30  # מקסימום לכל מקור
     news_total_articles: int = 30  # סה"כ 30 כתבות ספורט
 
+    # ─────────────────────────────────────────────────────────────────────────────
+    # 🔥 Prefetch - חימום Cache למשחקים הקרובים
+    # ─────────────────────────────────────────────────────────────────────────────
+    prefetch_enabled: bool = True
+    prefetch_days_ahead: int = 2  # היום + 2 ימים קדימה
+    prefetch_budget_share: float = 0.25  # עד 25% מהמכסה היומית של API-Sports
+    prefetch_interval_minutes: int = 60
+    prefetch_leagues: List[int] = []  # ריק = כל הליגות
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # 🔴 Live poller - קריאה אחת ל-API לכל interval, כל הלקוחות מהזיכרון
+    # ─────────────────────────────────────────────────────────────────────────────
+    live_poll_enabled: bool = True
+    live_poll_interval_seconds: float = 30.0
+    live_stream_queue_size: int = 64  # הודעות לכל לקוח לפני drop-oldest
+    live_stream_max_clients: int = 5000
+    live_stream_heartbeat_seconds: float = 15.0
+
+    # ─────────────────────────────────────────────────────────────────────────────
+    # 🌳 ניתוח משחק - איסוף נתונים במקביל (fan-out)
+    # ─────────────────────────────────────────────────────────────────────────────
+    analysis_fetch_timeout_seconds: float = 8.0  # לכל קריאה
+    analysis_deadline_seconds: float = 15.0  # לכל איסוף הנתונים
+
     # ─────────────────────────────────────────────────────────────────────────────
     # 🛡️ Rate Limiting
     # ─────────────────────────────────────────────────────────────────────────────
@@ -1003,6 +1042,7 @@ RSS_SOURCES: Dict[str, Dict[str, str]] = {
 
 # מאגר כתבות בזיכרון
 articles_cache: List[Dict[str, Any]] = []
+NEWS_CACHE_KEY = "news_articles"
 last_news_refresh: Optional[datetime] = None
 app_start_time: datetime = datetime.now(timezone.utc)
 
@@ -1211,12 +1251,7 @@ async def extract_article_image(
         # ניסיון 2: טעינת דף הכתבה
         if link:
             try:
-                async with httpx.AsyncClient(
-                        timeout=8.0,
-                        follow_redirects=True,
-                        headers={"User-Agent": "SmartSportsPro/9.0"}
-                ) as client:
-                    response = await client.get(link)
+                response = await http_client.client.get(link, timeout=8.0, follow_redirects=True)
 
                 if response.status_code == 200:
                     page_soup = BeautifulSoup(response.text, "html.parser")
@@ -1412,9 +1447,41 @@ async def refresh_articles():
     articles_cache = all_articles[:settings.news_total_articles]
     last_news_refresh = datetime.now(timezone.utc)
 
+    # שמירה גם ב-Cache Manager (ב-L2 על הדיסק - שורד הפעלה מחדש)
+    if CACHE_MANAGER_LOADED and articles_cache:
+        await cache_manager.set(
+            NEWS_CACHE_KEY,
+            articles_cache,
+            ttl=settings.news_refresh_interval_minutes * 60,
+            stale_ttl=24 * 3600
+        )
+
     logger.info(f"✅ News refreshed: {len(articles_cache)} sport articles loaded")
 
 
+async def load_cached_articles() -> bool:
+    """
+    💽 טעינת כתבות מה-Cache (L2) בעליית השרת
+
+    אם יש כתבות שמורות - השרת מגיש אותן מיד, והרענון מה-RSS רץ ברקע.
+
+    Returns:
+        True אם נטענו כתבות
+    """
+    global articles_cache
+
+    if not CACHE_MANAGER_LOADED:
+        return False
+
+    cached = await cache_manager.get(NEWS_CACHE_KEY)
+    if not cached:
+        return False
+
+    articles_cache = cached
+    logger.info(f"💽 News loaded from cache: {len(articles_cache)} articles")
+    return True
+
+
 async def periodic_news_refresh():
     """
     ⏰ רענון חדשות אוטומטי
@@ -1457,6 +1524,9 @@ async def lifespan(app: FastAPI):
     logger.info(f"💓 The Startup Heart is beating...")
     logger.info("═" * 70)
 
+    # HTTP client משותף - חיבורים ארוכי-חיים ל-API-Sports ולאתרי החדשות
+    await http_client.start()
+
     # אתחול מסד נתונים
     if DB_LOADED:
         try:
@@ -1475,15 +1545,43 @@ async def lifespan(app: FastAPI):
     if AI_ENGINE_LOADED:
         logger.info(f"✅ AI Engine: {get_engine_version()}")
 
+    # חימום Cache מה-L2 (CACHE_BACKEND=sqlite / CACHE_L2_PATH) - משותף לכל ה-workers
+    if CACHE_MANAGER_LOADED:
+        try:
+            await cache_manager.warm_up()
+        except Exception as e:
+            logger.error(f"❌ Cache warm-up error: {e}")
+
     # רענון חדשות ראשוני - ללא עלות (בלי AI!)
-    logger.info("📰 Loading initial news (RSS only, no AI costs)...")
-    await refresh_articles()
+    # אם יש כתבות שמורות ב-Cache, מגישים אותן מיד והרענון רץ ברקע
+    if not await load_cached_articles():
+        logger.info("📰 Loading initial news (RSS only, no AI costs)...")
+        await refresh_articles()
 
     # הפעלת רענון אוטומטי כל 30 דקות
     asyncio.create_task(periodic_news_refresh())
 
     logger.info("✅ News system enabled - RSS feeds with zero costs!")
 
+    # 🔥 Prefetch ברקע - context למשחקים הקרובים, כדי שתחזיות יהיו Cache HIT
+    global prefetch_scheduler
+    if settings.prefetch_enabled and PREFETCH_LOADED and SPORTS_API_LOADED and sports_api.api_key != "DEMO_KEY":
+        prefetch_scheduler = PrefetchScheduler(
+            sports_api,
+            days_ahead=settings.prefetch_days_ahead,
+            budget_share=settings.prefetch_budget_share,
+            interval_minutes=settings.prefetch_interval_minutes,
+            leagues=settings.prefetch_leagues
+        )
+        prefetch_scheduler.start()
+
+    # 🔴 Live poller - מקור אחד למשחקים החיים (/api/live-matches)
+    global live_poller
+    if settings.live_poll_enabled and LIVE_POLLER_LOADED and SPORTS_API_LOADED and sports_api.api_key != "DEMO_KEY":
+        live_poller = LiveScorePoller(sports_api, interval_seconds=settings.live_poll_interval_seconds)
+        live_poller.add_listener(live_broadcaster.publish)
+        live_poller.start()
+
     logger.info("═" * 70)
     logger.info("💚 System ready! The heart is pumping!")
     logger.info("═" * 70)
@@ -1493,6 +1591,17 @@ async def lifespan(app: FastAPI):
     # ═══════════════════════ SHUTDOWN ═══════════════════════
     logger.info("👋 Shutting down gracefully...")
 
+    if prefetch_scheduler is not None:
+        await prefetch_scheduler.stop()
+
+    if live_poller is not None:
+        await live_poller.stop()
+
+    if SPORTS_API_LOADED:
+        await asyncio.to_thread(sports_api.team_index.flush)
+
+    await http_client.close()
+
 
 # יצירת האפליקציה
 app = FastAPI(
@@ -2677,23 +2786,79 @@ async def search_teams(q: str = Query(..., min_length=2)):
 # 📊 SPORTS DATA ENDPOINTS
 # ═══════════════════════════════════════════════════════════════════════════════════
 
+def json_response(payload: Dict) -> Response:
+    """
+    ⚡ תשובת JSON מקודדת ב-orjson ישירות
+
+    רשימות משחקים / טבלאות גדולות - בלי המעבר של FastAPI דרך jsonable_encoder
+    """
+    return Response(content=to_json(payload), media_type="application/json")
+
+
 SPORTS_API_LOADED = False
 sports_api = None
 try:
-    from backend.sports_api import sports_api as api_instance
-    sports_api = api_instance
+    from backend.sports_api import current_season, get_sports_api, live_matches_key
+    sports_api = get_sports_api()
     SPORTS_API_LOADED = True
     logger.info("✅ Sports API loaded successfully from backend.sports_api")
 except ImportError:
     try:
-        from sports_api import sports_api as api_instance
-        sports_api = api_instance
+        from sports_api import current_season, get_sports_api, live_matches_key
+        sports_api = get_sports_api()
         SPORTS_API_LOADED = True
         logger.info("✅ Sports API loaded successfully from sports_api")
     except ImportError:
         logger.error("❌ Failed to load sports_api module")
         pass
 
+# 🔥 Prefetch Scheduler (מופעל ב-lifespan)
+PREFETCH_LOADED = False
+prefetch_scheduler = None
+try:
+    from prefetch_scheduler import PrefetchScheduler
+    PREFETCH_LOADED = True
+except ImportError:
+    try:
+        from backend.prefetch_scheduler import PrefetchScheduler
+        PREFETCH_LOADED = True
+    except ImportError:
+        logger.warning("⚠️ Prefetch scheduler not loaded")
+
+# 🔴 Live Poller (מופעל ב-lifespan)
+LIVE_POLLER_LOADED = False
+live_poller = None
+live_broadcaster = None
+try:
+    from live_poller import LiveScorePoller
+    from live_broadcaster import LiveBroadcaster, LiveMessage, LiveSubscriber, encode_json
+    LIVE_POLLER_LOADED = True
+except ImportError:
+    try:
+        from backend.live_poller import LiveScorePoller
+        from backend.live_broadcaster import LiveBroadcaster, LiveMessage, LiveSubscriber, encode_json
+        LIVE_POLLER_LOADED = True
+    except ImportError:
+        logger.warning("⚠️ Live poller not loaded")
+
+if LIVE_POLLER_LOADED:
+    live_broadcaster = LiveBroadcaster(
+        queue_size=settings.live_stream_queue_size,
+        max_subscribers=settings.live_stream_max_clients
+    )
+
+
+async def current_live_matches() -> Tuple[List[Dict], bool]:
+    """
+    🔴 המשחקים החיים - מה-poller (זיכרון) אם הוא רץ, אחרת דרך sports_api (Cache)
+
+    Returns:
+        (matches, from_poller)
+    """
+    if live_poller is not None and live_poller.ready:
+        return live_poller.snapshot(), True
+    return await sports_api.get_live_matches(), False
+
 # Print status on module load
 if SPORTS_API_LOADED:
     logger.info(f"🎉 SPORTS API IS READY! Using API key: {sports_api.api_key[:10]}...")
@@ -2707,7 +2872,7 @@ async def get_standings(league: str = Query("il")):
     if SPORTS_API_LOADED:
         # ✅ ליגת העל הישראלית (ID: 383)
         data = await sports_api.get_league_standings(383, 2024)
-        return {"success": True, "standings": data}
+        return json_response({"success": True, "standings": data})
 
     # Fallback
     return {
@@ -2731,18 +2896,19 @@ async def get_live_matches_endpoint():
     try:
         # Use the loaded sports_api directly
         if SPORTS_API_LOADED and sports_api:
-            matches = await sports_api.get_live_matches()
+            matches, from_poller = await current_live_matches()
             stats = sports_api.get_stats()
 
-            return {
+            return json_response({
                 "success": True,
                 "matches": matches,
                 "count": len(matches),
                 "source": "API-Sports",
-                "cached": len(sports_api.cache) > 0,
-                "requests_today": stats.get('requests_today', 0),
-                "requests_remaining": stats.get('requests_remaining', 0)
-            }
+                "cached": from_poller or sports_api.is_cached(live_matches_key()),
+                "seq": live_poller.seq if from_poller else None,
+                "requests_today": stats.get('request_count', 0),
+                "requests_remaining": stats.get('remaining_requests', 0)
+            })
 
         return {
             "success": False,
@@ -2761,6 +2927,105 @@ async def get_live_matches_endpoint():
         }
 
 
+def live_catch_up(since: Optional[str]) -> List["LiveMessage"]:
+    """השלמה לחיבור חדש: deltas מאז since (Last-Event-ID), או snapshot מלא"""
+    try:
+        since_seq = int(since) if since is not None else None
+    except ValueError:
+        since_seq = None
+
+    if since_seq is not None:
+        _, deltas = live_poller.deltas_since(since_seq)
+        if deltas is not None:
+            return [LiveMessage(delta["seq"], delta["type"], encode_json(delta)) for delta in deltas]
+    return [LiveBroadcaster.snapshot_message(live_poller.seq, live_poller.snapshot())]
+
+
+async def live_messages(subscriber: "LiveSubscriber", since: Optional[str]):
+    """
+    📡 הזרם של לקוח אחד: השלמה, ואז deltas חיים מה-broadcaster
+
+    yield None = אין הודעה בזמן ה-heartbeat (לשלוח ping).
+    לקוח שאיבד הודעות (drop-oldest) מקבל snapshot מלא במקומן.
+    """
+    # כל מה שכבר בתור מכוסה בהשלמה (אותו event loop - seq לא מתקדם באמצע)
+    catch_up = live_catch_up(since)
+    subscriber.resync()
+    for message in catch_up:
+        yield message
+
+    while True:
+        message = await subscriber.next(timeout=settings.live_stream_heartbeat_seconds)
+        if subscriber.lagged:
+            subscriber.resync()
+            yield LiveBroadcaster.snapshot_message(live_poller.seq, live_poller.snapshot())
+        else:
+            yield message
+
+
+@app.get("/api/live/stream", tags=["Sports Data"])
+async def live_stream(request: Request):
+    """
+    📡 משחקים חיים ב-Server-Sent Events
+
+    snapshot בחיבור (או deltas מאז Last-Event-ID), ואחריו delta לכל שינוי
+    (goal / status / minute / added / finished). במקום polling ל-/api/live-matches.
+    """
+    if live_poller is None or live_broadcaster is None:
+        raise HTTPException(status_code=503, detail="Live stream not available")
+
+    subscriber = live_broadcaster.subscribe()
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many live subscribers")
+
+    since = request.headers.get("last-event-id") or request.query_params.get("since")
+
+    async def events():
+        try:
+            async for message in live_messages(subscriber, since):
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n" if message is None else message.to_sse()
+        finally:
+            live_broadcaster.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/ws/live")
+async def live_websocket(websocket: WebSocket):
+    """
+    📡 משחקים חיים ב-WebSocket
+
+    הודעות: {"event": "snapshot" | "goal" | ..., "seq": N, "data": {...}} ו-{"event": "ping"}.
+    ?since=N להשלמת deltas אחרי התנתקות.
+    """
+    subscriber = live_broadcaster.subscribe() if live_poller is not None and live_broadcaster else None
+    if subscriber is None:
+        await websocket.close(code=1013)  # Try Again Later
+        return
+
+    await websocket.accept()
+    try:
+        async for message in live_messages(subscriber, websocket.query_params.get("since")):
+            if message is None:
+                await websocket.send_text('{"event": "ping"}')
+            else:
+                await websocket.send_text(
+                    f'{{"event": "{message.event}", "seq": {message.seq}, "data": {message.data}}}'
+                )
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️ Live websocket closed: {e}")
+    finally:
+        live_broadcaster.unsubscribe(subscriber)
+
+
 @app.get("/api/today-matches", tags=["Sports Data"])
 async def get_today_matches_endpoint():
     """
@@ -2776,13 +3041,13 @@ async def get_today_matches_endpoint():
         if SPORTS_API_LOADED and sports_api:
             matches = await sports_api.get_fixtures_by_date()
 
-            return {
+            return json_response({
                 "success": True,
                 "matches": matches,
                 "count": len(matches),
                 "source": "API-Sports",
                 "date": datetime.now(timezone.utc).strftime("%Y-%m-%d")
-            }
+            })
 
         # Fallback ל-DEMO
         try:
@@ -2854,43 +3119,65 @@ async def ai_analyze_match(request: dict):
             }
 
         logger.info(f"🔥 PREMIUM AI Analysis: {home_team} vs {away_team} (League: {league_id})")
-        api_calls_used = 0
+        analysis_started = time.perf_counter()
 
         # ═══════════════════════════════════════════════════════════════════════
         # 🔥 PHASE 1: DATA GATHERING - עם 7500 קריאות, אנחנו לא מתפשרים!
         # ═══════════════════════════════════════════════════════════════════════
 
-        # STEP 1: חיפוש מזהי קבוצות + טבלה (2 API calls)
-        season = 2025 if datetime.now().month < 8 else datetime.now().year
-        standings = await sports_api.get_league_standings(league_id, season)
-        api_calls_used += 1
-
-        home_team_id = None
-        away_team_id = None
-        home_standing_data = None
-        away_standing_data = None
-
-        if standings and len(standings) > 0:
-            if isinstance(standings[0], dict) and 'league' in standings[0]:
-                standings_list = standings[0]['league']['standings'][0]
-            else:
-                standings_list = standings
-
-            for standing in standings_list:
-                team_info = standing.get('team', {})
-                team_name = team_info.get('name', '')
-
-                if home_team.lower() in team_name.lower() or team_name.lower() in home_team.lower():
-                    home_team_id = team_info.get('id')
-                    home_standing_data = standing
-                    logger.info(f"✅ Home: {team_name} (ID: {home_team_id}, Rank: {standing.get('rank')})")
-
-                if away_team.lower() in team_name.lower() or team_name.lower() in away_team.lower():
-                    away_team_id = team_info.get('id')
-                    away_standing_data = standing
-                    logger.info(f"✅ Away: {team_name} (ID: {away_team_id}, Rank: {standing.get('rank')})")
-
-        if not home_team_id or not away_team_id:
+        # STEP 1: טבלה → מזהי קבוצות → (סטטיסטיקות, פורמה, H2H) במקביל
+        # fan-out לפי תלויות: זמן כולל ≈ הקריאה הארוכה ביותר, לא הסכום
+        season = current_season()  # אותם מפתחות Cache כמו ה-prefetch
+
+        async def resolve_teams_task(results: dict) -> dict:
+            """מזהי הקבוצות דרך team_index + שורות הטבלה לפי מזהה (זורק LookupError אם לא נמצאו)"""
+            standings = results["standings"]
+            sports_api.team_index.add_standings(standings, league_id)
+            home_id = await sports_api.resolve_team_id(home_team, league_id)
+            away_id = await sports_api.resolve_team_id(away_team, league_id)
+
+            rows_by_id = {
+                row["team"].get("id"): row
+                for row in sports_api.team_index.standing_rows(standings)
+                if isinstance(row.get("team"), dict)
+            }
+            teams = {
+                "home_id": home_id,
+                "away_id": away_id,
+                "home_standing": rows_by_id.get(home_id),
+                "away_standing": rows_by_id.get(away_id)
+            }
+            if not teams["home_standing"] or not teams["away_standing"]:
+                raise LookupError(f"teams not found: '{home_team}' vs '{away_team}'")
+
+            for side in ("home", "away"):
+                standing = teams[f"{side}_standing"]
+                logger.info(
+                    f"✅ {side.title()}: {standing['team'].get('name')} "
+                    f"(ID: {teams[f'{side}_id']}, Rank: {standing.get('rank')})"
+                )
+            return teams
+
+        fetch_timeout = settings.analysis_fetch_timeout_seconds
+        gathered = await fan_out([
+            FetchTask("standings", lambda r: sports_api.get_league_standings(league_id, season),
+                      timeout=fetch_timeout),
+            FetchTask("teams", resolve_teams_task, deps=("standings",)),
+            FetchTask("home_stats", lambda r: sports_api.get_team_statistics(r["teams"]["home_id"], league_id, season),
+                      deps=("teams",), timeout=fetch_timeout),
+            FetchTask("away_stats", lambda r: sports_api.get_team_statistics(r["teams"]["away_id"], league_id, season),
+                      deps=("teams",), timeout=fetch_timeout),
+            FetchTask("home_form", lambda r: sports_api.get_team_last_matches(r["teams"]["home_id"], 5),
+                      deps=("teams",), timeout=fetch_timeout, default=[]),
+            FetchTask("away_form", lambda r: sports_api.get_team_last_matches(r["teams"]["away_id"], 5),
+                      deps=("teams",), timeout=fetch_timeout, default=[]),
+            FetchTask("h2h", lambda r: sports_api.get_h2h_statistics(r["teams"]["home_id"], r["teams"]["away_id"]),
+                      deps=("teams",), timeout=fetch_timeout),
+        ], deadline=settings.analysis_deadline_seconds)
+
+        logger.info(f"🌳 Data gathering: {gathered.to_dict()}")
+
+        if not gathered.ok("teams"):
             return {
                 "success": False,
                 "error": f"לא הצלחתי למצוא את הקבוצות בליגה. בדוק שמות: '{home_team}' vs '{away_team}'",
@@ -2901,26 +3188,17 @@ async def ai_analyze_match(request: dict):
                 ]
             }
 
-        # STEP 2: Team Statistics המלאות (2 API calls)
-        logger.info("📊 Fetching detailed team statistics...")
-        home_stats = await sports_api.get_team_statistics(home_team_id, league_id, season)
-        api_calls_used += 1
-
-        away_stats = await sports_api.get_team_statistics(away_team_id, league_id, season)
-        api_calls_used += 1
-
-        # STEP 3: Form Analysis - 5 משחקים אחרונים (2 API calls)
-        logger.info("📈 Analyzing recent form...")
-        home_form = await sports_api.get_team_last_matches(home_team_id, 5)
-        api_calls_used += 1
+        teams = gathered.get("teams")
+        home_standing_data = teams["home_standing"]
+        away_standing_data = teams["away_standing"]
+        home_stats = gathered.get("home_stats")
+        away_stats = gathered.get("away_stats")
+        home_form = gathered.get("home_form") or []
+        away_form = gathered.get("away_form") or []
+        h2h_data = gathered.get("h2h")
 
-        away_form = await sports_api.get_team_last_matches(away_team_id, 5)
-        api_calls_used += 1
-
-        # STEP 4: Head-to-Head History (1 API call)
-        logger.info("🔄 Fetching H2H history...")
-        h2h_data = await sports_api.get_h2h_statistics(home_team_id, away_team_id)
-        api_calls_used += 1
+        # fetches שהושלמו (teams הוא חישוב מקומי, לא קריאת API)
+        api_calls_used = len([name for name in gathered.results if name != "teams"])
 
         # ═══════════════════════════════════════════════════════════════════════
         # 🔥 PHASE 2: ADVANCED PROMPT ENGINEERING - נתונים ברמת bet365+
@@ -2942,20 +3220,24 @@ async def ai_analyze_match(request: dict):
         home_stats_goals = home_stats.get('goals', {}) if home_stats else {}
         away_stats_goals = away_stats.get('goals', {}) if away_stats else {}
 
-        # ניתוח פורם
-        home_form_analysis = ""
-        if home_form and len(home_form) > 0:
-            home_wins = sum(1 for m in home_form if m.get('status') == 'FT' and
-                          ((m.get('home_team') == home_team and m.get('home_score', 0) > m.get('away_score', 0)) or
-                           (m.get('away_team') == home_team and m.get('away_score', 0) > m.get('home_score', 0))))
-            home_form_analysis = f"{home_wins} ניצחונות ב-5 משחקים אחרונים"
-
-        away_form_analysis = ""
-        if away_form and len(away_form) > 0:
-            away_wins = sum(1 for m in away_form if m.get('status') == 'FT' and
-                          ((m.get('home_team') == away_team and m.get('home_score', 0) > m.get('away_score', 0)) or
-                           (m.get('away_team') == away_team and m.get('away_score', 0) > m.get('home_score', 0))))
-            away_form_analysis = f"{away_wins} ניצחונות ב-5 משחקים אחרונים"
+        # ניתוח פורם - לפי מזהי קבוצות (match_aggregates), לא לפי שם
+        # (מפגש ישיר אחרון יכול להופיע בשתי הרשימות - פעם אחת לפי id)
+        recent_matches = {match.get("id"): match for match in home_form + away_form}
+        forms = batch_form(
+            FixtureHistory.from_matches(recent_matches.values()), [teams["home_id"], teams["away_id"]]
+        )
+
+        def describe_form(summary: Dict) -> str:
+            if not summary["played"]:
+                return ""
+            return (
+                f"{summary['wins']} ניצחונות ב-{summary['played']} משחקים אחרונים "
+                f"({summary['form']}, {summary['avg_goals_for']} שערים למשחק, "
+                f"{summary['avg_goals_against']} ספיגות למשחק)"
+            )
+
+        home_form_analysis = describe_form(forms[teams["home_id"]])
+        away_form_analysis = describe_form(forms[teams["away_id"]])
 
         analysis_prompt = f"""אתה אנליסט ספורט מומחה ברמה של Sky Sports / ESPN. נתח את המשחק על בסיס 7 מקורות data:
 
@@ -3025,7 +3307,9 @@ Recent: {', '.join([m.get('score', '?-?') for m in h2h_data.get('last_5_matches'
 
         logger.info(f"🤖 Sending {len(analysis_prompt)} chars to OpenAI GPT-4o-mini...")
 
-        response = openai_client.chat.completions.create(
+        # ה-client של OpenAI סינכרוני - רץ ב-thread כדי לא לחסום את ה-event loop
+        response = await asyncio.to_thread(
+            openai_client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {
@@ -3111,14 +3395,17 @@ Recent: {', '.join([m.get('score', '?-?') for m in h2h_data.get('last_5_matches'
                 "team_statistics": bool(home_stats and away_stats),
                 "h2h": bool(h2h_data),
                 "recent_form": len(home_form) > 0 and len(away_form) > 0,
-                "total_data_points": api_calls_used * 50  # כל קריאה מחזירה ~50 נקודות data
+                "total_data_points": api_calls_used * 50,  # כל קריאה מחזירה ~50 נקודות data
+                "partial": gathered.partial,
+                "missing": sorted(gathered.errors)
             },
             "performance_metrics": {
                 "api_calls_used": api_calls_used,
                 "api_calls_remaining": 7500 - api_calls_used,
                 "openai_tokens": tokens_used,
                 "estimated_cost_usd": round(tokens_used * 0.0000001, 6),  # gpt-4o-mini pricing
-                "processing_time_seconds": "< 3s"
+                "data_gathering_ms": round(gathered.elapsed * 1000, 1),
+                "processing_time_seconds": round(time.perf_counter() - analysis_started, 2)
             },
             "source": "🔥 PREMIUM: OpenAI GPT-4o-mini + API-Sports Premium (7500/day)"
         }
@@ -3233,7 +3520,6 @@ async def api_proxy(endpoint: str, request: Request):
     🔄 Proxy לבקשות API-Sports - פותר בעיות CORS
     """
     import os
-    import httpx
     from dotenv import load_dotenv
     load_dotenv()
 
@@ -3253,9 +3539,8 @@ async def api_proxy(endpoint: str, request: Request):
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params, headers=headers)
-            return response.json()
+        response = await http_client.client.get(url, params=params, headers=headers)
+        return response.json()
     except Exception as e:
         return {
             "success": False,
@@ -3415,7 +3700,7 @@ async def get_team_form(team_id: int, limit: int = 5):
     """
     if SPORTS_API_LOADED:
         matches = await sports_api.get_team_last_matches(team_id, limit)
-        return {"success": True, "matches": matches, "count": len(matches)}
+        return json_response({"success": True, "matches": matches, "count": len(matches)})
 
     return {"success": False, "matches": []}
 
@@ -3619,6 +3904,9 @@ async def get_cache_stats():
             content={
                 "success": True,
                 "cache": stats,
+                "prefetch": prefetch_scheduler.get_stats() if prefetch_scheduler else None,
+                "live_poller": live_poller.get_stats() if live_poller else None,
+                "live_stream": live_broadcaster.get_stats() if live_broadcaster else None,
                 "timestamp": datetime.now().isoformat()
             }
         )
@@ -3812,55 +4100,34 @@ async def get_sports_api_key():
 
 @app.get("/api/live-matches", tags=["Sports"])
 async def get_live_matches():
-    """⚽ קבלת משחקים חיים"""
-    import os
-    import aiohttp
-
-    api_key = os.getenv("API_SPORTS_KEY", "")
-    if not api_key:
+    """⚽ קבלת משחקים חיים (פורמט ישן - מאותו מקור כמו get_live_matches_endpoint)"""
+    if not SPORTS_API_LOADED or not sports_api:
         return {"success": False, "matches": [], "error": "API key not configured"}
 
     try:
-        url = "https://v3.football.api-sports.io/fixtures"
-        headers = {
-            'x-rapidapi-key': api_key,
-            'x-rapidapi-host': 'v3.football.api-sports.io'
-        }
-        params = {
-            'live': 'all'  # Get all live matches
-        }
+        live, _ = await current_live_matches()
+        matches = [
+            {
+                'id': match.get('id'),
+                'league': match.get('league'),
+                'country': match.get('country'),
+                'home_team': match.get('home_team'),
+                'home_logo': match.get('home_logo'),
+                'away_team': match.get('away_team'),
+                'away_logo': match.get('away_logo'),
+                'score_home': match.get('home_score'),
+                'score_away': match.get('away_score'),
+                'status': match.get('status'),
+                'elapsed': match.get('minute')
+            }
+            for match in live
+        ]
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params, timeout=10) as response:
-                if response.status == 200:
-                    data = await response.json()
-
-                    # Extract and format matches
-                    matches = []
-                    if data.get('response'):
-                        for fixture in data['response'][:20]:  # Limit to 20 matches
-                            match = {
-                                'id': fixture['fixture']['id'],
-                                'league': fixture['league']['name'],
-                                'country': fixture['league']['country'],
-                                'home_team': fixture['teams']['home']['name'],
-                                'home_logo': fixture['teams']['home']['logo'],
-                                'away_team': fixture['teams']['away']['name'],
-                                'away_logo': fixture['teams']['away']['logo'],
-                                'score_home': fixture['goals']['home'],
-                                'score_away': fixture['goals']['away'],
-                                'status': fixture['fixture']['status']['short'],
-                                'elapsed': fixture['fixture']['status']['elapsed']
-                            }
-                            matches.append(match)
-
-                    return {
-                        "success": True,
-                        "matches": matches,
-                        "count": len(matches)
-                    }
-                else:
-                    return {"success": False, "matches": [], "error": f"API returned {response.status}"}
+        return json_response({
+            "success": True,
+            "matches": matches,
+            "count": len(matches)
+        })
 
     except Exception as e:
         logger.error(f"Error fetching live matches: {e}")
@@ -0,0 +1,95 @@
+"""
+⏱️ Benchmark - CacheManager: latency של get/set וסקייל של ה-hit path
+Created by: Rafael & AI Assistant
+
+    benchmark_cache       - get/set כשה-Cache מלא (1k → 1M ערכים, כולל eviction ותפוגה)
+    benchmark_concurrency - עד 1k coroutines על מפתחות חמים (1 מול 16 shards)
+
+Usage:
+    python bench_cache.py
+    python bench_cache.py --sizes 1000 10000 --ops 5000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+try:
+    from cache_manager import CacheManager, logger
+except ImportError:
+    from backend.cache_manager import CacheManager, logger
+
+
+async def benchmark_cache(sizes=(1_000, 10_000, 100_000, 1_000_000), ops: int = 20_000):
+    """
+    ⏱️ Micro-benchmark: latency של get/set כשה-Cache מלא (1k → 1M ערכים)
+
+    כל set על Cache מלא גורם ל-eviction, וחלק מהערכים פגי תוקף -
+    כך שהמדידה כוללת גם LRU וגם ניקוי תפוגה.
+    """
+    logger.setLevel(logging.WARNING)
+
+    print(f"{'entries':>10} | {'get µs/op':>10} | {'set µs/op':>10}")
+    print("-" * 37)
+    for size in sizes:
+        cache = CacheManager(max_entries=size)
+        for i in range(size):
+            await cache.set(f"key_{i}", {"value": i}, ttl=1 if i % 10 == 0 else 3600)
+
+        keys = [f"key_{random.randrange(size)}" for _ in range(ops)]
+        start = time.perf_counter()
+        for key in keys:
+            await cache.get(key)
+        get_us = (time.perf_counter() - start) / ops * 1e6
+
+        start = time.perf_counter()
+        for i in range(ops):
+            await cache.set(f"new_{i}", {"value": i}, ttl=3600)
+        set_us = (time.perf_counter() - start) / ops * 1e6
+
+        print(f"{size:>10,} | {get_us:>10.2f} | {set_us:>10.2f}")
+
+
+async def benchmark_concurrency(concurrency=(1, 10, 100, 1_000), shards=(1, 16), total_ops: int = 200_000):
+    """
+    ⏱️ Benchmark: עד 1k coroutines שמפציצים מפתחות חמים
+
+    ה-hit path לא לוקח lock, ולכן העלות לכל get צריכה להישאר קבועה
+    ככל שמספר ה-coroutines עולה (וגם בין 1 ל-16 shards).
+    """
+    logger.setLevel(logging.WARNING)
+    hot_keys = [f"hot_{i}" for i in range(32)]
+
+    print(f"\n{'shards':>6} | {'coroutines':>10} | {'get µs/op':>10}")
+    print("-" * 33)
+    for shard_count in shards:
+        cache = CacheManager(max_entries=10_000, shards=shard_count)
+        for key in hot_keys:
+            await cache.set(key, {"standings": list(range(20))}, ttl=3600)
+
+        for workers in concurrency:
+            per_worker = total_ops // workers
+
+            async def hammer(offset: int):
+                for i in range(per_worker):
+                    await cache.get(hot_keys[(offset + i) % len(hot_keys)])
+                    if i % 64 == 0:
+                        await asyncio.sleep(0)  # לתת ל-coroutines אחרים לרוץ
+
+            start = time.perf_counter()
+            await asyncio.gather(*(hammer(w) for w in range(workers)))
+            get_us = (time.perf_counter() - start) / (per_worker * workers) * 1e6
+            print(f"{shard_count:>6} | {workers:>10,} | {get_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CacheManager get/set latency and hit-path concurrency")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--total-ops", type=int, default=200_000)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark_cache(sizes=args.sizes, ops=args.ops))
+    asyncio.run(benchmark_concurrency(total_ops=args.total_ops))
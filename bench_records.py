@@ -0,0 +1,138 @@
+"""
+📏 Benchmark - זיכרון לכל משחק: dicts ב-Cache מול FixtureRecord משותף
+Created by: Rafael & AI Assistant
+
+מודד (tracemalloc) כמה בתים נשארים בזיכרון לכל משחק אחרי טעינת יום מלא:
+
+    legacy  - רשומה ב-FixturesStore + dict רחב (to_dict) ב-Cache
+    legacy/L2 - אותו דבר, אבל ה-dict חזר מה-L2 (בלי interning)
+    records - ה-Cache מחזיק את אותן רשומות כמו FixturesStore
+    records/L2 - הערך מה-L2 עובר decoder → המופעים מהטבלה
+
+Usage:
+    python bench_records.py
+    python bench_records.py --fixtures 20000
+"""
+
+import argparse
+import gc
+import json
+import random
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+try:
+    from fixture_index import FixturesStore
+    from records import FixtureRecord, to_json
+except ImportError:
+    from backend.fixture_index import FixturesStore
+    from backend.records import FixtureRecord, to_json
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+DATE = "2026-03-14"
+
+
+def api_payload(count: int, leagues: int = 60, teams: int = 800, seed: int = 7) -> bytes:
+    """response של /fixtures ליום אחד (JSON כמו שמגיע מה-API)"""
+    rng = random.Random(seed)
+    items = []
+    for fixture_id in range(1, count + 1):
+        league_id = rng.randrange(leagues)
+        home, away = rng.sample(range(teams), 2)
+        items.append({
+            "fixture": {
+                "id": fixture_id,
+                "date": f"{DATE}T{rng.randrange(10, 23):02d}:00:00+00:00",
+                "timestamp": 1773496800 + rng.randrange(0, 40000),
+                "venue": {"name": f"Stadium {home}"},
+                "status": {"short": "NS", "long": "Not Started", "elapsed": None}
+            },
+            "league": {
+                "id": league_id, "name": f"League {league_id}", "country": f"Country {league_id % 30}",
+                "logo": f"https://media.api-sports.io/football/leagues/{league_id}.png", "season": 2025
+            },
+            "teams": {
+                "home": {"id": home, "name": f"Team {home}",
+                         "logo": f"https://media.api-sports.io/football/teams/{home}.png"},
+                "away": {"id": away, "name": f"Team {away}",
+                         "logo": f"https://media.api-sports.io/football/teams/{away}.png"}
+            },
+            "goals": {"home": None, "away": None}
+        })
+    return json.dumps({"response": items}).encode("utf-8")
+
+
+def retained_bytes(build: Callable[[], Any]) -> int:
+    """בתים שנשארו מוקצים אחרי build (הערך המוחזר נשמר חי בזמן המדידה)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def parse(payload: bytes) -> List[FixtureRecord]:
+    return [FixtureRecord.from_api(item) for item in _loads(payload)["response"]]
+
+
+def legacy(payload: bytes) -> Any:
+    store = FixturesStore()
+    records = parse(payload)
+    store.replace_date(DATE, records)
+    cached = [record.to_dict() for record in records]
+    return store, cached
+
+
+def legacy_l2(payload: bytes) -> Any:
+    store = FixturesStore()
+    store.replace_date(DATE, parse(payload))
+    cached = _loads(to_json([record.to_dict() for record in store.on_date(DATE)]))
+    return store, cached
+
+
+def shared(payload: bytes) -> Any:
+    store = FixturesStore()
+    records = store.canonical(parse(payload))
+    store.replace_date(DATE, records)
+    return store, records
+
+
+def shared_l2(payload: bytes) -> Any:
+    store = FixturesStore()
+    store.replace_date(DATE, parse(payload))
+    encoded = to_json(store.on_date(DATE))
+    cached = store.canonical(FixtureRecord.coerce(match) for match in _loads(encoded))
+    return store, cached
+
+
+def run(count: int) -> Dict[str, float]:
+    payload = api_payload(count)
+    scenarios = {
+        "legacy (store + dict)": legacy,
+        "legacy/L2 (store + dict)": legacy_l2,
+        "records (shared)": shared,
+        "records/L2 (shared)": shared_l2,
+    }
+    results = {}
+    for name, build in scenarios.items():
+        results[name] = retained_bytes(lambda build=build: build(payload)) / count
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-fixture memory: cached dicts vs shared FixtureRecord")
+    parser.add_argument("--fixtures", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"📏 {args.fixtures:,} fixtures, one day")
+    for name, per_fixture in run(args.fixtures).items():
+        print(f"  {name:<26} {per_fixture:>8,.0f} bytes/fixture")
@@ -14,21 +14,74 @@ Version: 1.0 - Production Ready
 ✅ Auto cleanup (מחיקת ערכים ישנים)
 ✅ Statistics (hit ratio, memory usage)
 
-לא Redis - In-memory זה מספיק לשלב הזה.
+לא Redis - In-memory (L1) + backend L2 אופציונלי (SQLite, ראה cache_store.py),
+שמשותף לכל ה-uvicorn workers על אותו node.
 """
 
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
+import os
+import socket
+import sys
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 import json
 
+try:
+    from cache_store import CacheBackend, create_cache_backend
+    from records import json_default
+except ImportError:
+    from backend.cache_store import CacheBackend, create_cache_backend
+    from backend.records import json_default
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# 🔑 Key namespace: "namespace:part:part" - לדוגמה "standings:39:2025"
+KEY_SEPARATOR = ":"
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """
+    🔑 בניית מפתח מובנה
+
+    Usage:
+        make_key("standings", 39, 2025)  # "standings:39:2025"
+    """
+    return KEY_SEPARATOR.join([namespace, *(str(part) for part in parts)])
+
+
+def make_tag(kind: str, value: Any) -> str:
+    """
+    🏷️ בניית tag - לדוגמה make_tag("team", 50) → "team:50"
+
+    סוגי tags מקובלים: league, team, fixture (וגם ns - נוסף אוטומטית לכל מפתח מובנה)
+    """
+    return f"{kind}{KEY_SEPARATOR}{value}"
+
+
+def dependency_tag(key: str) -> str:
+    """
+    🔗 tag של תלות - ערך שמסומן ב-dependency_tag("standings:39:2025") נמחק
+    אוטומטית בכל פעם שהמפתח standings:39:2025 נכתב מחדש (set / רענון ברקע)
+    """
+    return make_tag("dep", key)
+
+
+def key_namespace(key: str) -> Optional[str]:
+    """ה-namespace של מפתח מובנה (None למפתח ישן/חופשי)"""
+    namespace, separator, _ = key.partition(KEY_SEPARATOR)
+    return namespace if separator else None
+
+
 @dataclass
 class CacheEntry:
     """
@@ -40,17 +93,40 @@ class CacheEntry:
         ttl: Time To Live בשניות
         hits: כמה פעמים נקרא
         last_access: גישה אחרונה
+        expires_at: soft TTL - מתי הערך הופך ל-stale (time.monotonic)
+        stale_ttl: כמה שניות אחרי ה-soft TTL עוד מותר להגיש ערך stale
+        hard_expires_at: hard TTL - מתי הערך נמחק לגמרי
+        refresher: loader לרענון ברקע (stale-while-revalidate)
+        seq: מספר סידורי - מזהה את הרשומה בערימת התפוגה
+        size: גודל בבתים - מחושב פעם אחת ב-set
+        tags: tags לביטול קבוצתי (invalidate_tag) - לדוגמה ("league:39", "team:50")
     """
     data: Any
     timestamp: datetime
     ttl: int  # seconds
     hits: int = 0
-    last_access: datetime = field(default_factory=datetime.now)
-
-    def is_expired(self) -> bool:
-        """בדוק אם הערך פג תוקף"""
-        age = (datetime.now() - self.timestamp).total_seconds()
-        return age > self.ttl
+    last_access: float = field(default_factory=time.time)  # epoch - זול יותר מ-datetime ב-hit path
+    expires_at: float = 0.0
+    stale_ttl: int = 0
+    hard_expires_at: float = 0.0
+    refresher: Optional[Callable[[], Awaitable[Any]]] = None
+    seq: int = 0
+    size: int = 0
+    tags: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        if not self.expires_at:
+            self.expires_at = time.monotonic() + self.ttl
+        if not self.hard_expires_at:
+            self.hard_expires_at = self.expires_at + self.stale_ttl
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """בדוק אם הערך פג תוקף לגמרי (עבר את ה-hard TTL)"""
+        return (now if now is not None else time.monotonic()) > self.hard_expires_at
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        """בדוק אם הערך עבר את ה-soft TTL (עדיין ניתן להגשה עד ה-hard TTL)"""
+        return (now if now is not None else time.monotonic()) > self.expires_at
 
     def age_seconds(self) -> float:
         """כמה שניות עברו מאז השמירה"""
@@ -61,23 +137,244 @@ class CacheEntry:
         return {
             "timestamp": self.timestamp.isoformat(),
             "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
             "hits": self.hits,
-            "last_access": self.last_access.isoformat(),
+            "size_bytes": self.size,
+            "tags": list(self.tags),
+            "last_access": datetime.fromtimestamp(self.last_access).isoformat(),
             "age_seconds": self.age_seconds(),
+            "stale": self.is_stale(),
             "expired": self.is_expired()
         }
 
 
+def estimate_size(key: str, data: Any) -> int:
+    """
+    📏 גודל ערך בבתים (JSON UTF-8 + המפתח)
+
+    מחושב פעם אחת בזמן set - get_stats לא מסדר (serialize) שום דבר מחדש.
+    ערכים שלא ניתנים ל-JSON נמדדים לפי sys.getsizeof.
+    """
+    try:
+        payload = len(json.dumps(data, ensure_ascii=False, default=json_default).encode("utf-8"))
+    except (TypeError, ValueError):
+        payload = sys.getsizeof(data)
+    return payload + len(key.encode("utf-8"))
+
+
+class SingleFlight:
+    """
+    🛫 Request coalescing - קריאה אחת "בטיסה" לכל מפתח
+
+    כש-50 משתמשים פותחים את אותו משחק בו-זמנית, כולם מקבלים MISS.
+    במקום 50 קריאות ל-API-Sports - הראשון מפעיל את ה-loader והשאר
+    ממתינים לאותו Future.
+
+    ביטול של אחד הממתינים לא מבטל את הקריאה המשותפת (asyncio.shield).
+
+    Usage:
+        flights = SingleFlight()
+        data = await flights.do("standings_39", lambda: fetch_standings(39))
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0  # כמה קריאות חסכנו
+
+    def in_flight(self, key: str) -> bool:
+        """האם יש כרגע טעינה פעילה למפתח"""
+        return key in self._inflight
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        הרץ את loader פעם אחת לכל מפתח - קוראים מקבילים חולקים את התוצאה
+
+        Args:
+            key: מפתח ייחודי
+            loader: פונקציה אסינכרונית שמחזירה את הערך
+
+        Returns:
+            תוצאת ה-loader (או החריגה שלו - לכל הממתינים)
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(loader())
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._on_done, key))
+        else:
+            self.coalesced += 1
+            logger.debug(f"🛫 Coalesced: {key}")
+
+        return await asyncio.shield(future)
+
+    def _on_done(self, key: str, future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()  # מסמן את החריגה כ"נקראה" גם אם כל הממתינים בוטלו
+
+
+class _CacheShard:
+    """
+    🧩 Shard בודד של ה-Cache - dict + LRU + ערימת תפוגה + lock משלו
+
+    כל הפעולות כאן סינכרוניות (בלי await) ולכן אטומיות מול ה-event loop.
+    ה-lock מגן רק על רצפי כתיבה ב-CacheManager; קריאה של ערך טרי לא לוקחת אותו.
+    """
+
+    def __init__(self, max_entries: Optional[int], max_bytes: Optional[int]):
+        # סדר ה-OrderedDict = סדר LRU (הכי ישן בהתחלה)
+        self.entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.lock = asyncio.Lock()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+
+        # Expiry heap: (hard_expires_at, seq, key) - רשומות ישנות נזרקות בעצלות
+        self.expiry_heap: List[Tuple[float, int, str]] = []
+
+        # Tag index: tag → מפתחות (מתעדכן בכל הכנסה/הסרה, כך ש-invalidate_tag
+        # עולה ביחס למספר המפתחות התואמים בלבד)
+        self.tag_index: Dict[str, Set[str]] = {}
+
+    def insert(self, key: str, entry: CacheEntry) -> int:
+        """
+        הכנס ערך (דורס ערך קיים) ופנה LRU לפי הצורך
+
+        Returns:
+            מספר הערכים שפונו
+        """
+        self.remove(key)
+        evicted = self.evict_oldest(self.overflow(entry.size))
+
+        self.entries[key] = entry
+        self.total_bytes += entry.size
+        for tag in entry.tags:
+            self.tag_index.setdefault(tag, set()).add(key)
+        heapq.heappush(self.expiry_heap, (entry.hard_expires_at, entry.seq, key))
+        self.maybe_compact_heap()
+        return evicted
+
+    def remove(self, key: str) -> Optional[CacheEntry]:
+        """הסר ערך ועדכן את מונה הבתים (הרשומה בערימה תיזרק בעצלות)"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+            self._unindex(key, entry)
+        return entry
+
+    def _unindex(self, key: str, entry: CacheEntry) -> None:
+        for tag in entry.tags:
+            keys = self.tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.tag_index[tag]
+
+    def keys_for_tag(self, tag: str) -> List[str]:
+        """המפתחות ב-shard שמסומנים ב-tag (עותק - בטוח להסרה תוך כדי מעבר)"""
+        return list(self.tag_index.get(tag, ()))
+
+    def clear(self) -> int:
+        count = len(self.entries)
+        self.entries.clear()
+        self.expiry_heap.clear()
+        self.tag_index.clear()
+        self.total_bytes = 0
+        return count
+
+    def cleanup_expired(self, now: float) -> int:
+        """
+        🧼 ניקוי ערכים שפג תוקפם - מראש ערימת התפוגה בלבד
+
+        עולה O(1) כשאין מה לנקות, ו-O(log n) לכל ערך שנמחק (כל ערך נכנס
+        ויוצא מהערימה פעם אחת בלבד). רשומות של מפתחות שנמחקו או נדרסו
+        מזוהות לפי seq ונזרקות.
+
+        Returns:
+            מספר הערכים שנמחקו
+        """
+        heap = self.expiry_heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, seq, key = heapq.heappop(heap)
+            entry = self.entries.get(key)
+            if entry is not None and entry.seq == seq:
+                self.remove(key)
+                removed += 1
+        return removed
+
+    def evict_oldest(self, count: int) -> int:
+        """
+        🗑️ מחק את הערכים הכי ישנים (LRU - Least Recently Used)
+
+        ה-OrderedDict כבר ממוין לפי גישה אחרונה, כך שכל מחיקה היא O(1).
+        """
+        deleted = 0
+        while self.entries and deleted < count:
+            key, entry = self.entries.popitem(last=False)
+            self.total_bytes -= entry.size
+            self._unindex(key, entry)
+            deleted += 1
+        return deleted
+
+    def overflow(self, incoming_size: int) -> int:
+        """
+        כמה ערכים ישנים (LRU) צריך לפנות כדי שערך בגודל incoming_size ייכנס
+
+        סריקה מתחילת ה-LRU עד שהתקציב מתפנה - עלות ביחס למספר המפונים בלבד.
+        """
+        count = 0
+        if self.max_entries is not None:
+            count = max(0, len(self.entries) - self.max_entries + 1)
+
+        if self.max_bytes is not None:
+            excess = self.total_bytes + incoming_size - self.max_bytes
+            if excess > 0:
+                freed = 0
+                needed = 0
+                for entry in self.entries.values():
+                    if needed >= count and freed >= excess:
+                        break
+                    freed += entry.size
+                    needed += 1
+                count = needed
+
+        return count
+
+    def maybe_compact_heap(self) -> None:
+        """
+        🧹 בנה מחדש את ערימת התפוגה כשרוב הרשומות בה כבר לא בתוקף
+
+        מפתחות שנדרסו/נמחקו/פונו משאירים רשומות מתות בערימה. בנייה מחדש
+        כשהערימה גדולה פי 2 מה-shard שומרת על זיכרון חסום ועלות amortized O(1).
+        """
+        if len(self.expiry_heap) <= 2 * len(self.entries) + 64:
+            return
+
+        self.expiry_heap = [
+            (entry.hard_expires_at, entry.seq, key)
+            for key, entry in self.entries.items()
+        ]
+        heapq.heapify(self.expiry_heap)
+
+
 class CacheManager:
     """
     🗄️ מנהל Cache חכם עם TTL משתנה
 
     Features:
     ✅ Multi-tier TTL (6h, 3h, 24h, 30min)
-    ✅ Thread-safe with asyncio.Lock
-    ✅ Auto cleanup every 100 accesses
+    ✅ Sharded - N תתי-dict עם lock לכל shard (לפי hash של המפתח)
+    ✅ Lock-free read path - קריאה של ערך טרי לא לוקחת lock ולא מפרמטת לוגים
+    ✅ O(1) LRU eviction (OrderedDict)
+    ✅ Expiry heap - ניקוי ערכים שפג תוקפם ב-O(log n) amortized, בלי סריקה מלאה
+    ✅ Stale-while-revalidate - soft/hard TTL + רענון אחד ברקע
+    ✅ L2 אופציונלי (CacheBackend) - שורד הפעלה מחדש ומשותף בין workers
+    ✅ Cross-worker invalidation - כל sync_interval שניות כל worker מנקה מה-L1
+       מפתחות ש-workers אחרים שינו, ומפרסם את המונים שלו (סטטיסטיקה ל-node)
     ✅ Detailed statistics
-    ✅ Memory-efficient (max 1000 entries)
+    ✅ Memory-efficient - מגבלת ערכים (max_entries) ו/או תקציב בתים (max_bytes)
 
     Usage:
         cache = CacheManager()
@@ -93,31 +390,98 @@ class CacheManager:
             print("Cache MISS - fetch from API")
     """
 
-    def __init__(self, max_entries: int = 1000):
+    def __init__(
+        self,
+        max_entries: Optional[int] = 1000,
+        max_bytes: Optional[int] = None,
+        shards: int = 1,
+        l2: Optional[CacheBackend] = None,
+        sync_interval: float = 1.0
+    ):
         """
         אתחול מנהל Cache
 
         Args:
-            max_entries: מספר מקסימלי של ערכים (ברירת מחדל: 1000)
+            max_entries: מספר מקסימלי של ערכים (ברירת מחדל: 1000, None = ללא הגבלה)
+            max_bytes: תקציב זיכרון בבתים (None = ללא הגבלה). payload של
+                       fixtures לליגה שלמה "שוקל" כמו מאות מפתחות קטנים.
+                       ערך גדול מ-max_bytes לא נשמר ב-L1 (נספר ב-rejected_oversize).
+            shards: מספר ה-shards. המגבלות מתחלקות שווה ביניהם, כך שה-LRU
+                    מדויק בתוך shard ומקורב ברמת ה-Cache כולו. ערך גדול מחלקו
+                    של shard נכנס בכל זאת, על חשבון ה-LRU של ה-shards האחרים.
+            l2: שכבת L2 (read-through / write-through). None = רק זיכרון
+            sync_interval: כל כמה שניות לסנכרן invalidations וסטטיסטיקות מול
+                           ה-L2 המשותף - זה גם חסם ה-staleness בין workers
         """
-        self._cache: Dict[str, CacheEntry] = {}
-        self._lock = asyncio.Lock()
         self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._shards = [
+            _CacheShard(
+                max_entries=-(-max_entries // shards) if max_entries is not None else None,
+                max_bytes=-(-max_bytes // shards) if max_bytes is not None else None
+            )
+            for _ in range(shards)
+        ]
+        self._shard_count = shards
+        self._seq = itertools.count(1)
+        self._l2 = l2
+
+        # סנכרון בין workers (רק כשיש L2 משותף)
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._sync_interval = sync_interval
+        self._next_sync = time.monotonic() + sync_interval if l2 is not None else float("inf")
+        self._sync_cursor = l2.latest_change_id() if l2 is not None else 0
+        self._sync_task: Optional[asyncio.Future] = None
+        self._cluster_snapshot: Optional[dict] = None  # נאסף ב-sync_with_backend (ב-thread)
+
+        # Single-flight לטעינות (get_or_load) ולרענונים ברקע
+        self._flights = SingleFlight()
+        self._background_refreshes: Dict[str, asyncio.Future] = {}
+
+        # namespace → פונקציה שמשחזרת ערך שחזר מה-L2 (JSON) לאובייקטים של L1
+        self._decoders: Dict[str, Callable[[Any], Any]] = {}
 
         # Statistics
         self._total_gets = 0
         self._total_sets = 0
         self._cache_hits = 0
         self._cache_misses = 0
+        self._stale_hits = 0
+        self._background_refresh_count = 0
         self._cleanup_count = 0
-        self._auto_cleanup_interval = 100  # cleanup every 100 accesses
+        self._evicted_count = 0
+        self._rejected_count = 0
+        self._l2_hits = 0
+        self._l2_errors = 0
+        self._l2_invalidations = 0
+
+        logger.info(
+            f"🚀 CacheManager initialized "
+            f"(max_entries={max_entries}, max_bytes={max_bytes}, shards={shards}, "
+            f"l2={l2.path if l2 else None})"
+        )
 
-        logger.info(f"🚀 CacheManager initialized (max_entries={max_entries})")
+    def register_decoder(self, namespace: str, decode: Callable[[Any], Any]) -> None:
+        """
+        🔁 ערכים של namespace שחוזרים מה-L2 עוברים דרך decode לפני שנכנסים ל-L1
+
+        לדוגמה "fixtures" → רשימת FixtureRecord (במקום dicts רחבים בלי interning)
+        """
+        self._decoders[namespace] = decode
+
+    def _shard_for(self, key: str) -> _CacheShard:
+        """בחר shard לפי hash של המפתח"""
+        if self._shard_count == 1:
+            return self._shards[0]
+        return self._shards[hash(key) % self._shard_count]
 
     async def get(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
         """
         🔍 קבל ערך מה-Cache (אם קיים ולא פג תוקף)
 
+        ערך טרי מוחזר בלי lock (אין await בדרך, ולכן הקריאה אטומית מול
+        ה-event loop). רק MISS / stale / תפוגה עוברים למסלול עם lock.
+
         Args:
             key: מפתח ייחודי (לדוגמה: "standings_39_2024")
             ttl: TTL לבדיקה (אם לא סופק, לא בודק TTL)
@@ -125,59 +489,224 @@ class CacheManager:
         Returns:
             הנתונים אם קיימים ותקפים, אחרת None
         """
-        async with self._lock:
-            self._total_gets += 1
-
-            # Auto cleanup every N accesses
-            if self._total_gets % self._auto_cleanup_interval == 0:
-                await self._cleanup_expired()
-
-            if key not in self._cache:
-                self._cache_misses += 1
-                logger.debug(f"❌ Cache MISS: {key}")
-                return None
-
-            entry = self._cache[key]
+        self._total_gets += 1
+        shard = self._shard_for(key)
+        now = time.monotonic()
 
-            # Check if expired
-            if entry.is_expired():
-                self._cache_misses += 1
-                logger.debug(f"⏰ Cache EXPIRED: {key} (age={entry.age_seconds():.0f}s, ttl={entry.ttl}s)")
-                del self._cache[key]
-                return None
+        if now >= self._next_sync:
+            self._schedule_sync(now)
 
-            # Cache HIT!
+        # ⚡ Fast path - Cache HIT טרי, בלי lock
+        entry = shard.entries.get(key)
+        if entry is not None and now <= entry.expires_at:
             self._cache_hits += 1
             entry.hits += 1
-            entry.last_access = datetime.now()
-
-            logger.info(f"✅ Cache HIT: {key} (age={entry.age_seconds():.0f}s, hits={entry.hits})")
+            entry.last_access = time.time()
+            shard.entries.move_to_end(key)
+            logger.debug("✅ Cache HIT: %s", key)
             return entry.data
 
-    async def set(self, key: str, data: Any, ttl: int) -> None:
+        async with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None and entry.is_expired(now):
+                logger.debug("⏰ Cache EXPIRED: %s (ttl=%ss)", key, entry.ttl)
+                shard.remove(key)
+                entry = None
+
+            if entry is not None:
+                return self._hit(shard, key, entry, now)
+
+            self._cleanup_expired(shard, now)
+
+        # L1 MISS → L2 (מחוץ ל-lock, כדי שקריאת דיסק לא תחסום כתיבות ל-shard)
+        if self._l2 is not None:
+            entry = await self._load_from_l2(shard, key)
+            if entry is not None:
+                self._l2_hits += 1
+                return self._hit(shard, key, entry, time.monotonic())
+
+        self._cache_misses += 1
+        logger.debug("❌ Cache MISS: %s", key)
+        return None
+
+    def _hit(self, shard: _CacheShard, key: str, entry: CacheEntry, now: float) -> Any:
+        """רישום Cache HIT (כולל stale-while-revalidate) - סינכרוני, בלי await"""
+        self._cache_hits += 1
+        entry.hits += 1
+        entry.last_access = time.time()
+        if key in shard.entries:
+            shard.entries.move_to_end(key)
+
+        # Stale-while-revalidate: מגישים מיד, מרעננים ברקע (פעם אחת)
+        if entry.is_stale(now):
+            self._stale_hits += 1
+            self._schedule_refresh(key, entry)
+
+        logger.debug("✅ Cache HIT: %s", key)
+        return entry.data
+
+    async def set(
+        self,
+        key: str,
+        data: Any,
+        ttl: int,
+        stale_ttl: int = 0,
+        refresher: Optional[Callable[[], Awaitable[Any]]] = None,
+        tags: Optional[Iterable[str]] = None
+    ) -> None:
         """
         💾 שמור ערך ב-Cache
 
         Args:
-            key: מפתח ייחודי
+            key: מפתח ייחודי (עדיף מובנה - make_key("standings", 39, 2025))
             data: נתונים לשמירה
-            ttl: Time To Live בשניות
+            ttl: Time To Live בשניות (soft TTL)
+            stale_ttl: חלון נוסף (בשניות) שבו get מגיש ערך stale ומרענן ברקע
+            refresher: loader לרענון ברקע - בלעדיו ערך stale מוגש עד ה-hard TTL בלבד
+            tags: tags לביטול קבוצתי (make_tag("league", 39), ...)
         """
-        async with self._lock:
+        shard = self._shard_for(key)
+        size = estimate_size(key, data)
+        tags = self._normalize_tags(key, tags)
+
+        async with shard.lock:
             self._total_sets += 1
 
-            # Check memory limit
-            if len(self._cache) >= self._max_entries:
-                await self._cleanup_oldest()
+            if not self._fits(size):
+                self._rejected_count += 1
+                logger.warning(f"⚠️ Cache SKIP: {key} ({size} bytes > cache budget {self._max_bytes})")
+                return
+
+            # ערכים שפג תוקפם מפנים מקום לפני שמוחקים ערכים חיים
+            self._cleanup_expired(shard, time.monotonic())
 
             entry = CacheEntry(
                 data=data,
                 timestamp=datetime.now(),
-                ttl=ttl
+                ttl=ttl,
+                stale_ttl=stale_ttl,
+                refresher=refresher,
+                seq=next(self._seq),
+                size=size,
+                tags=tags
             )
 
-            self._cache[key] = entry
-            logger.info(f"💾 Cache SET: {key} (ttl={ttl}s, size={len(self._cache)})")
+            evicted = self._store(shard, key, entry)
+            if evicted:
+                logger.debug("🗑️ Memory cleanup: %d oldest entries removed", evicted)
+            logger.debug("💾 Cache SET: %s (ttl=%ss, size=%d bytes)", key, ttl, size)
+
+        if self._l2 is not None:
+            # ערכים שנבנו מ-key נמחקים ב-L2 באותה טרנזקציה של הכתיבה
+            await self._l2_call(
+                self._l2.set, key, data, ttl, stale_ttl, self._worker_id, tags, (dependency_tag(key),)
+            )
+            if self._total_sets % 1000 == 0:
+                await self._l2_call(self._l2.purge_expired)
+
+        await self._invalidate_dependents(key)
+
+    async def _invalidate_dependents(self, key: str) -> int:
+        """
+        🔗 key השתנה - מחק מה-L1 ערכים שנבנו ממנו (מסומנים ב-dependency_tag(key))
+
+        בדיקת ה-tag index זולה ולכן רצה בכל set. ב-L2 המשותף (שם ה-bundle יכול
+        לשבת אצל worker אחר) המחיקה נעשית בתוך ה-set עצמו (invalidate=...).
+        """
+        tag = dependency_tag(key)
+        removed = 0
+        for shard in self._shards:
+            if tag not in shard.tag_index:
+                continue
+            async with shard.lock:
+                for dependent in shard.keys_for_tag(tag):
+                    if shard.remove(dependent) is not None:
+                        removed += 1
+
+        if removed:
+            logger.info(f"🔗 Cache INVALIDATE dependents of {key}: {removed} entries removed")
+        return removed
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int = 0,
+        tags: Optional[Iterable[str]] = None
+    ) -> Optional[Any]:
+        """
+        🛫 קבל מה-Cache, ואם חסר - טען פעם אחת בלבד (single-flight)
+
+        כל ה-MISS-ים המקבילים על אותו מפתח חולקים טעינה אחת.
+        ערך None לא נשמר (כך שכישלון לא "ננעל" ב-Cache).
+
+        עם stale_ttl > 0: אחרי ה-TTL הערך הישן מוגש מיד ו-loader רץ פעם
+        אחת ברקע (stale-while-revalidate) - המשתמש לא ממתין ל-upstream.
+
+        Args:
+            key: מפתח ייחודי
+            loader: פונקציה אסינכרונית שמביאה את הנתונים (לרוב קריאת API)
+            ttl: Time To Live בשניות (soft TTL)
+            stale_ttl: חלון stale אחרי ה-TTL (ראה CacheTTL.stale_window)
+            tags: tags לביטול קבוצתי (נשמרים עם הערך שנטען)
+
+        Returns:
+            הנתונים (מה-Cache או מה-loader), או None
+        """
+        value = await self.get(key)
+        if value is not None:
+            # ערך שהגיע מ-L2 (אחרי הפעלה מחדש) לא מכיר את ה-loader - נצמיד אותו
+            entry = self._shard_for(key).entries.get(key)
+            if entry is not None and entry.refresher is None:
+                entry.refresher = loader
+                if entry.is_stale():
+                    self._schedule_refresh(key, entry)
+            return value
+
+        return await self._flights.do(key, self._make_loader(key, loader, ttl, stale_ttl, tags))
+
+    def _make_loader(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        tags: Optional[Iterable[str]] = None
+    ) -> Callable[[], Awaitable[Any]]:
+        """עטוף loader כך שישמור את התוצאה (ואת עצמו כ-refresher) ב-Cache"""
+        async def load_and_store():
+            loaded = await loader()
+            if loaded is not None:
+                await self.set(key, loaded, ttl, stale_ttl=stale_ttl, refresher=loader, tags=tags)
+            return loaded
+
+        return load_and_store
+
+    def _schedule_refresh(self, key: str, entry: CacheEntry) -> None:
+        """
+        🔄 תזמן רענון אחד ברקע לערך stale
+
+        אם כבר יש טעינה/רענון בטיסה למפתח - לא עושים כלום.
+        כישלון ברענון רק נרשם בלוג; הערך הישן ממשיך להיות מוגש עד ה-hard TTL.
+        """
+        if (entry.refresher is None
+                or key in self._background_refreshes
+                or self._flights.in_flight(key)):
+            return
+
+        refresh = self._make_loader(key, entry.refresher, entry.ttl, entry.stale_ttl, entry.tags)
+        task = asyncio.ensure_future(self._flights.do(key, refresh))
+        self._background_refreshes[key] = task
+        self._background_refresh_count += 1
+        task.add_done_callback(functools.partial(self._on_refresh_done, key))
+        logger.debug(f"🔄 Background refresh scheduled: {key}")
+
+    def _on_refresh_done(self, key: str, task: asyncio.Future) -> None:
+        if self._background_refreshes.get(key) is task:
+            del self._background_refreshes[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Background refresh failed: {key}: {task.exception()}")
 
     async def delete(self, key: str) -> bool:
         """
@@ -186,12 +715,93 @@ class CacheManager:
         Returns:
             True אם נמחק, False אם לא קיים
         """
-        async with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                logger.info(f"🗑️ Cache DELETE: {key}")
-                return True
-            return False
+        shard = self._shard_for(key)
+        async with shard.lock:
+            removed = shard.remove(key) is not None
+
+        if self._l2 is not None:
+            removed = bool(await self._l2_call(self._l2.delete, key, self._worker_id)) or removed
+
+        if removed:
+            logger.info(f"🗑️ Cache DELETE: {key}")
+        return removed
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        🗑️ מחיקה מרובה - lock אחד לכל shard וקריאת L2 אחת
+
+        Returns:
+            מספר הערכים שנמחקו מ-L1
+        """
+        by_shard: Dict[int, List[str]] = {}
+        for key in keys:
+            by_shard.setdefault(id(self._shard_for(key)), []).append(key)
+
+        removed = 0
+        all_keys: List[str] = []
+        for shard in self._shards:
+            shard_keys = by_shard.get(id(shard))
+            if not shard_keys:
+                continue
+            all_keys.extend(shard_keys)
+            async with shard.lock:
+                removed += sum(1 for key in shard_keys if shard.remove(key) is not None)
+
+        if self._l2 is not None and all_keys:
+            await self._l2_call(self._l2.delete_many, all_keys, self._worker_id)
+
+        if removed:
+            logger.info(f"🗑️ Cache DELETE: {removed} entries")
+        return removed
+
+    async def invalidate_tag(self, tag: str) -> int:
+        """
+        🏷️ מחק את כל הערכים המסומנים ב-tag
+
+        עלות ביחס למספר הערכים התואמים (tag index), לא לגודל ה-Cache.
+        ב-L2 המשותף המחיקה נרשמת לכל מפתח, כך ש-workers אחרים מנקים את ה-L1 שלהם.
+
+        Usage:
+            # משחק הסתיים - טבלה, פורמה ו-H2H של הקבוצות כבר לא עדכניים
+            await cache.invalidate_tag(make_tag("team", 50))
+
+        Returns:
+            מספר הערכים שנמחקו מ-L1
+        """
+        removed = 0
+        for shard in self._shards:
+            if tag not in shard.tag_index:
+                continue
+            async with shard.lock:
+                for key in shard.keys_for_tag(tag):
+                    if shard.remove(key) is not None:
+                        removed += 1
+
+        if self._l2 is not None:
+            await self._l2_call(self._l2.invalidate_tag, tag, self._worker_id)
+
+        logger.info(f"🏷️ Cache INVALIDATE tag={tag}: {removed} entries removed")
+        return removed
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """🏷️ invalidate_tag לכמה tags (לדוגמה: ליגה + שתי קבוצות של משחק שהסתיים)"""
+        removed = 0
+        for tag in tags:
+            removed += await self.invalidate_tag(tag)
+        return removed
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """🏷️ מחק את כל המפתחות המובנים ב-namespace (לדוגמה: "standings")"""
+        return await self.invalidate_tag(make_tag("ns", namespace))
+
+    @staticmethod
+    def _normalize_tags(key: str, tags: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """tags ייחודיים + tag ה-namespace של מפתח מובנה"""
+        normalized = dict.fromkeys(tags or ())
+        namespace = key_namespace(key)
+        if namespace is not None:
+            normalized[make_tag("ns", namespace)] = None
+        return tuple(normalized)
 
     async def clear(self) -> int:
         """
@@ -200,60 +810,201 @@ class CacheManager:
         Returns:
             מספר הערכים שנמחקו
         """
-        async with self._lock:
-            count = len(self._cache)
-            self._cache.clear()
-            logger.info(f"🧹 Cache CLEARED: {count} entries removed")
-            return count
-
-    async def _cleanup_expired(self) -> int:
+        count = 0
+        for shard in self._shards:
+            async with shard.lock:
+                count += shard.clear()
+        if self._l2 is not None:
+            await self._l2_call(self._l2.clear, self._worker_id)
+        logger.info(f"🧹 Cache CLEARED: {count} entries removed")
+        return count
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # 💽 L2 (on-disk) tier
+    # ─────────────────────────────────────────────────────────────────────────
+
+    async def warm_up(self, limit: int = 500) -> int:
         """
-        🧼 ניקוי אוטומטי של ערכים שפג תוקפם
+        🔥 חימום L1 מה-L2 אחרי הפעלה מחדש (הערכים האחרונים שנשמרו)
+
+        גם בלי warm_up ה-L2 נקרא ב-MISS, כך שהשרת "חם" מהבקשה הראשונה;
+        warm_up רק חוסך את קריאת הדיסק לערכים החמים.
 
         Returns:
-            מספר הערכים שנמחקו
+            מספר הערכים שנטענו ל-L1
         """
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if entry.is_expired()
-        ]
+        if self._l2 is None:
+            return 0
 
-        for key in expired_keys:
-            del self._cache[key]
+        rows = await self._l2_call(self._l2.load_recent, limit) or []
+        loaded = 0
+        for key, *row in rows:
+            shard = self._shard_for(key)
+            async with shard.lock:
+                if key in shard.entries:
+                    continue
+                entry = self._entry_from_l2(key, *row)
+                if self._fits(entry.size):
+                    self._store(shard, key, entry)
+                    loaded += 1
+                else:
+                    self._rejected_count += 1
+
+        logger.info(f"🔥 Cache warm-up: {loaded} entries loaded from L2")
+        return loaded
+
+    async def _load_from_l2(self, shard: _CacheShard, key: str) -> Optional[CacheEntry]:
+        """קרא ערך מ-L2 וקדם אותו ל-L1 (עם אותו זמן תפוגה מוחלט)"""
+        row = await self._l2_call(self._l2.get, key)
+        if row is None:
+            return None
 
-        if expired_keys:
-            self._cleanup_count += 1
-            logger.info(f"🧼 Auto cleanup #{self._cleanup_count}: {len(expired_keys)} expired entries removed")
+        entry = self._entry_from_l2(key, *row)
+        async with shard.lock:
+            existing = shard.entries.get(key)
+            if existing is not None and not existing.is_expired():
+                return existing  # מישהו כתב בינתיים - הערך ב-L1 עדכני יותר
+            if self._fits(entry.size):
+                self._store(shard, key, entry)
+            else:
+                self._rejected_count += 1
+        return entry
+
+    def _fits(self, size: int) -> bool:
+        """ערך נכנס ל-L1 אם הוא לא גדול מהתקציב הכולל (לא מחלקו של shard אחד)"""
+        return self._max_bytes is None or size <= self._max_bytes
+
+    def _store(self, shard: _CacheShard, key: str, entry: CacheEntry) -> int:
+        """
+        הכנס ל-shard ושמור על התקציב הכולל
 
-        return len(expired_keys)
+        ערך גדול מחלקו של ה-shard (max_bytes / shards) - למשל fixtures של יום שלם -
+        עדיין נכנס: ה-shard מפנה את ה-LRU שלו, ומה שחורג מ-max_bytes מפונה מה-LRU
+        של ה-shard המלא ביותר. הפינוי סינכרוני, וכל בלוק שמחזיק lock של shard
+        הוא בלי await - כך שאין צורך לקחת את ה-locks של ה-shards האחרים.
 
-    async def _cleanup_oldest(self, count: int = 100) -> int:
+        Returns:
+            מספר הערכים שפונו
         """
-        🗑️ מחק את הערכים הכי ישנים (LRU - Least Recently Used)
+        evicted = shard.insert(key, entry)
+        if self._max_bytes is not None and self._shard_count > 1:
+            excess = sum(other.total_bytes for other in self._shards) - self._max_bytes
+            while excess > 0:
+                donor = max(
+                    (other for other in self._shards if other is not shard and other.entries),
+                    key=lambda other: other.total_bytes,
+                    default=None
+                )
+                if donor is None:
+                    break
+                before = donor.total_bytes
+                evicted += donor.evict_oldest(1)
+                excess -= before - donor.total_bytes
+        self._evicted_count += evicted
+        return evicted
+
+    def _entry_from_l2(
+        self,
+        key: str,
+        data: Any,
+        soft_expires_at: float,
+        hard_expires_at: float,
+        ttl: int,
+        stale_ttl: int,
+        tags: Tuple[str, ...] = ()
+    ) -> CacheEntry:
+        """המרת זמני epoch מה-L2 לזמני monotonic של L1 (והערך דרך ה-decoder של ה-namespace)"""
+        decode = self._decoders.get(key_namespace(key))
+        if decode is not None and data is not None:
+            data = decode(data)
+        offset = time.monotonic() - time.time()
+        return CacheEntry(
+            data=data,
+            timestamp=datetime.fromtimestamp(soft_expires_at - ttl),
+            ttl=ttl,
+            stale_ttl=stale_ttl,
+            expires_at=soft_expires_at + offset,
+            hard_expires_at=hard_expires_at + offset,
+            seq=next(self._seq),
+            size=estimate_size(key, data),
+            tags=tuple(tags)
+        )
 
-        Args:
-            count: כמה ערכים למחוק
+    # ============================================================
+    # 🔄 Cross-worker sync
+    # ============================================================
+
+    def _schedule_sync(self, now: float) -> None:
+        """תזמן סנכרון ברקע - get עצמו לא מחכה ל-L2"""
+        self._next_sync = now + self._sync_interval
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        try:
+            self._sync_task = asyncio.ensure_future(self.sync_with_backend())
+        except RuntimeError:
+            # אין event loop רץ (קריאה מקוד סינכרוני) - ננסה בפעם הבאה
+            self._sync_task = None
+
+    async def sync_with_backend(self) -> int:
+        """
+        🔄 משוך invalidations של workers אחרים, פרסם את המונים של ה-worker הזה
+        ושמור snapshot של המונים המצטברים (get_stats מחזיר אותו בלי לגשת ל-L2)
+
+        ערך ש-worker אחר כתב/מחק נזרק מה-L1 המקומי, והקריאה הבאה תביא
+        את הגרסה העדכנית מה-L2 המשותף.
 
         Returns:
-            מספר הערכים שנמחקו
+            מספר הערכים שנזרקו מה-L1
         """
-        if not self._cache:
+        if self._l2 is None:
             return 0
 
-        # Sort by last_access
-        sorted_entries = sorted(
-            self._cache.items(),
-            key=lambda x: x[1].last_access
-        )
-
-        # Delete oldest
-        deleted = 0
-        for key, _ in sorted_entries[:count]:
-            del self._cache[key]
-            deleted += 1
+        changes = await self._l2_call(self._l2.changes_since, self._sync_cursor, self._worker_id)
+        dropped = 0
+        if changes is not None:
+            self._sync_cursor, keys, cleared = changes
+            if cleared:
+                for shard in self._shards:
+                    async with shard.lock:
+                        dropped += shard.clear()
+            else:
+                for key in keys:
+                    shard = self._shard_for(key)
+                    async with shard.lock:
+                        if shard.remove(key) is not None:
+                            dropped += 1
+
+        if dropped:
+            self._l2_invalidations += dropped
+            logger.debug("🔄 Cross-worker sync: %d entries invalidated", dropped)
+
+        await self._l2_call(self._l2.publish_stats, self._worker_id, {
+            "total_gets": self._total_gets,
+            "total_sets": self._total_sets,
+            "cache_hits": self._cache_hits,
+            "cache_misses": self._cache_misses
+        })
+        snapshot = await self._l2_call(self._l2.cluster_stats, max(10 * self._sync_interval, 30.0))
+        if snapshot is not None:
+            self._cluster_snapshot = snapshot
+        return dropped
+
+    async def _l2_call(self, func: Callable, *args) -> Any:
+        """הרץ פעולת L2 ב-thread; כשל ב-L2 לא מפיל את ה-Cache (L1 ממשיך לעבוד)"""
+        try:
+            return await asyncio.to_thread(func, *args)
+        except Exception as e:
+            self._l2_errors += 1
+            logger.warning(f"⚠️ L2 cache error ({func.__name__}): {e}")
+            return None
 
-        logger.warning(f"🗑️ Memory cleanup: {deleted} oldest entries removed (was {len(self._cache) + deleted})")
-        return deleted
+    def _cleanup_expired(self, shard: _CacheShard, now: float) -> int:
+        """🧼 ניקוי ערכים שפג תוקפם ב-shard (ראה _CacheShard.cleanup_expired)"""
+        removed = shard.cleanup_expired(now)
+        if removed:
+            self._cleanup_count += 1
+            logger.debug("🧼 Auto cleanup #%d: %d expired entries removed", self._cleanup_count, removed)
+        return removed
 
     def get_stats(self) -> dict:
         """
@@ -265,25 +1016,42 @@ class CacheManager:
         total_requests = self._cache_hits + self._cache_misses
         hit_ratio = (self._cache_hits / total_requests * 100) if total_requests > 0 else 0
 
-        # Calculate memory usage (rough estimate)
-        memory_mb = sum(
-            len(json.dumps(entry.data)) if isinstance(entry.data, (dict, list)) else 100
-            for entry in self._cache.values()
-        ) / (1024 * 1024)
+        # גודל כל ערך חושב פעם אחת ב-set - O(1)
+        total_bytes = sum(shard.total_bytes for shard in self._shards)
+        memory_mb = total_bytes / (1024 * 1024)
 
         return {
-            "cache_size": len(self._cache),
+            "cache_size": sum(len(shard.entries) for shard in self._shards),
             "max_entries": self._max_entries,
+            "shards": self._shard_count,
+            "tags": sum(len(shard.tag_index) for shard in self._shards),
+            "memory_usage_bytes": total_bytes,
             "memory_usage_mb": round(memory_mb, 2),
+            "max_bytes": self._max_bytes,
             "total_gets": self._total_gets,
             "total_sets": self._total_sets,
             "cache_hits": self._cache_hits,
             "cache_misses": self._cache_misses,
+            "stale_hits": self._stale_hits,
+            "background_refreshes": self._background_refresh_count,
             "hit_ratio": f"{hit_ratio:.1f}%",
             "cleanup_count": self._cleanup_count,
+            "evicted_count": self._evicted_count,
+            "rejected_oversize": self._rejected_count,
+            "l2_enabled": self._l2 is not None,
+            "l2_hits": self._l2_hits,
+            "l2_errors": self._l2_errors,
+            "l2_invalidations": self._l2_invalidations,
+            "worker_id": self._worker_id,
+            "cluster": self._cluster_snapshot,  # מה-sync האחרון - בלי SQLite על ה-event loop
+            "coalesced_loads": self._flights.coalesced,
             "status": "🟢 Healthy" if hit_ratio > 60 else "🟡 Low efficiency"
         }
 
+    def get_keys_for_tag(self, tag: str) -> list:
+        """🏷️ המפתחות ב-L1 שמסומנים ב-tag"""
+        return [key for shard in self._shards for key in shard.keys_for_tag(tag)]
+
     def get_all_keys(self) -> list:
         """
         🔑 קבל רשימת כל המפתחות ב-Cache
@@ -291,7 +1059,27 @@ class CacheManager:
         Returns:
             list של מפתחות
         """
-        return list(self._cache.keys())
+        return [key for shard in self._shards for key in shard.entries]
+
+    def contains(self, key: str) -> bool:
+        """
+        🔍 האם key ב-L1 ועוד ניתן להגשה (לפני ה-hard TTL) - בלי לספור hit/miss
+
+        ערך שעבר את ה-hard TTL אבל עוד לא נוקה פיזית לא נחשב.
+        """
+        entry = self._shard_for(key).entries.get(key)
+        return entry is not None and not entry.is_expired()
+
+    def ttl_remaining(self, key: str) -> Optional[float]:
+        """
+        ⏳ כמה שניות נשארו עד ה-soft TTL של key (שלילי = stale, None = לא קיים)
+
+        ערך שנבנה מכמה מפתחות לא צריך לחיות יותר מהתלות הקצרה ביותר שלו.
+        """
+        entry = self._shard_for(key).entries.get(key)
+        if entry is None:
+            return None
+        return entry.expires_at - time.monotonic()
 
     def get_entry_metadata(self, key: str) -> Optional[dict]:
         """
@@ -303,10 +1091,10 @@ class CacheManager:
         Returns:
             dict עם metadata או None אם לא קיים
         """
-        if key not in self._cache:
+        entry = self._shard_for(key).entries.get(key)
+        if entry is None:
             return None
 
-        entry = self._cache[key]
         return {
             "key": key,
             **entry.to_dict()
@@ -315,7 +1103,18 @@ class CacheManager:
 
 # 🌍 Global instance (singleton pattern)
 # שימוש: from cache_manager import cache_manager
-cache_manager = CacheManager(max_entries=1000)
+# תקציב זיכרון בבתים (CACHE_MAX_MB) - לא מספר ערכים
+CACHE_MAX_BYTES = int(float(os.getenv("CACHE_MAX_MB", "64")) * 1024 * 1024)
+
+# L2 אופציונלי - CACHE_BACKEND=sqlite (משותף לכל ה-workers, ברירת מחדל ב-/dev/shm)
+# או CACHE_L2_PATH=cache_l2.sqlite3 (קובץ על הדיסק - שורד גם reboot)
+cache_manager = CacheManager(
+    max_entries=None,
+    max_bytes=CACHE_MAX_BYTES,
+    shards=16,
+    l2=create_cache_backend(),
+    sync_interval=float(os.getenv("CACHE_SYNC_INTERVAL", "1.0"))
+)
 
 
 # 🎯 Helper: TTL Constants (לשימוש קל)
@@ -328,6 +1127,22 @@ class CacheTTL:
     H2H = 86400  # 24 hours
     STATIC = 604800  # 7 days
 
+    # Stale-while-revalidate: כמה זמן אחרי ה-TTL עוד מגישים ערך ישן
+    # (ומרעננים ברקע). משחקים חיים - אף פעם לא stale.
+    STALE_WINDOWS = {
+        LIVE_MATCH: 0,
+        MATCH_DETAILS: 600,  # 10 minutes
+        LAST_5_MATCHES: 3600,  # 1 hour
+        STANDINGS: 21600,  # 6 hours
+        H2H: 86400,  # 24 hours
+        STATIC: 604800,  # 7 days
+    }
+
+    @classmethod
+    def stale_window(cls, ttl: int) -> int:
+        """חלון ה-stale של tier (ברירת מחדל ל-TTL לא מוכר: 0 = ללא stale)"""
+        return cls.STALE_WINDOWS.get(ttl, 0)
+
 
 if __name__ == "__main__":
     """
@@ -372,5 +1187,5 @@ if __name__ == "__main__":
 
         print("🎉 All tests passed!")
 
-    # Run tests
+    # Run tests (benchmarks: bench_cache.py)
     asyncio.run(test_cache())
@@ -0,0 +1,448 @@
+"""
+💽 Persistent / Shared Cache Store - L2 Tier על SQLite
+Created by: Rafael & AI Assistant (Phase 2)
+Version: 2.0 - Shared across uvicorn workers
+
+מטרה:
+שכבת L2 מאחורי CacheManager:
+1. הפעלה מחדש / deploy לא מתחילים מ-Cache ריק ולא שורפים תקציב API-Sports
+2. כל ה-workers על אותו שרת (uvicorn --workers 8) חולקים Cache אחד -
+   בלי Redis חיצוני. קובץ ב-/dev/shm = זיכרון משותף בפועל.
+
+עקרונות:
+✅ CacheBackend - ממשק pluggable; SQLiteCacheStore הוא המימוש המקומי
+✅ SQLite במצב WAL - קוראים מקבילים + כותב אחד (גם בין תהליכים)
+✅ mmap - דפי ה-DB ממופים לזיכרון, קריאה חמה כמעט בלי syscalls
+✅ אותה סמנטיקת TTL כמו L1 (soft/hard) - נשמרת כזמן שעון-קיר (epoch),
+   כך שכל ה-workers רואים את אותה תפוגה ושורדים הפעלה מחדש
+✅ Invalidation log - כל set/delete/clear נרשם, ו-workers אחרים מנקים
+   את העותק שלהם ב-L1 (עקביות תוך sync_interval)
+✅ Worker stats - כל worker מפרסם מונים, get_stats מציג סיכום לכל ה-node
+✅ Tags - טבלת tag → key עם אינדקס, invalidate_tag מוחק רק את התואמים
+✅ פעולות סינכרוניות - CacheManager מריץ אותן ב-asyncio.to_thread
+"""
+
+import logging
+import os
+from abc import ABC, abstractmethod
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from records import to_json as _dumps  # רשומות (FixtureRecord) נשמרות כ-to_dict
+except ImportError:
+    from backend.records import to_json as _dumps
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# (data, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags) - זמנים ב-epoch
+StoredEntry = Tuple[Any, float, float, int, int, Tuple[str, ...]]
+
+# (key, *StoredEntry)
+StoredRow = Tuple[str, Any, float, float, int, int, Tuple[str, ...]]
+
+_TAG_SEPARATOR = "\n"
+
+# (new_cursor, invalidated_keys, cleared_all)
+ChangeSet = Tuple[int, List[str], bool]
+
+# כמה זמן שומרים את יומן ה-invalidations (worker שמפגר יותר מזה - מנקה את כל ה-L1)
+INVALIDATION_RETENTION_SECONDS = 3600
+
+
+class CacheBackend(ABC):
+    """
+    🔌 ממשק ל-backend של L2 - כל מימוש (SQLite, socket מקומי, Redis בעתיד)
+    צריך לספק את הפעולות האלה. כל הפעולות סינכרוניות.
+
+    get / set / delete / invalidate_tag / clear חובה (abstractmethod) - מימוש
+    חסר נכשל כבר ביצירה, לא באמצע בקשה. לשאר יש ברירת מחדל של backend לא משותף.
+
+    origin: מזהה ה-worker שביצע את השינוי - כדי שלא ינקה את ה-L1 של עצמו.
+    invalidate (ב-set): tags שהערכים המסומנים בהם נמחקים באותה כתיבה -
+    ערכים שנבנו מ-key (dependency_tag), בלי קריאה / טרנזקציה נוספת.
+    """
+
+    path: Optional[str] = None
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[StoredEntry]:
+        ...
+
+    @abstractmethod
+    def set(
+        self, key: str, data: Any, ttl: int, stale_ttl: int = 0,
+        origin: Optional[str] = None, tags: Iterable[str] = (), invalidate: Iterable[str] = ()
+    ) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str, origin: Optional[str] = None) -> bool:
+        ...
+
+    def delete_many(self, keys: Iterable[str], origin: Optional[str] = None) -> int:
+        return sum(1 for key in keys if self.delete(key, origin))
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str, origin: Optional[str] = None) -> int:
+        ...
+
+    @abstractmethod
+    def clear(self, origin: Optional[str] = None) -> int:
+        ...
+
+    def purge_expired(self) -> int:
+        return 0
+
+    def load_recent(self, limit: int) -> List[StoredRow]:
+        return []
+
+    def latest_change_id(self) -> int:
+        return 0
+
+    def changes_since(self, cursor: int, origin: Optional[str] = None) -> ChangeSet:
+        """invalidations של workers אחרים מאז cursor (ברירת מחדל: backend לא משותף)"""
+        return cursor, [], False
+
+    def publish_stats(self, worker_id: str, stats: Dict[str, int]) -> None:
+        pass
+
+    def cluster_stats(self, max_age: float = 60.0) -> Optional[Dict[str, Any]]:
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCacheStore(CacheBackend):
+    """
+    💽 L2 Cache על קובץ SQLite (WAL + mmap) - משותף לכל ה-workers שפותחים
+    את אותו קובץ. מומלץ נתיב ב-/dev/shm (זיכרון משותף, בלי I/O לדיסק) ל-Cache
+    בין workers, או נתיב על הדיסק כדי לשרוד גם reboot.
+
+    Usage:
+        store = SQLiteCacheStore("cache_l2.sqlite3")
+        store.set("standings:39:2025", data, ttl=21600, stale_ttl=21600, tags=["league:39"])
+        row = store.get("standings:39:2025")  # (data, soft_exp, hard_exp, ttl, stale_ttl, tags)
+    """
+
+    def __init__(self, path: str, mmap_size: int = 256 * 1024 * 1024):
+        """
+        Args:
+            path: נתיב לקובץ ה-DB (נוצר אם לא קיים)
+            mmap_size: כמה בתים מה-DB למפות לזיכרון
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                stored_at REAL NOT NULL,
+                soft_expires_at REAL NOT NULL,
+                hard_expires_at REAL NOT NULL,
+                ttl INTEGER NOT NULL,
+                stale_ttl INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_hard_expires ON cache_entries(hard_expires_at)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")}
+        if "tags" not in columns:
+            self._conn.execute("ALTER TABLE cache_entries ADD COLUMN tags TEXT NOT NULL DEFAULT ''")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_invalidations (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT,
+                origin TEXT,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_worker_stats (
+                worker_id TEXT PRIMARY KEY,
+                total_gets INTEGER NOT NULL,
+                total_sets INTEGER NOT NULL,
+                cache_hits INTEGER NOT NULL,
+                cache_misses INTEGER NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        purged = self.purge_expired()
+        logger.info(f"💽 SQLiteCacheStore opened: {path} ({purged} expired entries purged)")
+
+    def get(self, key: str) -> Optional[StoredEntry]:
+        """קבל ערך אם קיים ולא עבר את ה-hard TTL"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags "
+                "FROM cache_entries WHERE key = ? AND hard_expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        value, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags = row
+        return _loads(value), soft_expires_at, hard_expires_at, ttl, stale_ttl, _split_tags(tags)
+
+    def set(
+        self, key: str, data: Any, ttl: int, stale_ttl: int = 0,
+        origin: Optional[str] = None, tags: Iterable[str] = (), invalidate: Iterable[str] = ()
+    ) -> None:
+        """
+        שמור ערך (דורס ערך קיים, כולל ה-tags שלו) ורשום invalidation ל-workers האחרים
+
+        ערכים המסומנים ב-invalidate נמחקים באותה טרנזקציה - חיפוש באינדקס של
+        cache_tags, כך שמפתח בלי תלויים לא עולה כלום מעבר לכתיבה עצמה.
+        """
+        now = time.time()
+        payload = _dumps(data)
+        tags = tuple(tags)
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, value, stored_at, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, payload, now, now + ttl, now + ttl + stale_ttl, ttl, stale_ttl,
+                 _TAG_SEPARATOR.join(tags))
+            )
+            self._conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+            if tags:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags]
+                )
+            self._log_invalidation(key, origin, now)
+            for tag in invalidate:
+                dependents = [
+                    row[0] for row in
+                    self._conn.execute("SELECT key FROM cache_tags WHERE tag = ?", (tag,))
+                ]
+                if dependents:
+                    self._delete_keys(dependents, origin, now)
+
+    def delete(self, key: str, origin: Optional[str] = None) -> bool:
+        return self.delete_many([key], origin) > 0
+
+    def delete_many(self, keys: Iterable[str], origin: Optional[str] = None) -> int:
+        """מחיקה מרובה בטרנזקציה אחת"""
+        keys = list(keys)
+        if not keys:
+            return 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            return self._delete_keys(keys, origin, time.time())
+
+    def invalidate_tag(self, tag: str, origin: Optional[str] = None) -> int:
+        """🏷️ מחק את כל הערכים המסומנים ב-tag (דרך האינדקס - לא סורק הכל)"""
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                row[0] for row in
+                self._conn.execute("SELECT key FROM cache_tags WHERE tag = ?", (tag,))
+            ]
+            return self._delete_keys(keys, origin, time.time())
+
+    def _delete_keys(self, keys: List[str], origin: Optional[str], now: float) -> int:
+        """מחיקת ערכים + ה-tags שלהם + רישום invalidation (בתוך טרנזקציה פתוחה)"""
+        rows = [(key,) for key in keys]
+        deleted = self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", rows).rowcount
+        self._conn.executemany("DELETE FROM cache_tags WHERE key = ?", rows)
+        self._conn.executemany(
+            "INSERT INTO cache_invalidations (key, origin, created_at) VALUES (?, ?, ?)",
+            [(key, origin, now) for key in keys]
+        )
+        return deleted
+
+    def clear(self, origin: Optional[str] = None) -> int:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.execute("DELETE FROM cache_entries")
+            self._conn.execute("DELETE FROM cache_tags")
+            self._log_invalidation(None, origin, time.time())  # key=NULL → clear
+        return cursor.rowcount
+
+    def _log_invalidation(self, key: Optional[str], origin: Optional[str], now: float) -> None:
+        self._conn.execute(
+            "INSERT INTO cache_invalidations (key, origin, created_at) VALUES (?, ?, ?)",
+            (key, origin, now)
+        )
+
+    def purge_expired(self) -> int:
+        """מחק ערכים שעברו את ה-hard TTL (משתמש באינדקס - לא סורק הכל) ו-invalidations ישנים"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_tags WHERE key IN "
+                "(SELECT key FROM cache_entries WHERE hard_expires_at <= ?)", (now,)
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE hard_expires_at <= ?", (now,)
+            )
+            self._conn.execute(
+                "DELETE FROM cache_invalidations WHERE created_at <= ?",
+                (now - INVALIDATION_RETENTION_SECONDS,)
+            )
+        return cursor.rowcount
+
+    def latest_change_id(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM cache_invalidations").fetchone()
+        return row[0] or 0
+
+    def changes_since(self, cursor: int, origin: Optional[str] = None) -> ChangeSet:
+        """
+        🔄 invalidations של workers אחרים מאז cursor
+
+        Returns:
+            (cursor חדש, מפתחות לניקוי מ-L1, האם לנקות את כל ה-L1)
+        """
+        with self._lock:
+            oldest = self._conn.execute("SELECT MIN(id) FROM cache_invalidations").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT id, key, origin FROM cache_invalidations WHERE id > ? ORDER BY id",
+                (cursor,)
+            ).fetchall()
+
+        # היומן נחתך מאז הסנכרון האחרון - אי אפשר לדעת מה השתנה
+        cleared = oldest is not None and cursor and oldest > cursor + 1
+        keys = []
+        for _, key, row_origin in rows:
+            if row_origin is not None and row_origin == origin:
+                continue
+            if key is None:
+                cleared = True
+            else:
+                keys.append(key)
+
+        new_cursor = rows[-1][0] if rows else cursor
+        return new_cursor, keys, bool(cleared)
+
+    def publish_stats(self, worker_id: str, stats: Dict[str, int]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_worker_stats "
+                "(worker_id, total_gets, total_sets, cache_hits, cache_misses, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    worker_id, stats["total_gets"], stats["total_sets"],
+                    stats["cache_hits"], stats["cache_misses"], time.time()
+                )
+            )
+
+    def cluster_stats(self, max_age: float = 60.0) -> Optional[Dict[str, Any]]:
+        """📊 סיכום מונים לכל ה-workers שדיווחו ב-max_age השניות האחרונות"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(total_gets), 0), COALESCE(SUM(total_sets), 0), "
+                "COALESCE(SUM(cache_hits), 0), COALESCE(SUM(cache_misses), 0) "
+                "FROM cache_worker_stats WHERE updated_at > ?",
+                (time.time() - max_age,)
+            ).fetchone()
+            shared_entries = self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+        workers, gets, sets, hits, misses = row
+        total = hits + misses
+        return {
+            "workers": workers,
+            "shared_entries": shared_entries,
+            "total_gets": gets,
+            "total_sets": sets,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "hit_ratio": f"{(hits / total * 100) if total else 0:.1f}%"
+        }
+
+    def load_recent(self, limit: int) -> List[StoredRow]:
+        """
+        🔥 הערכים האחרונים שנשמרו (ולא פגו) - לחימום L1 אחרי הפעלה מחדש
+
+        Returns:
+            [(key, data, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags), ...]
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, soft_expires_at, hard_expires_at, ttl, stale_ttl, tags "
+                "FROM cache_entries WHERE hard_expires_at > ? "
+                "ORDER BY stored_at DESC LIMIT ?",
+                (time.time(), limit)
+            ).fetchall()
+
+        return [
+            (key, _loads(value), soft_exp, hard_exp, ttl, stale_ttl, _split_tags(tags))
+            for key, value, soft_exp, hard_exp, ttl, stale_ttl, tags in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _split_tags(tags: str) -> Tuple[str, ...]:
+    return tuple(tags.split(_TAG_SEPARATOR)) if tags else ()
+
+
+def create_cache_backend() -> Optional[CacheBackend]:
+    """
+    🏭 בחירת backend לפי משתני סביבה
+
+    CACHE_BACKEND:
+        memory  - בלי L2 (ברירת מחדל, אלא אם CACHE_L2_PATH מוגדר)
+        sqlite  - SQLiteCacheStore ב-CACHE_L2_PATH, או כברירת מחדל
+                  ב-/dev/shm (זיכרון משותף לכל ה-workers על ה-node)
+    """
+    backend = os.getenv("CACHE_BACKEND", "").lower()
+    path = os.getenv("CACHE_L2_PATH")
+
+    if backend == "memory" or (not backend and not path):
+        return None
+
+    if backend not in ("", "sqlite"):
+        logger.warning(f"⚠️ Unknown CACHE_BACKEND={backend} - using in-memory cache only")
+        return None
+
+    if not path:
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        path = os.path.join(shm_dir, "smartsports_cache.sqlite3")
+
+    return SQLiteCacheStore(path)
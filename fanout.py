@@ -0,0 +1,191 @@
+"""
+🌳 Fan-Out - הרצת fetches תלויים/בלתי-תלויים במקביל
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+ב-ai_analyze_match כל הקריאות רצו אחת אחרי השנייה: טבלה → סטטיסטיקות בית →
+סטטיסטיקות חוץ → פורמה בית → פורמה חוץ → H2H. רובן לא תלויות אחת בשנייה
+ברגע שמזהי הקבוצות ידועים, כך שזמן התגובה היה סכום כל הקריאות.
+
+כאן כל fetch מצהיר על התלויות שלו (DAG), וכל מה שהתלויות שלו מוכנות רץ מיד:
+✅ זמן כולל ≈ המסלול הארוך ביותר בגרף, לא הסכום
+✅ timeout לכל fetch + deadline כולל
+✅ תוצאות חלקיות - fetch שנכשל לא מפיל את השאר (רק את מי שתלוי בו)
+✅ בלי threads - asyncio בלבד
+
+Usage:
+    result = await fan_out([
+        FetchTask("standings", lambda r: api.get_league_standings(39)),
+        FetchTask("teams", lambda r: resolve_teams(r["standings"]), deps=("standings",)),
+        FetchTask("h2h", lambda r: api.get_h2h_statistics(*r["teams"]), deps=("teams",), timeout=5),
+    ], deadline=15)
+
+    if result.ok("h2h"):
+        h2h = result.get("h2h")
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchTask:
+    """
+    🧩 fetch בודד בגרף
+
+    Attributes:
+        name: שם ייחודי (מפתח התוצאה)
+        func: מקבל dict של תוצאות התלויות ומחזיר awaitable
+        deps: שמות ה-fetches שחייבים להסתיים (בהצלחה) לפני שזה רץ
+        timeout: שניות ל-fetch הזה (None = בלי הגבלה מעבר ל-deadline)
+        default: הערך ב-result.get כשה-fetch נכשל / דולג
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Any]]
+    deps: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    default: Any = None
+
+
+@dataclass
+class FanOutResult:
+    """
+    📦 תוצאת fan-out
+
+    Attributes:
+        results: name → ערך (רק fetches שהצליחו)
+        errors: name → סיבה ("timeout", "deadline", "error: ...", "skipped: ...")
+        durations: name → משך בשניות
+        elapsed: זמן כולל בשניות
+    """
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    def ok(self, name: str) -> bool:
+        return name in self.results
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in self.results:
+            return self.results[name]
+        return default if default is not None else self.defaults.get(name)
+
+    @property
+    def partial(self) -> bool:
+        """האם לפחות fetch אחד נכשל"""
+        return bool(self.errors)
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed_ms": round(self.elapsed * 1000, 1),
+            "completed": sorted(self.results),
+            "failed": self.errors,
+            "durations_ms": {name: round(seconds * 1000, 1) for name, seconds in self.durations.items()}
+        }
+
+
+class _DependencyFailed(Exception):
+    pass
+
+
+def _check_graph(tasks: List[FetchTask]) -> None:
+    """ודא שמות ייחודיים, תלויות קיימות ואין מעגלים (מעגל = deadlock)"""
+    by_name = {task.name: task for task in tasks}
+    if len(by_name) != len(tasks):
+        raise ValueError("fan_out: duplicate task names")
+
+    for task in tasks:
+        missing = [dep for dep in task.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"fan_out: task '{task.name}' depends on unknown {missing}")
+
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"fan_out: dependency cycle through '{name}'")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for task in tasks:
+        visit(task.name)
+
+
+async def fan_out(tasks: Iterable[FetchTask], deadline: Optional[float] = None) -> FanOutResult:
+    """
+    🌳 הרץ את כל ה-fetches, כל אחד ברגע שהתלויות שלו מוכנות
+
+    Args:
+        tasks: רשימת FetchTask (הסדר לא משנה)
+        deadline: שניות לכל ה-fan-out; מה שלא הסתיים עד אז מבוטל
+
+    Returns:
+        FanOutResult עם תוצאות חלקיות (לעולם לא זורק בגלל fetch שנכשל)
+    """
+    tasks = list(tasks)
+    _check_graph(tasks)
+
+    result = FanOutResult(defaults={task.name: task.default for task in tasks})
+    futures: Dict[str, asyncio.Future] = {}
+    started = time.perf_counter()
+
+    async def run(task: FetchTask) -> Any:
+        inputs = {}
+        for dep in task.deps:
+            try:
+                inputs[dep] = await asyncio.shield(futures[dep])
+            except Exception:
+                result.errors[task.name] = f"skipped: {dep} failed"
+                raise _DependencyFailed(dep)
+
+        task_started = time.perf_counter()
+        try:
+            value = await asyncio.wait_for(task.func(inputs), timeout=task.timeout)
+        except asyncio.TimeoutError:
+            result.errors[task.name] = "timeout"
+            logger.warning(f"⏱️ Fan-out: {task.name} timed out after {task.timeout}s")
+            raise
+        except Exception as e:
+            result.errors[task.name] = f"error: {e}"
+            logger.warning(f"⚠️ Fan-out: {task.name} failed: {e}")
+            raise
+        finally:
+            result.durations[task.name] = time.perf_counter() - task_started
+
+        result.results[task.name] = value
+        return value
+
+    # כל ה-futures נוצרים לפני שמישהו מהם רץ - כך שכל תלות כבר קיימת ב-dict
+    for task in tasks:
+        futures[task.name] = asyncio.ensure_future(run(task))
+
+    done, pending = await asyncio.wait(futures.values(), timeout=deadline)
+
+    for name, future in futures.items():
+        if future in pending:
+            future.cancel()
+            result.errors.setdefault(name, "deadline")
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        logger.warning(f"⏱️ Fan-out deadline ({deadline}s): {len(pending)} fetches cancelled")
+
+    for future in done:
+        if not future.cancelled():
+            future.exception()  # מסמן כ"נקרא" - השגיאה כבר ב-result.errors
+
+    result.elapsed = time.perf_counter() - started
+    return result
@@ -0,0 +1,351 @@
+"""
+📇 Fixture Index - טבלת משחקים מאונדקסת + חיפוש לפי קבוצות ב-O(1)
+Created by: Rafael & AI Assistant
+Version: 2.0
+
+מטרה:
+find_match_by_teams עבר יום-יום מ-7- עד 7+ (עד 15 קריאות API סדרתיות)
+ואז סרק כל משחק עם substring, ו-_parse_matches שמר רק 20 משחקים לכל תאריך.
+כאן:
+
+✅ FixtureRecord (records.py) - רשומה קומפקטית אחת לכל משחק (מה-API או מה-Cache)
+✅ FixturesStore - טבלה אחת מאונדקסת: id / תאריך / ליגה / קבוצה / זוג קבוצות
+✅ FixtureIndex - טוען תאריכים חסרים במקביל (Semaphore) לתוך הטבלה
+✅ רענון אינקרמנטלי - רק תאריכים שלא נטענו או שה-TTL שלהם עבר
+✅ תאריכים שעברו כמעט לא משתנים - TTL ארוך; היום והלאה - TTL קצר
+
+Usage:
+    index = FixtureIndex(load_day=sports_api._fetch_fixtures)
+    fixture = await index.find("Barcelona", "Real Madrid", days_range=7)
+    league_games = index.store.on_date("2026-01-31", league_id=39)
+"""
+
+import asyncio
+import logging
+import re
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from records import FixtureRecord
+except ImportError:
+    from backend.records import FixtureRecord
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# מילים שלא מבדילות בין קבוצות ("FC Barcelona" == "Barcelona")
+_NOISE_TOKENS = {"fc", "cf", "afc", "sc", "ac", "fk", "sk", "cd", "club", "the"}
+_NON_WORD = re.compile(r"[^\w\s]", re.UNICODE)
+
+
+def normalize_team_name(name: str) -> str:
+    """
+    🔤 נרמול שם קבוצה להשוואה
+
+    lowercase, בלי ניקוד/accents, בלי פיסוק ובלי מילים כמו FC/CF:
+        "FC Barcelona" → "barcelona", "Atlético Madrid" → "atletico madrid"
+    עובד גם על עברית (אותיות עבריות נשמרות כמו שהן).
+    """
+    if not name:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", name.lower())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    tokens = _NON_WORD.sub(" ", stripped).split()
+    return " ".join(token for token in tokens if token not in _NOISE_TOKENS)
+
+
+# ============================================================
+# 🗃️ Indexed table
+# ============================================================
+
+class FixturesStore:
+    """
+    🗃️ טבלת משחקים בזיכרון עם אינדקסים: id, תאריך, ליגה, קבוצה, זוג קבוצות מנורמל
+
+    משחק קיים (אותו id) מוחלף - אין כפילויות כשתאריך נטען שוב.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[Any, FixtureRecord] = {}
+        self._by_date: Dict[str, Set[Any]] = {}
+        self._by_league: Dict[Any, Set[Any]] = {}
+        self._by_team: Dict[Any, Set[Any]] = {}
+        self._by_pair: Dict[Tuple[str, str], Set[Any]] = {}
+
+    @staticmethod
+    def _pair_of(record: FixtureRecord) -> Tuple[str, str]:
+        return normalize_team_name(record.home_team), normalize_team_name(record.away_team)
+
+    def _keys_of(self, record: FixtureRecord) -> List[Tuple[Dict, Any]]:
+        keys = [(self._by_date, record.day), (self._by_pair, self._pair_of(record))]
+        if record.league_id is not None:
+            keys.append((self._by_league, record.league_id))
+        for team_id in (record.home_id, record.away_id):
+            if team_id is not None:
+                keys.append((self._by_team, team_id))
+        return keys
+
+    def _remove(self, fixture_id: Any) -> None:
+        record = self._by_id.pop(fixture_id, None)
+        if record is None:
+            return
+        for index, key in self._keys_of(record):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(fixture_id)
+                if not bucket:
+                    del index[key]
+
+    def upsert(self, records: Iterable[FixtureRecord]) -> int:
+        """הוסף / החלף משחקים (לפי id)"""
+        count = 0
+        for record in records:
+            if record.id is None:
+                continue
+            self._remove(record.id)
+            self._by_id[record.id] = record
+            for index, key in self._keys_of(record):
+                index.setdefault(key, set()).add(record.id)
+            count += 1
+        return count
+
+    def replace_date(self, date: str, records: Iterable[FixtureRecord]) -> int:
+        """כל המשחקים של תאריך (משחקים שנעלמו מה-API - נדחו/בוטלו - יוצאים מהטבלה)"""
+        records = list(records)
+        incoming = {record.id for record in records}
+        for fixture_id in list(self._by_date.get(date, ())):
+            if fixture_id not in incoming:
+                self._remove(fixture_id)
+        return self.upsert(records)
+
+    def _sorted(self, ids: Iterable[Any]) -> List[FixtureRecord]:
+        return sorted((self._by_id[fixture_id] for fixture_id in ids), key=lambda record: record.timestamp or 0)
+
+    def get(self, fixture_id: Any) -> Optional[FixtureRecord]:
+        return self._by_id.get(fixture_id)
+
+    def canonical(self, records: Iterable[FixtureRecord]) -> List[FixtureRecord]:
+        """
+        רשומה שזהה לזו שבטבלה (אותו id, אותם שדות) מוחלפת במופע מהטבלה
+
+        כך ה-Cache (יום / ליגה / חיים / פורמה) והטבלה מחזיקים מופע אחד לכל משחק.
+        """
+        result = []
+        for record in records:
+            stored = self._by_id.get(record.id)
+            result.append(stored if stored is not None and stored == record else record)
+        return result
+
+    def on_date(self, date: str, league_id: Optional[int] = None) -> List[FixtureRecord]:
+        """משחקי התאריך (אופציונלי: רק ליגה אחת), לפי שעת פתיחה"""
+        ids = self._by_date.get(date, set())
+        if league_id is not None:
+            ids = ids & self._by_league.get(league_id, set())
+        return self._sorted(ids)
+
+    def for_league(self, league_id: int) -> List[FixtureRecord]:
+        return self._sorted(self._by_league.get(league_id, ()))
+
+    def for_team(self, team_id: int) -> List[FixtureRecord]:
+        return self._sorted(self._by_team.get(team_id, ()))
+
+    def for_pair(self, home: str, away: str) -> List[FixtureRecord]:
+        """משחקים לפי זוג שמות מנורמלים (normalize_team_name)"""
+        return self._sorted(self._by_pair.get((home, away), ()))
+
+    def pairs(self) -> Iterable[Tuple[str, str]]:
+        return self._by_pair.keys()
+
+    def has_date(self, date: str) -> bool:
+        return date in self._by_date
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "fixtures": len(self._by_id),
+            "dates": len(self._by_date),
+            "leagues": len(self._by_league),
+            "teams": len(self._by_team),
+            "team_pairs": len(self._by_pair)
+        }
+
+
+# ============================================================
+# 📇 Date-range loader + team lookup
+# ============================================================
+
+class FixtureIndex:
+    """
+    📇 טוען טווחי תאריכים לתוך FixturesStore ומחפש משחק לפי שמות קבוצות
+
+    load_day מחזיר את המשחקים של תאריך (YYYY-MM-DD) - FixtureRecord או dicts - או None בכישלון
+    (תאריך שנכשל לא מסומן כטעון - ינסה שוב בחיפוש הבא).
+    """
+
+    def __init__(
+        self,
+        load_day: Callable[[str], Awaitable[Optional[List[Dict]]]],
+        store: Optional[FixturesStore] = None,
+        concurrency: int = 4,
+        refresh_seconds: int = 1800,
+        past_refresh_seconds: int = 86400
+    ):
+        """
+        Args:
+            load_day: פונקציה שטוענת משחקים לתאריך
+            store: הטבלה המאונדקסת (None = חדשה)
+            concurrency: כמה תאריכים לטעון במקביל
+            refresh_seconds: TTL לתאריכים מהיום והלאה
+            past_refresh_seconds: TTL לתאריכים שעברו
+        """
+        self._load_day = load_day
+        self.store = store if store is not None else FixturesStore()
+        self.concurrency = concurrency
+        self.refresh_seconds = refresh_seconds
+        self.past_refresh_seconds = past_refresh_seconds
+
+        self._loaded_at: Dict[str, float] = {}
+
+        # Statistics
+        self._lookups = 0
+        self._pair_hits = 0
+        self._days_loaded = 0
+        self._load_errors = 0
+
+    # ============================================================
+    # 🔄 Loading
+    # ============================================================
+
+    def is_fresh(self, date: str) -> bool:
+        loaded_at = self._loaded_at.get(date)
+        if loaded_at is None:
+            return False
+        today = datetime.now().strftime("%Y-%m-%d")
+        ttl = self.past_refresh_seconds if date < today else self.refresh_seconds
+        return time.monotonic() - loaded_at < ttl
+
+    def observe(self, date: str, fixtures: Iterable[Any]) -> bool:
+        """
+        📥 המשחקים של תאריך הגיעו מה-Cache - הכנס לטבלה אם התאריך לא עדכני
+
+        Returns:
+            True אם התאריך נטען מחדש
+        """
+        if self.is_fresh(date):
+            return False
+        self.ingest(date, (FixtureRecord.coerce(fixture) for fixture in fixtures))
+        return True
+
+    def ingest(self, date: str, records: Iterable[FixtureRecord]) -> int:
+        """
+        📥 נתונים חדשים מה-API לתאריך (טעינה או רענון SWR ברקע) - תמיד מחליף
+
+        Returns:
+            כמה משחקים נכנסו
+        """
+        count = self.store.replace_date(date, records)
+        self._loaded_at[date] = time.monotonic()
+        self._days_loaded += 1
+        return count
+
+    async def ensure_range(self, start: datetime, end: datetime) -> int:
+        """
+        📥 ודא שכל התאריכים בטווח טעונים ועדכניים - החסרים נטענים במקביל
+
+        Returns:
+            מספר התאריכים שנטענו עכשיו
+        """
+        dates = [
+            (start + timedelta(days=offset)).strftime("%Y-%m-%d")
+            for offset in range((end - start).days + 1)
+        ]
+        missing = [date for date in dates if not self.is_fresh(date)]
+        if not missing:
+            return 0
+
+        # Semaphore לכל קריאה - כך שהאינדקס עובד גם מ-event loops שונים
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(date: str) -> bool:
+            async with semaphore:
+                try:
+                    fixtures = await self._load_day(date)
+                except Exception as e:
+                    logger.warning(f"⚠️ Fixture index: failed to load {date}: {e}")
+                    fixtures = None
+            if fixtures is None:
+                self._load_errors += 1
+                return False
+            self.observe(date, fixtures)
+            return True
+
+        results = await asyncio.gather(*(load(date) for date in missing))
+        loaded = sum(results)
+        logger.info(f"📇 Fixture index: loaded {loaded}/{len(missing)} dates ({dates[0]} → {dates[-1]})")
+        return loaded
+
+    # ============================================================
+    # 🔍 Lookup
+    # ============================================================
+
+    async def find(
+        self,
+        home_team: str,
+        away_team: str,
+        days_range: int = 7,
+        around: Optional[datetime] = None
+    ) -> Optional[FixtureRecord]:
+        """
+        🔍 מצא משחק לפי שמות קבוצות בטווח around ± days_range
+
+        קודם dict hit על הזוג המנורמל; אם אין - התאמה חלקית (כמו בעבר:
+        "Barcelona" מוצא את "FC Barcelona B") על שמות הזוגות בטבלה בלבד,
+        בלי קריאות API. אם יש כמה משחקים - המוקדם ביותר בטווח.
+        """
+        around = around or datetime.now()
+        start, end = around - timedelta(days=days_range), around + timedelta(days=days_range)
+        await self.ensure_range(start, end)
+
+        self._lookups += 1
+        first_date, last_date = start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d")
+        home, away = normalize_team_name(home_team), normalize_team_name(away_team)
+
+        candidates = self.store.for_pair(home, away)
+        if candidates:
+            self._pair_hits += 1
+        else:
+            candidates = [
+                record
+                for pair_home, pair_away in list(self.store.pairs())
+                if home in pair_home and away in pair_away
+                for record in self.store.for_pair(pair_home, pair_away)
+            ]
+
+        in_range = [record for record in candidates if first_date <= record.day <= last_date]
+        if not in_range:
+            return None
+        return min(in_range, key=lambda record: record.timestamp or 0)
+
+    def fixtures_on(self, date: str, league_id: Optional[int] = None) -> List[FixtureRecord]:
+        """המשחקים של תאריך מהטבלה (בלי טעינה, בלי עותק - dict נבנה רק ב-to_json)"""
+        return self.store.on_date(date, league_id)
+
+    def get_stats(self) -> dict:
+        return {
+            **self.store.get_stats(),
+            "dates_loaded": len(self._loaded_at),
+            "lookups": self._lookups,
+            "pair_hits": self._pair_hits,
+            "days_loaded": self._days_loaded,
+            "load_errors": self._load_errors
+        }
+
+
+# 🌍 Global instance - טבלת המשחקים המשותפת לכל ה-SportsAPIManager-ים
+fixtures_store = FixturesStore()
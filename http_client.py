@@ -0,0 +1,267 @@
+"""
+🌐 Shared HTTP Client - חיבורים ארוכי-חיים ל-API-Sports ולאתרים חיצוניים
+Created by: Rafael & AI Assistant
+Version: 2.0
+
+מטרה:
+עד עכשיו כל קריאה (וכל retry!) פתחה httpx.AsyncClient חדש - כלומר חיבור TCP
+ו-TLS handshake חדשים ל-v3.football.api-sports.io בכל פעם.
+כאן יש client אחד לכל תהליך (worker) עם connection pool:
+
+✅ Keep-alive - החיבור נשאר פתוח בין קריאות, בלי handshake חוזר
+✅ HTTP/2 (אם h2 מותקן) - כמה בקשות מקבילות על חיבור אחד
+✅ נפתח ב-lifespan (STARTUP) ונסגר ב-SHUTDOWN
+✅ נוצר בעצלות אם משתמשים בו מחוץ ל-FastAPI (סקריפטים, בדיקות ידניות)
+✅ Circuit breaker לכל host - upstream שנפל נכשל מיד (בלי 3 × timeout)
+   ואחרי reset_timeout בקשת probe אחת בודקת אם הוא חזר (half-open)
+✅ RetryPolicy - backoff אקספוננציאלי עם jitter ו-deadline כולל לקריאה
+✅ parse_retry_after - Retry-After בשניות או כתאריך HTTP
+
+Usage:
+    from http_client import http_client
+
+    client = http_client.client
+    response = await client.get(url, params=params, headers=headers)
+
+    breaker = http_client.breaker_for(url)
+    if breaker.allow():
+        ...
+        breaker.record_success()   # או record_failure() / trip(retry_after)
+"""
+
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+try:
+    import h2  # noqa: F401 - נדרש ל-HTTP/2 ב-httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0
+)
+USER_AGENT = "SmartSportsPro/9.0"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    ⏳ Retry-After → שניות להמתנה
+
+    תומך בשני הפורמטים: "120" או "Wed, 21 Oct 2026 07:28:00 GMT".
+    None אם הכותרת חסרה או לא תקינה.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    🔁 מדיניות retry: ניסיונות, backoff אקספוננציאלי עם full jitter ו-deadline כולל
+
+    ה-deadline חוסם את כל הקריאה (ניסיונות + המתנות) - worker לא נתקע 36 שניות
+    כש-upstream איטי.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+        deadline: float = 15.0,
+        attempt_timeout: float = 10.0
+    ):
+        """
+        Args:
+            max_attempts: מספר ניסיונות מקסימלי (כולל הראשון)
+            base_delay: ההמתנה הבסיסית לפני ה-retry הראשון
+            max_delay: תקרה להמתנה בודדת
+            deadline: זמן מקסימלי לכל הקריאה, בשניות
+            attempt_timeout: timeout לניסיון בודד (מקוצר לפי הזמן שנשאר)
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.attempt_timeout = attempt_timeout
+
+    def backoff(self, attempt: int) -> float:
+        """המתנה לפני ניסיון attempt+1 (full jitter: אקראי בין 0 לתקרה)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    🔌 Circuit breaker ל-host אחד
+
+    closed    - בקשות עוברות; failure_threshold כישלונות רצופים → open
+    open      - בקשות נכשלות מיד עד שעובר reset_timeout (או Retry-After)
+    half_open - בקשת probe אחת עוברת; הצלחה → closed, כישלון → open שוב
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._open_until = 0.0
+        self._probe_started = 0.0
+
+        # Statistics
+        self._opened = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() >= self._open_until:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """האם לשלוח בקשה עכשיו (ב-half_open - רק probe אחד בכל פעם)"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        # probe שלא דיווח (בוטל באמצע) לא נועל את ה-breaker לתמיד
+        now = time.monotonic()
+        if state == self.HALF_OPEN and now - self._probe_started >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probe_started = now
+            return True
+        self._rejected += 1
+        return False
+
+    def retry_in(self) -> float:
+        """כמה שניות עד שה-breaker יאפשר probe (0 אם סגור)"""
+        return max(0.0, self._open_until - time.monotonic()) if self._state != self.CLOSED else 0.0
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info(f"🔌 Circuit closed: {self.host}")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_started = 0.0
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.trip(self.reset_timeout)
+
+    def trip(self, seconds: Optional[float] = None) -> None:
+        """פתח את ה-breaker (לדוגמה לפי Retry-After של 429/503)"""
+        if self._state != self.OPEN:
+            self._opened += 1
+            logger.warning(f"🔌 Circuit OPEN: {self.host} ({self._failures} failures)")
+        self._state = self.OPEN
+        self._open_until = time.monotonic() + (self.reset_timeout if seconds is None else seconds)
+        self._probe_started = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in(), 1),
+            "times_opened": self._opened,
+            "rejected": self._rejected
+        }
+
+
+class SharedHTTPClient:
+    """
+    🌐 httpx.AsyncClient יחיד לכל התהליך
+
+    timeout / headers / follow_redirects ניתנים לדריסה בכל בקשה
+    (לדוגמה client.get(url, timeout=8.0, follow_redirects=True)).
+    """
+
+    def __init__(
+        self,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        http2: bool = True
+    ):
+        self._timeout = timeout
+        self._limits = limits
+        self._http2 = http2 and HTTP2_AVAILABLE
+        self._client: Optional[httpx.AsyncClient] = None
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    async def start(self) -> httpx.AsyncClient:
+        """פתח את ה-client (ב-lifespan). idempotent"""
+        return self.client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """ה-client המשותף (נפתח בעצלות אם start לא נקרא)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=self._limits,
+                http2=self._http2,
+                headers={"User-Agent": USER_AGENT}
+            )
+            logger.info(
+                f"🌐 Shared HTTP client opened "
+                f"(http2={self._http2}, max_connections={self._limits.max_connections})"
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """סגור את כל החיבורים (ב-SHUTDOWN)"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("🌐 Shared HTTP client closed")
+        self._client = None
+
+    def breaker_for(self, url: str) -> CircuitBreaker:
+        """ה-circuit breaker של ה-host של url (נוצר בפעם הראשונה)"""
+        host = urlsplit(url).netloc or url
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    def get_stats(self) -> dict:
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self._http2,
+            "max_connections": self._limits.max_connections,
+            "max_keepalive_connections": self._limits.max_keepalive_connections,
+            "circuit_breakers": {host: breaker.get_stats() for host, breaker in self._breakers.items()}
+        }
+
+
+# 🌍 Global instance (singleton) - client אחד לכל worker
+http_client = SharedHTTPClient()
@@ -0,0 +1,168 @@
+"""
+📡 Live Broadcaster - push של deltas חיים לאלפי לקוחות
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+הלקוחות עשו polling ל-/api/live-matches, /api/live/scores ו-/api/today-matches -
+כל poll הריץ את כל ה-handler. כאן LiveScorePoller מפרסם deltas פעם אחת,
+וה-broadcaster מפיץ אותם לכל המנויים (SSE / WebSocket):
+
+✅ כל delta מקודד ל-JSON פעם אחת - לא פעם לכל לקוח
+✅ תור חסום לכל לקוח; לקוח איטי → זורקים את הישן ביותר (drop-oldest)
+✅ לקוח שאיבד הודעות מסומן lagged ומקבל snapshot מלא מחדש
+✅ יותר לקוחות ≠ יותר בקשות: חיבור אחד פתוח לכל לקוח, בלי polling
+
+Usage:
+    broadcaster = LiveBroadcaster(queue_size=64)
+    live_poller.add_listener(broadcaster.publish)
+
+    subscriber = broadcaster.subscribe()
+    try:
+        while True:
+            message = await subscriber.next(timeout=15)
+    finally:
+        broadcaster.unsubscribe(subscriber)
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    from records import to_json
+except ImportError:
+    from backend.records import to_json
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def encode_json(payload: Any) -> str:
+    """JSON מהיר (orjson אם מותקן) - רשומות משחק מקודדות כ-to_dict"""
+    return to_json(payload).decode("utf-8")
+
+
+class LiveMessage:
+    """
+    📨 הודעה מקודדת (משותפת לכל המנויים)
+
+    Attributes:
+        seq: המספר הרץ של ה-delta
+        event: סוג ("goal", "status", ..., "snapshot")
+        data: JSON מוכן לשליחה
+    """
+    __slots__ = ("seq", "event", "data")
+
+    def __init__(self, seq: int, event: str, data: str):
+        self.seq = seq
+        self.event = event
+        self.data = data
+
+    def to_sse(self) -> str:
+        return f"id: {self.seq}\nevent: {self.event}\ndata: {self.data}\n\n"
+
+
+class LiveSubscriber:
+    """📬 מנוי יחיד - תור חסום עם drop-oldest"""
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.lagged = False
+
+    def offer(self, message: LiveMessage) -> None:
+        """הכנס הודעה; אם התור מלא - זרוק את הישנה ביותר (לא חוסם אף פעם)"""
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            self.dropped += 1
+            self.lagged = True
+        self.queue.put_nowait(message)
+
+    def resync(self) -> None:
+        """רוקן את התור ונקה את lagged (הלקוח מקבל snapshot מלא במקום ההודעות שאבדו)"""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.lagged = False
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[LiveMessage]:
+        """ההודעה הבאה, או None אחרי timeout (כדי לשלוח heartbeat)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LiveBroadcaster:
+    """
+    📡 fan-out של deltas מ-LiveScorePoller לכל המנויים
+    """
+
+    def __init__(self, queue_size: int = 64, max_subscribers: int = 5000):
+        """
+        Args:
+            queue_size: כמה הודעות לשמור לכל לקוח לפני drop-oldest
+            max_subscribers: מקסימום חיבורים פתוחים
+        """
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[LiveSubscriber] = set()
+
+        # Statistics
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._rejected = 0
+        self._peak_subscribers = 0
+
+    def subscribe(self) -> Optional[LiveSubscriber]:
+        """מנוי חדש (None אם הגענו ל-max_subscribers)"""
+        if len(self._subscribers) >= self.max_subscribers:
+            self._rejected += 1
+            return None
+        subscriber = LiveSubscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        self._peak_subscribers = max(self._peak_subscribers, len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Optional[LiveSubscriber]) -> None:
+        if subscriber is not None:
+            self._subscribers.discard(subscriber)
+            self._dropped += subscriber.dropped
+
+    def publish(self, deltas: List[Dict]) -> None:
+        """
+        📡 הפץ deltas לכל המנויים (נקרא מ-LiveScorePoller אחרי כל poll)
+
+        כל delta מקודד פעם אחת; ההכנסה לתורים לא חוסמת.
+        """
+        for delta in deltas:
+            message = LiveMessage(delta["seq"], delta["type"], encode_json(delta))
+            self._published += 1
+            for subscriber in self._subscribers:
+                subscriber.offer(message)
+            self._delivered += len(self._subscribers)
+
+    @staticmethod
+    def snapshot_message(seq: int, matches: List[Dict]) -> LiveMessage:
+        """הודעת snapshot מלא (בחיבור חדש או אחרי lag)"""
+        return LiveMessage(seq, "snapshot", encode_json({"seq": seq, "matches": matches}))
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "peak_subscribers": self._peak_subscribers,
+            "max_subscribers": self.max_subscribers,
+            "queue_size": self.queue_size,
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped + sum(subscriber.dropped for subscriber in self._subscribers),
+            "rejected": self._rejected
+        }
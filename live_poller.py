@@ -0,0 +1,280 @@
+"""
+🔴 Live Score Poller - מקור אחד למשחקים החיים
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+כל קריאה ל-/api/live-matches (ושני ה-routes שלו) משכה fixtures?live=all מחדש
+ופרסרה את כל ה-payload - וה-route השני עשה זאת דרך aiohttp בלי Cache בכלל.
+כאן יש poller אחד ברקע:
+
+✅ קריאה אחת ל-API בכל interval - לא משנה כמה לקוחות קוראים
+✅ טבלת מצב: fixture_id → המצב האחרון של המשחק
+✅ deltas: שער, שינוי סטטוס, דקה, משחק חדש, משחק שהסתיים (עם מספר רץ - seq)
+✅ משחק שהסתיים → sports_api.invalidate_finished_fixture (טבלה, פורמה, H2H)
+✅ כל הקוראים מקבלים snapshot מהזיכרון
+
+Usage:
+    poller = LiveScorePoller(sports_api, interval_seconds=30)
+    poller.start()                      # ב-lifespan (STARTUP)
+    matches = poller.snapshot()         # בכל בקשה - בלי API
+    seq, deltas = poller.deltas_since(last_seq)
+    poller.add_listener(broadcaster.publish)   # push (SSE / WebSocket)
+    await poller.stop()                 # ב-lifespan (SHUTDOWN)
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    from sports_api import SportsAPIManager
+except ImportError:
+    from backend.sports_api import SportsAPIManager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+
+
+def _signature(match: Dict) -> Tuple:
+    """מה שמשנה ללקוחות: סטטוס, דקה ותוצאה"""
+    return (match.get("status"), match.get("minute"), match.get("home_score"), match.get("away_score"))
+
+
+class LiveScorePoller:
+    """
+    🔴 poller יחיד למשחקים החיים + חישוב deltas
+
+    delta: {"seq", "type", "fixture_id", "changes", "match", "at"}
+    type: "added" | "goal" | "status" | "minute" | "finished"
+    """
+
+    def __init__(
+        self,
+        sports_api: SportsAPIManager,
+        interval_seconds: float = 30.0,
+        max_deltas: int = 1000,
+        max_finished: int = 2000
+    ):
+        """
+        Args:
+            sports_api: ה-client שדרכו נמשכים המשחקים החיים
+            interval_seconds: כל כמה שניות לקרוא ל-API
+            max_deltas: כמה deltas אחרונים לשמור (ללקוחות שמשלימים פערים)
+            max_finished: כמה מזהי משחקים שהסתיימו לזכור (ה-API ממשיך להחזיר FT/AET/PEN זמן מה)
+        """
+        self.sports_api = sports_api
+        self.interval_seconds = interval_seconds
+
+        self._state: Dict[Any, Dict] = {}
+        self._signatures: Dict[Any, Tuple] = {}
+        self._deltas: Deque[Dict] = deque(maxlen=max_deltas)
+        self._finished: "OrderedDict[Any, None]" = OrderedDict()
+        self.max_finished = max_finished
+        self._seq = 0
+        self._ready = False
+        self._task: Optional[asyncio.Task] = None
+        self._listeners: List[Callable[[List[Dict]], None]] = []
+
+        # Statistics
+        self._polls = 0
+        self._poll_errors = 0
+        self._invalidations = 0
+        self._last_poll: Optional[datetime] = None
+
+        logger.info(f"🔴 LiveScorePoller initialized (interval={interval_seconds}s)")
+
+    # ============================================================
+    # 🔄 Lifecycle
+    # ============================================================
+
+    def start(self) -> None:
+        """הפעל את הלולאה ברקע (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+            logger.info("🔴 Live poller started")
+
+    async def stop(self) -> None:
+        """עצור את הלולאה (ב-SHUTDOWN)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 Live poller stopped")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except Exception as e:
+                self._poll_errors += 1
+                logger.error(f"❌ Live poll failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def add_listener(self, listener: Callable[[List[Dict]], None]) -> None:
+        """listener(deltas) נקרא אחרי כל poll שהיו בו שינויים (לדוגמה LiveBroadcaster.publish)"""
+        self._listeners.append(listener)
+
+    @property
+    def ready(self) -> bool:
+        """האם היה לפחות poll מוצלח אחד (אחרת אין snapshot אמיתי)"""
+        return self._ready
+
+    # ============================================================
+    # 🎯 Polling + deltas
+    # ============================================================
+
+    async def poll_once(self) -> List[Dict]:
+        """
+        🔴 קריאה אחת ל-API, עדכון טבלת המצב וחישוב deltas
+
+        Returns:
+            ה-deltas של הסבב הזה ([] אם לא השתנה כלום או שהקריאה נכשלה)
+        """
+        self._polls += 1
+        self._last_poll = datetime.now()
+
+        matches = await self.sports_api.refresh_live_matches()
+        if matches is None:
+            self._poll_errors += 1
+            return []
+
+        deltas = []
+        # משחק שכבר סומן "finished" ועדיין מגיע כ-FT/AET/PEN - לא מוסיפים / מסיימים / מבטלים שוב
+        current = {
+            match["id"]: match for match in matches
+            if match.get("id") is not None
+            and not (match["id"] in self._finished and match.get("status") in FINISHED_STATUSES)
+        }
+
+        for fixture_id, match in current.items():
+            signature = _signature(match)
+            previous = self._state.get(fixture_id)
+            if previous is None:
+                deltas.append(self._delta("added", fixture_id, match, {}))
+            elif signature != self._signatures[fixture_id]:
+                changes = self._changes(previous, match)
+                deltas.append(self._delta(self._delta_type(changes), fixture_id, match, changes))
+            self._signatures[fixture_id] = signature
+
+        finished = [fixture_id for fixture_id in self._state if fixture_id not in current]
+        finished += [
+            fixture_id for fixture_id, match in current.items()
+            if match.get("status") in FINISHED_STATUSES
+        ]
+        for fixture_id in finished:
+            match = current.pop(fixture_id, None) or self._state[fixture_id]
+            self._signatures.pop(fixture_id, None)
+            self._remember_finished(fixture_id)
+            deltas.append(self._delta("finished", fixture_id, match, {}))
+            await self._invalidate(match)
+
+        self._state = current
+        self._ready = True
+
+        if deltas:
+            logger.info(f"🔴 Live poll: {len(current)} live, {len(deltas)} changes (seq={self._seq})")
+            for listener in self._listeners:
+                try:
+                    listener(deltas)
+                except Exception as e:
+                    logger.warning(f"⚠️ Live listener failed: {e}")
+        return deltas
+
+    def _remember_finished(self, fixture_id: Any) -> None:
+        """מזהה שהסתיים - נשמר עד max_finished (הישן ביותר נזרק)"""
+        self._finished[fixture_id] = None
+        self._finished.move_to_end(fixture_id)
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    @staticmethod
+    def _changes(previous: Dict, match: Dict) -> Dict[str, Tuple[Any, Any]]:
+        return {
+            field: (previous.get(field), match.get(field))
+            for field in ("status", "minute", "home_score", "away_score")
+            if previous.get(field) != match.get(field)
+        }
+
+    @staticmethod
+    def _delta_type(changes: Dict) -> str:
+        if "home_score" in changes or "away_score" in changes:
+            return "goal"
+        if "status" in changes:
+            return "status"
+        return "minute"
+
+    def _delta(self, delta_type: str, fixture_id: Any, match: Dict, changes: Dict) -> Dict:
+        self._seq += 1
+        delta = {
+            "seq": self._seq,
+            "type": delta_type,
+            "fixture_id": fixture_id,
+            "changes": changes,
+            "match": match,
+            "at": datetime.now().isoformat()
+        }
+        self._deltas.append(delta)
+        return delta
+
+    async def _invalidate(self, match: Dict) -> None:
+        """משחק הסתיים - טבלה, פורמה ו-H2H של הקבוצות כבר לא עדכניים"""
+        try:
+            removed = await self.sports_api.invalidate_finished_fixture(
+                match.get("league_id"), match.get("home_id"), match.get("away_id"), match.get("id")
+            )
+            self._invalidations += 1
+            logger.info(f"🏁 Fixture {match.get('id')} finished - invalidated {removed} cache entries")
+        except Exception as e:
+            logger.warning(f"⚠️ Invalidation failed for fixture {match.get('id')}: {e}")
+
+    # ============================================================
+    # 📖 Readers
+    # ============================================================
+
+    def snapshot(self, league_id: Optional[int] = None) -> List[Dict]:
+        """המשחקים החיים כרגע (מהזיכרון, בלי API)"""
+        matches = self._state.values()
+        if league_id:
+            matches = [match for match in matches if match.get("league_id") == league_id]
+        return sorted(matches, key=lambda match: match.get("timestamp") or 0)
+
+    @property
+    def seq(self) -> int:
+        """המספר הרץ של ה-delta האחרון"""
+        return self._seq
+
+    def deltas_since(self, seq: int) -> Tuple[int, Optional[List[Dict]]]:
+        """
+        ה-deltas שאחרי seq
+
+        Returns:
+            (seq נוכחי, deltas) - deltas=None אם seq ישן מדי (נדרש snapshot מלא)
+        """
+        if seq >= self._seq:
+            return self._seq, []
+        if not self._deltas or self._deltas[0]["seq"] > seq + 1:
+            return self._seq, None
+        return self._seq, [delta for delta in self._deltas if delta["seq"] > seq]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "ready": self._ready,
+            "interval_seconds": self.interval_seconds,
+            "live_fixtures": len(self._state),
+            "finished_tracked": len(self._finished),
+            "seq": self._seq,
+            "polls": self._polls,
+            "poll_errors": self._poll_errors,
+            "finished_invalidations": self._invalidations,
+            "last_poll": self._last_poll.isoformat() if self._last_poll else None
+        }
@@ -0,0 +1,434 @@
+"""
+📐 Match Aggregates - H2H, פורמה וממוצעי שערים בחישוב וקטורי
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+get_h2h_statistics עבר על ה-response בלולאת Python, ו-ai_analyze_match בנה
+אגרגציות דומות מרשימות הפורמה (לפי שם קבוצה, ונשבר על תוצאה None).
+כאן כל היסטוריית משחקים נטענת פעם אחת למערכי NumPy:
+
+✅ FixtureHistory - עמודות: home_id, away_id, home_goals, away_goals, timestamp, fixture_id
+✅ batch_h2h - H2H להרבה זוגות קבוצות במעבר אחד (group-by וקטורי)
+✅ batch_form - פורמה (N אחרונים), בית/חוץ, נקודות וממוצעי שערים להרבה קבוצות
+✅ orient_h2h - H2H נשמר ב-Cache תחת מפתח ממוין; מסובבים לפי team1 בקריאה
+✅ בלי NumPy - אותן תוצאות בלולאת Python (fallback)
+
+Usage:
+    history = FixtureHistory.from_api(data["response"])
+    h2h = h2h_summary(history, 33, 34)                 # oriented: team1 = 33
+    forms = batch_form(FixtureHistory.from_matches(matches), [33, 34, 40])
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+FINISHED_STATUSES = {"FT", "AET", "PEN"}
+
+# (home_id, away_id, home_goals, away_goals, timestamp, fixture_id)
+Row = Tuple[int, int, int, int, int, int]
+
+
+# ============================================================
+# 📥 History
+# ============================================================
+
+class FixtureHistory:
+    """
+    📥 היסטוריית משחקים שהסתיימו - עמודות (NumPy אם מותקן) + פרטי תצוגה
+
+    משחקים בלי תוצאה (עתידיים / נדחו) או בלי מזהי קבוצות לא נכנסים.
+    """
+
+    def __init__(self, rows: List[Row], details: List[Dict[str, Any]]):
+        self.rows = rows
+        self.details = details
+        if NUMPY_AVAILABLE:
+            columns = np.array(rows, dtype=np.int64).reshape(-1, 6)
+            (self.home_ids, self.away_ids, self.home_goals, self.away_goals,
+             self.timestamps, self.fixture_ids) = columns.T
+
+    @classmethod
+    def from_api(cls, items: Iterable[Dict]) -> "FixtureHistory":
+        """מ-response גולמי של /fixtures או /fixtures/headtohead"""
+        rows, details = [], []
+        for item in items:
+            fixture = item.get("fixture", {})
+            teams = item.get("teams", {})
+            goals = item.get("goals", {})
+            home, away = teams.get("home", {}), teams.get("away", {})
+            row = cls._row(
+                home.get("id"), away.get("id"), goals.get("home"), goals.get("away"),
+                fixture.get("timestamp"), fixture.get("status", {}).get("short"), fixture.get("id")
+            )
+            if row is not None:
+                rows.append(row)
+                details.append(cls._detail(fixture.get("date"), home.get("name"), away.get("name"), row))
+        return cls(rows, details)
+
+    @classmethod
+    def from_matches(cls, matches: Iterable[Dict]) -> "FixtureHistory":
+        """מהמבנה האחיד של _parse_matches / FixtureRecord.to_dict"""
+        rows, details = [], []
+        for match in matches:
+            row = cls._row(
+                match.get("home_id"), match.get("away_id"), match.get("home_score"), match.get("away_score"),
+                match.get("timestamp"), match.get("status"), match.get("id")
+            )
+            if row is not None:
+                rows.append(row)
+                details.append(cls._detail(match.get("date"), match.get("home_team"), match.get("away_team"), row))
+        return cls(rows, details)
+
+    @staticmethod
+    def _row(home_id, away_id, home_goals, away_goals, timestamp, status, fixture_id) -> Optional[Row]:
+        if None in (home_id, away_id, home_goals, away_goals):
+            return None
+        if status is not None and status not in FINISHED_STATUSES:
+            return None
+        return (int(home_id), int(away_id), int(home_goals), int(away_goals),
+                int(timestamp or 0), int(fixture_id or 0))
+
+    @staticmethod
+    def _detail(date, home_team, away_team, row: Row) -> Dict[str, Any]:
+        return {"date": date, "home_team": home_team, "away_team": away_team, "score": f"{row[2]}-{row[3]}"}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# ============================================================
+# 🔄 Head-to-Head
+# ============================================================
+
+def _empty_h2h(team1_id: int, team2_id: int) -> Dict[str, Any]:
+    return {
+        "team1_id": team1_id,
+        "team2_id": team2_id,
+        "total_matches": 0,
+        "matches_analyzed": 0,
+        "team1_wins": 0,
+        "team2_wins": 0,
+        "draws": 0,
+        "total_goals_team1": 0,
+        "total_goals_team2": 0,
+        "avg_goals_team1": 0.0,
+        "avg_goals_team2": 0.0,
+        "last_5_matches": []
+    }
+
+
+def _finish_h2h(summary: Dict[str, Any]) -> Dict[str, Any]:
+    analyzed = summary["matches_analyzed"]
+    summary["avg_goals_team1"] = round(summary["total_goals_team1"] / analyzed, 2) if analyzed else 0.0
+    summary["avg_goals_team2"] = round(summary["total_goals_team2"] / analyzed, 2) if analyzed else 0.0
+    return summary
+
+
+def _recency_key(row: Row) -> Tuple[int, int]:
+    """סדר "האחרון ראשון": זמן יורד, ובאותו זמן - מזהה משחק יורד (כמו ב-_group_ranks)"""
+    return -row[4], -row[5]
+
+
+def _group_ranks(groups, timestamps, fixture_ids):
+    """
+    מיון לפי (קבוצה, זמן יורד, מזהה משחק יורד) ו-rank בתוך כל קבוצה (0 = המשחק האחרון)
+
+    המזהה שובר שוויון בין משחקים באותו timestamp - אותו סדר כמו ב-fallback
+    (_recency_key), כך ש-form ו-last_5_matches זהים בשני המסלולים.
+
+    Returns:
+        (order, sorted_groups, ranks)
+    """
+    order = np.lexsort((-fixture_ids, -timestamps, groups))
+    sorted_groups = groups[order]
+    ranks = np.arange(len(order)) - np.searchsorted(sorted_groups, sorted_groups, side="left")
+    return order, sorted_groups, ranks
+
+
+def batch_h2h(
+    history: FixtureHistory,
+    pairs: Sequence[Tuple[int, int]],
+    last: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    🔄 H2H לכל זוג ב-pairs, במעבר אחד על ההיסטוריה
+
+    ניצחונות, תיקו ושערים - על last המפגשים האחרונים; total_matches - כל המפגשים.
+    כל תוצאה מסובבת לפי הזוג שהתבקש (team1 = pairs[i][0]).
+    """
+    if not NUMPY_AVAILABLE:
+        return _batch_h2h_python(history, pairs, last)
+    if not pairs:
+        return []
+
+    pair_lo = np.array([min(int(a), int(b)) for a, b in pairs], dtype=np.int64)
+    pair_hi = np.array([max(int(a), int(b)) for a, b in pairs], dtype=np.int64)
+    results = [_empty_h2h(int(a), int(b)) for a, b in pairs]
+    if not len(history):
+        return results
+
+    lo = np.minimum(history.home_ids, history.away_ids)
+    hi = np.maximum(history.home_ids, history.away_ids)
+    width = int(max(hi.max(), pair_hi.max())) + 1
+    wanted, pair_group = np.unique(pair_lo * width + pair_hi, return_inverse=True)
+
+    # לאיזה זוג מבוקש שייך כל משחק (או לאף אחד)
+    keys = lo * width + hi
+    position = np.searchsorted(wanted, keys)
+    position_clipped = np.minimum(position, len(wanted) - 1)
+    member = wanted[position_clipped] == keys
+    fixture_index = np.nonzero(member)[0]
+    groups = position_clipped[member]
+    if not len(groups):
+        return results
+
+    order, sorted_groups, ranks = _group_ranks(
+        groups, history.timestamps[fixture_index], history.fixture_ids[fixture_index]
+    )
+    fixtures = fixture_index[order]
+    kept = ranks < last
+    kept_groups = sorted_groups[kept]
+    kept_fixtures = fixtures[kept]
+
+    # מנקודת המבט של הקבוצה עם המזהה הקטן
+    home_is_lo = history.home_ids[kept_fixtures] == lo[kept_fixtures]
+    goals_lo = np.where(home_is_lo, history.home_goals[kept_fixtures], history.away_goals[kept_fixtures])
+    goals_hi = np.where(home_is_lo, history.away_goals[kept_fixtures], history.home_goals[kept_fixtures])
+
+    size = len(wanted)
+    total = np.bincount(groups, minlength=size)
+    analyzed = np.bincount(kept_groups, minlength=size)
+    lo_wins = np.bincount(kept_groups, weights=goals_lo > goals_hi, minlength=size)
+    hi_wins = np.bincount(kept_groups, weights=goals_hi > goals_lo, minlength=size)
+    draws = np.bincount(kept_groups, weights=goals_lo == goals_hi, minlength=size)
+    lo_goals = np.bincount(kept_groups, weights=goals_lo, minlength=size)
+    hi_goals = np.bincount(kept_groups, weights=goals_hi, minlength=size)
+
+    # 5 המפגשים האחרונים (לתצוגה) - פרוסה לכל זוג מתוך המערך הממוין
+    starts = np.searchsorted(sorted_groups, np.arange(size), side="left")
+
+    for i, group in enumerate(pair_group):
+        summary = results[i]
+        if not total[group]:
+            continue
+        team1_is_lo = summary["team1_id"] <= summary["team2_id"]
+        wins = (lo_wins[group], hi_wins[group]) if team1_is_lo else (hi_wins[group], lo_wins[group])
+        goals = (lo_goals[group], hi_goals[group]) if team1_is_lo else (hi_goals[group], lo_goals[group])
+        start = starts[group]
+        summary.update({
+            "total_matches": int(total[group]),
+            "matches_analyzed": int(analyzed[group]),
+            "team1_wins": int(wins[0]),
+            "team2_wins": int(wins[1]),
+            "draws": int(draws[group]),
+            "total_goals_team1": int(goals[0]),
+            "total_goals_team2": int(goals[1]),
+            "last_5_matches": [
+                history.details[index]
+                for index in fixtures[start:start + min(5, last, int(total[group]))]
+            ]
+        })
+        _finish_h2h(summary)
+    return results
+
+
+def _batch_h2h_python(
+    history: FixtureHistory,
+    pairs: Sequence[Tuple[int, int]],
+    last: int
+) -> List[Dict[str, Any]]:
+    """batch_h2h בלי NumPy - אותן תוצאות"""
+    by_pair: Dict[Tuple[int, int], List[int]] = {}
+    for index, (home_id, away_id, *_) in enumerate(history.rows):
+        by_pair.setdefault((min(home_id, away_id), max(home_id, away_id)), []).append(index)
+
+    results = []
+    for team1_id, team2_id in pairs:
+        team1_id, team2_id = int(team1_id), int(team2_id)
+        summary = _empty_h2h(team1_id, team2_id)
+        indexes = by_pair.get((min(team1_id, team2_id), max(team1_id, team2_id)), [])
+        indexes = sorted(indexes, key=lambda index: _recency_key(history.rows[index]))
+        summary["total_matches"] = len(indexes)
+
+        for index in indexes[:last]:
+            home_id, _, home_goals, away_goals, *_ = history.rows[index]
+            goals1, goals2 = (home_goals, away_goals) if home_id == team1_id else (away_goals, home_goals)
+            summary["matches_analyzed"] += 1
+            summary["team1_wins"] += goals1 > goals2
+            summary["team2_wins"] += goals2 > goals1
+            summary["draws"] += goals1 == goals2
+            summary["total_goals_team1"] += goals1
+            summary["total_goals_team2"] += goals2
+
+        summary["last_5_matches"] = [history.details[index] for index in indexes[:min(5, last)]]
+        results.append(_finish_h2h(summary))
+    return results
+
+
+def h2h_summary(history: FixtureHistory, team1_id: int, team2_id: int, last: int = 10) -> Dict[str, Any]:
+    """H2H לזוג אחד (team1 = team1_id)"""
+    return batch_h2h(history, [(team1_id, team2_id)], last)[0]
+
+
+_H2H_SWAPS = (
+    ("team1_id", "team2_id"),
+    ("team1_wins", "team2_wins"),
+    ("total_goals_team1", "total_goals_team2"),
+    ("avg_goals_team1", "avg_goals_team2")
+)
+
+
+def orient_h2h(summary: Dict[str, Any], team1_id: Any) -> Dict[str, Any]:
+    """
+    🔁 סובב H2H כך ש-team1 יהיה team1_id
+
+    הערך ב-Cache משותף לשני הכיוונים (h2h_key ממוין), כך שמי שביקש
+    (B, A) אחרי (A, B) מקבל את המספרים בכיוון שלו.
+    ערך ישן בלי team1_id מוחזר כמו שהוא.
+    """
+    current = summary.get("team1_id")
+    if current is None or str(current) == str(team1_id):
+        return summary
+    oriented = dict(summary)
+    for first, second in _H2H_SWAPS:
+        oriented[first], oriented[second] = summary.get(second), summary.get(first)
+    return oriented
+
+
+# ============================================================
+# 📈 Form
+# ============================================================
+
+def _empty_split() -> Dict[str, int]:
+    return {"played": 0, "wins": 0, "draws": 0, "losses": 0, "goals_for": 0, "goals_against": 0}
+
+
+def _form_summary(team_id: int, overall: Dict[str, int], home: Dict[str, int],
+                  away: Dict[str, int], form: str) -> Dict[str, Any]:
+    played = overall["played"]
+    points = overall["wins"] * 3 + overall["draws"]
+    return {
+        "team_id": team_id,
+        **overall,
+        "points": points,
+        "points_per_game": round(points / played, 2) if played else 0.0,
+        "avg_goals_for": round(overall["goals_for"] / played, 2) if played else 0.0,
+        "avg_goals_against": round(overall["goals_against"] / played, 2) if played else 0.0,
+        "form": form,
+        "home": home,
+        "away": away
+    }
+
+
+def batch_form(history: FixtureHistory, team_ids: Sequence[int], last: int = 5) -> Dict[int, Dict[str, Any]]:
+    """
+    📈 פורמה לכל קבוצה ב-team_ids, במעבר אחד על ההיסטוריה
+
+    last המשחקים האחרונים של כל קבוצה: מאזן, נקודות, ממוצעי שערים,
+    פיצול בית/חוץ ו-form ("WDLWW", האחרון ראשון).
+    """
+    if not NUMPY_AVAILABLE:
+        return _batch_form_python(history, team_ids, last)
+
+    teams = [int(team_id) for team_id in team_ids]
+    empty = {team_id: _form_summary(team_id, _empty_split(), _empty_split(), _empty_split(), "") for team_id in teams}
+    if not len(history) or not teams:
+        return empty
+
+    # כל משחק פעמיים - מנקודת המבט של הבית ושל החוץ
+    team = np.concatenate((history.home_ids, history.away_ids))
+    goals_for = np.concatenate((history.home_goals, history.away_goals))
+    goals_against = np.concatenate((history.away_goals, history.home_goals))
+    is_home = np.concatenate((np.ones(len(history), dtype=bool), np.zeros(len(history), dtype=bool)))
+    timestamps = np.concatenate((history.timestamps, history.timestamps))
+    fixture_ids = np.concatenate((history.fixture_ids, history.fixture_ids))
+
+    wanted = np.unique(np.array(teams, dtype=np.int64))
+    position = np.minimum(np.searchsorted(wanted, team), len(wanted) - 1)
+    member = wanted[position] == team
+    if not member.any():
+        return empty
+
+    order, sorted_groups, ranks = _group_ranks(position[member], timestamps[member], fixture_ids[member])
+    kept = ranks < last
+    groups = sorted_groups[kept]
+    scored = goals_for[member][order][kept]
+    conceded = goals_against[member][order][kept]
+    home_rows = is_home[member][order][kept]
+
+    wins = scored > conceded
+    draws = scored == conceded
+    losses = scored < conceded
+    size = len(wanted)
+
+    def split(mask) -> Dict[str, Any]:
+        g = groups[mask]
+        return {
+            "played": np.bincount(g, minlength=size),
+            "wins": np.bincount(g, weights=wins[mask], minlength=size),
+            "draws": np.bincount(g, weights=draws[mask], minlength=size),
+            "losses": np.bincount(g, weights=losses[mask], minlength=size),
+            "goals_for": np.bincount(g, weights=scored[mask], minlength=size),
+            "goals_against": np.bincount(g, weights=conceded[mask], minlength=size)
+        }
+
+    everything = np.ones(len(groups), dtype=bool)
+    columns = {"overall": split(everything), "home": split(home_rows), "away": split(~home_rows)}
+    letters = np.where(wins, "W", np.where(draws, "D", "L"))
+    starts = np.searchsorted(groups, np.arange(size), side="left")
+    ends = np.searchsorted(groups, np.arange(size), side="right")
+
+    results = {}
+    for group, team_id in enumerate(wanted.tolist()):
+        parts = {
+            name: {field: int(values[group]) for field, values in column.items()}
+            for name, column in columns.items()
+        }
+        form = "".join(letters[starts[group]:ends[group]].tolist())
+        results[team_id] = _form_summary(team_id, parts["overall"], parts["home"], parts["away"], form)
+    return {team_id: results.get(team_id, empty[team_id]) for team_id in teams}
+
+
+def _batch_form_python(history: FixtureHistory, team_ids: Sequence[int], last: int) -> Dict[int, Dict[str, Any]]:
+    """batch_form בלי NumPy - אותן תוצאות"""
+    teams = [int(team_id) for team_id in team_ids]
+    wanted = set(teams)
+    games: Dict[int, List[Tuple[Row, int, int, bool]]] = {team_id: [] for team_id in wanted}
+    for row in history.rows:
+        home_id, away_id, home_goals, away_goals = row[:4]
+        if home_id in wanted:
+            games[home_id].append((row, home_goals, away_goals, True))
+        if away_id in wanted:
+            games[away_id].append((row, away_goals, home_goals, False))
+
+    results = {}
+    for team_id in wanted:
+        overall, home, away = _empty_split(), _empty_split(), _empty_split()
+        form = ""
+        for _, scored, conceded, at_home in sorted(games[team_id], key=lambda game: _recency_key(game[0]))[:last]:
+            result = "W" if scored > conceded else "D" if scored == conceded else "L"
+            form += result
+            for split in (overall, home if at_home else away):
+                split["played"] += 1
+                split[{"W": "wins", "D": "draws", "L": "losses"}[result]] += 1
+                split["goals_for"] += scored
+                split["goals_against"] += conceded
+        results[team_id] = _form_summary(team_id, overall, home, away, form)
+    return {team_id: results[team_id] for team_id in teams}
+
+
+def team_form(matches: Iterable[Dict], team_id: int, last: int = 5) -> Dict[str, Any]:
+    """פורמה של קבוצה אחת מרשימת משחקים (get_team_last_matches)"""
+    return batch_form(FixtureHistory.from_matches(matches), [team_id], last)[int(team_id)]
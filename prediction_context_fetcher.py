@@ -11,11 +11,16 @@ Version: 2.0 - UPGRADED for Premium API (7500 calls/day!)
 ✅ מותאם לפי Tier (Free = 3 calls, Premium = 7 calls)
 
 Flow:
-1. בדוק תקציב API
-2. בדוק Cache
-3. משוך מ-API רק אם צריך
+1. תכנן את כל ה-fetches לפי Priority ובדוק מה כבר ב-Cache
+2. שריין תקציב API פעם אחת לכל התוכנית (מה שלא נכנס - מהעדיפות הנמוכה)
+3. משוך הכל במקביל (fan_out) עם deadline - מה שלא הגיע נשאר None
 4. החזר context אחיד ל-AI
 
+📦 Context bundle: ה-context המורכב נשמר ב-Cache לפי (ליגה, בית, חוץ, תאריך, tier),
+עם TTL = ה-TTL שנשאר לתלות הקצרה ביותר שלו, ונמחק כשאחת התלויות נכתבת מחדש
+(dependency_tag) או כשמשחק של הקבוצות מסתיים (league / team tags).
+תחזית חוזרת לאותו משחק = Cache hit אחד.
+
 🚀 UPGRADED FEATURES (v2.0):
 - Premium now gets 7 API calls (was 5)
 - Added Team Statistics (2 new calls)
@@ -25,26 +30,92 @@ Flow:
 """
 
 import asyncio
+import copy
 import logging
-from typing import Dict, Optional, Any
+import os
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
 # Imports
 try:
-    from cache_manager import cache_manager, CacheTTL
     from api_budget_tracker import api_budget_tracker, EndpointType
-    from sports_api import SportsAPIManager
+    from cache_manager import dependency_tag, make_key
+    from sports_api import (
+        SportsAPIManager, get_sports_api, h2h_key, league_tag, standings_key, team_last_key,
+        team_stats_key, team_tag
+    )
+    from fanout import FetchTask, fan_out
 except ImportError:
     try:
-        from backend.cache_manager import cache_manager, CacheTTL
         from backend.api_budget_tracker import api_budget_tracker, EndpointType
-        from backend.sports_api import SportsAPIManager
+        from backend.cache_manager import dependency_tag, make_key
+        from backend.sports_api import (
+            SportsAPIManager, get_sports_api, h2h_key, league_tag, standings_key, team_last_key,
+            team_stats_key, team_tag
+        )
+        from backend.fanout import FetchTask, fan_out
     except ImportError as e:
         raise ImportError(f"Failed to import Phase 2 dependencies: {e}")
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ⏱️ זמן מקסימלי לכל ה-context, ולכל fetch בודד (שניות)
+CONTEXT_FETCH_DEADLINE = float(os.getenv("CONTEXT_FETCH_DEADLINE", "8"))
+CONTEXT_FETCH_TIMEOUT = float(os.getenv("CONTEXT_FETCH_TIMEOUT", "5"))
+
+# 📦 bundle קצר מזה לא נשמר (תלות שעומדת לפוג / כבר stale)
+MIN_BUNDLE_TTL = 5
+
+# ערך ברירת מחדל ב-fan_out ל-fetch שלא הסתיים / דולג (להבדיל מ-None שחזר מה-API)
+_NOT_FETCHED = object()
+
+TeamIds = Dict[str, Optional[int]]
+
+
+@dataclass(frozen=True)
+class PlannedFetch:
+    """
+    📋 fetch אחד בתוכנית
+
+    Attributes:
+        name: שם (גם ב-failed_fetches וב-metadata["fetch"])
+        endpoint: סוג ה-endpoint (ללוגים)
+        key: מזהי קבוצות → cache_key (None אם חסר מזהה)
+        load: מזהי קבוצות → קריאה ל-SportsAPIManager
+        slot: איפה ב-context לשמור - ("form", "home") / ("standings", None)
+    """
+    name: str
+    endpoint: EndpointType
+    key: Callable[[TeamIds], Optional[str]]
+    load: Callable[[TeamIds], Awaitable[Any]]
+    slot: Tuple[str, Optional[str]]
+
+    def store(self, context: Dict[str, Any], data: Any) -> None:
+        section, side = self.slot
+        if side is None:
+            context[section] = data
+        else:
+            context[section][side] = data
+
+
+def context_bundle_key(
+    league_id: int,
+    home: str,
+    away: str,
+    match_date: Optional[str] = None,
+    tier: str = "free"
+) -> str:
+    """📦 מפתח ה-context המורכב של משחק (Free ו-Premium נבנים מתלויות שונות)"""
+    return make_key("context", league_id, home.strip().lower(), away.strip().lower(), match_date or "any", tier)
+
+
+def _team_key(side: str, make_key: Callable[[int], str]) -> Callable[[TeamIds], Optional[str]]:
+    def key(ids: TeamIds) -> Optional[str]:
+        return make_key(ids[side]) if ids.get(side) else None
+    return key
+
 
 class PredictionContextFetcher:
     """
@@ -73,9 +144,21 @@ class PredictionContextFetcher:
         # - metadata (API calls used, cache efficiency)
     """
 
-    def __init__(self):
-        """אתחול Fetcher"""
-        self.sports_api = SportsAPIManager()
+    def __init__(
+        self,
+        sports_api: Optional[SportsAPIManager] = None,
+        deadline: float = CONTEXT_FETCH_DEADLINE,
+        fetch_timeout: float = CONTEXT_FETCH_TIMEOUT
+    ):
+        """
+        אתחול Fetcher
+
+        Args:
+            sports_api: ה-client (ברירת מחדל: המופע המשותף מ-get_sports_api)
+        """
+        self.sports_api = sports_api or get_sports_api()
+        self.deadline = deadline
+        self.fetch_timeout = fetch_timeout
         logger.info("🧠 PredictionContextFetcher initialized")
 
     async def fetch_prediction_context(
@@ -84,7 +167,9 @@ class PredictionContextFetcher:
         away: str,
         league_id: int,
         match_date: Optional[str] = None,
-        tier: str = "free"
+        tier: str = "free",
+        deadline: Optional[float] = None,
+        timeout: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         🎯 משוך Context חכם לתחזית
@@ -95,18 +180,28 @@ class PredictionContextFetcher:
             league_id: מזהה הליגה (לדוגמה: 39 = Premier League)
             match_date: תאריך המשחק (אופציונלי)
             tier: "free" או "premium"
+            deadline: שניות לכל ה-context (ברירת מחדל: CONTEXT_FETCH_DEADLINE)
+            timeout: שניות לכל fetch בודד (ברירת מחדל: CONTEXT_FETCH_TIMEOUT)
 
         Returns:
             dict עם:
             - standings: טבלת ליגה
             - form: פורמה אחרונה (אם יש תקציב)
             - h2h: Head-to-Head (רק Premium)
-            - metadata: מידע על השימוש ב-API
+            - metadata: מידע על השימוש ב-API (כולל fetch - זמנים ושגיאות לכל fetch)
 
         Logic:
-        - Free tier: רק Standings (חובה)
-        - Premium tier: Standings + Form + H2H (אם יש תקציב)
+        - Free tier: Standings + Form
+        - Premium tier: Standings + Team Stats + Form + H2H
+        - לפי תקציב: מה שלא נכנס ב-api_calls_budget / בשריון היומי - מדולג
+          מהעדיפות הנמוכה (metadata["skipped_budget"]); מה שב-Cache לא עולה קריאה
         """
+        # 📦 אותו משחק כבר הורכב - Cache hit אחד במקום עד 7 lookups
+        bundle_key = context_bundle_key(league_id, home, away, match_date, tier)
+        bundle = await self.sports_api.cache.get(bundle_key)
+        if bundle is not None:
+            return self._from_bundle(bundle)
+
         # 🔧 UPGRADED: Rafael's Premium API (7500 calls/day!)
         context = {
             "standings": None,
@@ -126,128 +221,107 @@ class PredictionContextFetcher:
             }
         }
 
-        api_calls_used = 0
         max_calls = context["metadata"]["api_calls_budget"]
         failed_fetches = []  # 🔧 CTO: Fail-soft tracking
+        dependencies = []  # מפתחות ה-Cache שה-context נבנה מהם
+
+        # 🆔 מזהי קבוצות מ-team_index (מקומי, בלי API) - אם ידועים, הכל רץ במקביל
+        # לטבלה; אחרת הפורמה / H2H ממתינים לטבלה ואז מזהים. כאן רק התאמה מדויקת -
+        # עמומה רק דרך resolve_team_id, אחרי הטבלה ו-/teams
+        known_ids = {
+            "home": self.sports_api.team_index.resolve(home, league_id, fuzzy=False),
+            "away": self.sports_api.team_index.resolve(away, league_id, fuzzy=False)
+        }
+
+        # 📋 תכנון: כל ה-fetches לפי עדיפות, ושריון תקציב לכולם במכה אחת
+        plan = self._plan(league_id, tier)
+        selected, skipped = [], []
+        calls_needed = 0
+        for fetch in plan:
+            cache_key = fetch.key(known_ids)
+            needs_call = cache_key is None or not self.sports_api.is_cached(cache_key)
+            if needs_call and calls_needed >= max_calls:
+                skipped.append(fetch.name)
+                continue
+            calls_needed += needs_call
+            selected.append((fetch, needs_call))
+
+        reservation = await api_budget_tracker.reserve(calls_needed)
+        reserved = reservation.granted
+        if reserved < calls_needed:
+            # אין תקציב לכולם - חותכים מהעדיפות הנמוכה (מה שב-Cache נשאר תמיד)
+            allowed, kept = reserved, []
+            for fetch, needs_call in selected:
+                if needs_call and allowed <= 0:
+                    skipped.append(fetch.name)
+                    continue
+                allowed -= needs_call
+                kept.append((fetch, needs_call))
+            selected = kept
+
+        # 🆔 מזהים חסרים - מחכים לטבלה (team_index מתעדכן ממנה) ואז resolve_team_id
+        ids_known = known_ids["home"] is not None and known_ids["away"] is not None
+        with_standings = any(fetch.name == "standings" for fetch, _ in selected)
+
+        async def resolve_teams(inputs: Dict[str, Any]) -> Dict[str, Optional[int]]:
+            if ids_known:
+                return known_ids
+            fetched = inputs.get("standings")
+            if fetched:
+                self.sports_api.team_index.add_standings(fetched["data"], league_id)
+            return {
+                "home": known_ids["home"] or await self._resolve_team_id(home, league_id),
+                "away": known_ids["away"] or await self._resolve_team_id(away, league_id)
+            }
+
+        tasks = [FetchTask(
+            "teams",
+            resolve_teams,
+            deps=("standings",) if with_standings and not ids_known else ()
+        )]
+        for fetch, _ in selected:
+            tasks.append(FetchTask(
+                fetch.name,
+                self._fetch_task(fetch),
+                deps=() if fetch.name == "standings" else ("teams",),
+                timeout=self.fetch_timeout if timeout is None else timeout,
+                default=_NOT_FETCHED
+            ))
+
+        # ⚡ הכל במקביל - זמן ≈ ה-fetch האיטי ביותר; מה שלא הגיע עד ה-deadline נשאר None
+        # (ה-fetches מנצלים את השריון בלי נעילה - ה-tasks יורשים אותו מה-with)
+        try:
+            with reservation:
+                gathered = await fan_out(tasks, deadline=self.deadline if deadline is None else deadline)
+        finally:
+            await api_budget_tracker.release(reservation)
+
+        team_ids = gathered.get("teams") or known_ids
+        context["team_ids"] = {"home": team_ids["home"], "away": team_ids["away"]}
+        if team_ids["home"] is None:
+            failed_fetches.append("team_id_home")
+        if team_ids["away"] is None:
+            failed_fetches.append("team_id_away")
 
-        # ✅ Priority 1: Standings (חובה - גם Free וגם Premium)
-        if await api_budget_tracker.can_make_call():
-            try:
-                standings_data = await self._get_cached_or_fetch(
-                    cache_key=f"standings_{league_id}",
-                    fetch_func=lambda: self.sports_api.get_league_standings(league_id),
-                    ttl=CacheTTL.STANDINGS,
-                    endpoint=EndpointType.STANDINGS
-                )
-
-                if standings_data:
-                    context["standings"] = standings_data["data"]
-                    api_calls_used += 0 if standings_data["from_cache"] else 1
-                    context["metadata"]["cache_hits" if standings_data["from_cache"] else "cache_misses"] += 1
-                else:
-                    failed_fetches.append("standings")
-            except Exception as e:
-                logger.error(f"🔧 Fail-soft: standings fetch failed: {e}")
-                failed_fetches.append("standings")
-
-        # ✅ Priority 2: Team Statistics (רק Premium - 2 calls)
-        if tier == "premium" and api_calls_used < max_calls:
-            # Home team stats
-            if await api_budget_tracker.can_make_call():
-                try:
-                    home_stats_data = await self._get_cached_or_fetch(
-                        cache_key=f"team_stats_{home}_{league_id}",
-                        fetch_func=lambda: self.sports_api.get_team_statistics(home, league_id),
-                        ttl=CacheTTL.LAST_5_MATCHES,  # Same TTL as form
-                        endpoint=EndpointType.FIXTURES
-                    )
-
-                    if home_stats_data:
-                        context["team_stats"]["home"] = home_stats_data["data"]
-                        api_calls_used += 0 if home_stats_data["from_cache"] else 1
-                        context["metadata"]["cache_hits" if home_stats_data["from_cache"] else "cache_misses"] += 1
-                    else:
-                        failed_fetches.append("team_stats_home")
-                except Exception as e:
-                    logger.error(f"🔧 Fail-soft: home team stats fetch failed: {e}")
-                    failed_fetches.append("team_stats_home")
-
-            # Away team stats
-            if await api_budget_tracker.can_make_call() and api_calls_used < max_calls:
-                try:
-                    away_stats_data = await self._get_cached_or_fetch(
-                        cache_key=f"team_stats_{away}_{league_id}",
-                        fetch_func=lambda: self.sports_api.get_team_statistics(away, league_id),
-                        ttl=CacheTTL.LAST_5_MATCHES,
-                        endpoint=EndpointType.FIXTURES
-                    )
-
-                    if away_stats_data:
-                        context["team_stats"]["away"] = away_stats_data["data"]
-                        api_calls_used += 0 if away_stats_data["from_cache"] else 1
-                        context["metadata"]["cache_hits" if away_stats_data["from_cache"] else "cache_misses"] += 1
-                    else:
-                        failed_fetches.append("team_stats_away")
-                except Exception as e:
-                    logger.error(f"🔧 Fail-soft: away team stats fetch failed: {e}")
-                    failed_fetches.append("team_stats_away")
-
-        # ✅ Priority 3: Form (רק אם יש תקציב)
-        if tier in ["premium", "free"] and api_calls_used < max_calls:
-            # Home team form
-            if await api_budget_tracker.can_make_call():
-                try:
-                    # Note: get_team_last_matches needs team_id, not team_name
-                    # For now, skip form data until we have team_id resolution
-                    home_form_data = None
-                    logger.warning(f"⚠️ Form data skipped - need team_id for {home}")
-
-                    if home_form_data:
-                        context["form"]["home"] = home_form_data["data"]
-                        api_calls_used += 0 if home_form_data["from_cache"] else 1
-                        context["metadata"]["cache_hits" if home_form_data["from_cache"] else "cache_misses"] += 1
-                    else:
-                        failed_fetches.append("form_home")
-                except Exception as e:
-                    logger.error(f"🔧 Fail-soft: home form fetch failed: {e}")
-                    failed_fetches.append("form_home")
-
-            # Away team form
-            if await api_budget_tracker.can_make_call() and api_calls_used < max_calls:
-                try:
-                    # Note: get_team_last_matches needs team_id, not team_name
-                    # For now, skip form data until we have team_id resolution
-                    away_form_data = None
-                    logger.warning(f"⚠️ Form data skipped - need team_id for {away}")
-
-                    if away_form_data:
-                        context["form"]["away"] = away_form_data["data"]
-                        api_calls_used += 0 if away_form_data["from_cache"] else 1
-                        context["metadata"]["cache_hits" if away_form_data["from_cache"] else "cache_misses"] += 1
-                    else:
-                        failed_fetches.append("form_away")
-                except Exception as e:
-                    logger.error(f"🔧 Fail-soft: away form fetch failed: {e}")
-                    failed_fetches.append("form_away")
-
-        # ⚡ Priority 4: H2H (רק Premium + אם יש תקציב)
-        if tier == "premium" and api_calls_used < max_calls:
-            if await api_budget_tracker.can_make_call():
-                try:
-                    # Note: get_h2h_statistics needs team_ids, not team_names
-                    # For now, skip h2h data until we have team_id resolution
-                    h2h_data = None
-                    logger.warning(f"⚠️ H2H data skipped - need team_ids for {home} vs {away}")
-
-                    if h2h_data:
-                        context["h2h"] = h2h_data["data"]
-                        api_calls_used += 0 if h2h_data["from_cache"] else 1
-                        context["metadata"]["cache_hits" if h2h_data["from_cache"] else "cache_misses"] += 1
-                    else:
-                        failed_fetches.append("h2h")
-                except Exception as e:
-                    logger.error(f"🔧 Fail-soft: h2h fetch failed: {e}")
-                    failed_fetches.append("h2h")
+        api_calls_used = 0
+        for fetch, _ in selected:
+            fetched = gathered.get(fetch.name)
+            if fetched is _NOT_FETCHED and fetch.key(team_ids) is None:
+                continue  # אין מזהה קבוצה - כבר נספר ב-team_id_*
+            if not fetched or fetched is _NOT_FETCHED:
+                failed_fetches.append(fetch.name)
+                continue
+            fetch.store(context, fetched["data"])
+            dependencies.append(fetch.key(team_ids))
+            api_calls_used += 0 if fetched["from_cache"] else 1
+            context["metadata"]["cache_hits" if fetched["from_cache"] else "cache_misses"] += 1
+
+        if context["standings"] and ids_known:
+            self.sports_api.team_index.add_standings(context["standings"], league_id)
+
+        context["metadata"]["budget_reserved"] = reserved
+        context["metadata"]["skipped_budget"] = skipped
+        context["metadata"]["fetch"] = gathered.to_dict()
 
         # 📊 Update metadata
         context["metadata"]["api_calls_used"] = api_calls_used
@@ -284,56 +358,161 @@ class PredictionContextFetcher:
             f"quality={context['metadata']['data_quality']}"
         )
 
+        await self._store_bundle(bundle_key, context, dependencies, league_id, skipped)
         return context
 
+    async def _store_bundle(
+        self,
+        bundle_key: str,
+        context: Dict[str, Any],
+        dependencies: List[str],
+        league_id: int,
+        skipped: List[str]
+    ) -> None:
+        """
+        📦 שמור context מלא ב-Cache - TTL לפי התלות הקצרה ביותר
+
+        context חלקי (fetch נכשל / דולג בגלל תקציב) לא נשמר, כדי שהבקשה הבאה
+        תנסה שוב להשלים אותו.
+        """
+        context["metadata"]["bundle_cache"] = "miss"
+        if context["metadata"]["data_completeness"] != "full" or skipped or not dependencies:
+            return
+
+        remaining = [self.sports_api.cache.ttl_remaining(key) for key in dependencies]
+        if any(ttl is None for ttl in remaining):
+            return
+        ttl = int(min(remaining))
+        if ttl < MIN_BUNDLE_TTL:
+            return
+
+        tags = [dependency_tag(key) for key in dependencies]
+        tags.append(league_tag(league_id))
+        tags.extend(team_tag(team_id) for team_id in context["team_ids"].values() if team_id is not None)
+        await self.sports_api.cache.set(bundle_key, context, ttl, tags=tags)
+        logger.info(f"📦 Context bundle cached: {bundle_key} (ttl={ttl}s, {len(dependencies)} dependencies)")
+
+    @staticmethod
+    def _from_bundle(bundle: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        context מה-bundle - עותק עמוק עם metadata של hit (0 קריאות API)
+
+        ה-bundle הוא הערך שיושב ב-Cache (L1 מחזיר את אותו אובייקט), ו-form / team_stats / h2h
+        הם dicts מקוננים - קורא שמעדכן את ה-context לא ישנה את ה-bundle של הבאים אחריו.
+        """
+        context = copy.deepcopy(bundle)
+        metadata = context["metadata"]
+        lookups = metadata["cache_hits"] + metadata["cache_misses"]
+        metadata.update({
+            "api_calls_used": 0,
+            "cache_hits": lookups,
+            "cache_misses": 0,
+            "cache_efficiency": "100%",
+            "bundle_cache": "hit"
+        })
+        return context
+
+    def _plan(self, league_id: int, tier: str) -> List[PlannedFetch]:
+        """📋 כל ה-fetches לפי Priority (Standings > Team Stats > Form > H2H)"""
+        api = self.sports_api
+        plan = [PlannedFetch(
+            "standings", EndpointType.STANDINGS,
+            key=lambda ids: standings_key(league_id),
+            load=lambda ids: api.get_league_standings(league_id),
+            slot=("standings", None)
+        )]
+
+        if tier == "premium":
+            for side in ("home", "away"):
+                plan.append(PlannedFetch(
+                    f"team_stats_{side}", EndpointType.STATISTICS,
+                    key=_team_key(side, lambda team_id: team_stats_key(team_id, league_id)),
+                    load=lambda ids, side=side: api.get_team_statistics(ids[side], league_id),
+                    slot=("team_stats", side)
+                ))
+
+        for side in ("home", "away"):
+            plan.append(PlannedFetch(
+                f"form_{side}", EndpointType.FIXTURES,
+                key=_team_key(side, lambda team_id: team_last_key(team_id, 5)),
+                load=lambda ids, side=side: api.get_team_last_matches(ids[side], 5),
+                slot=("form", side)
+            ))
+
+        if tier == "premium":
+            plan.append(PlannedFetch(
+                "h2h", EndpointType.H2H,
+                key=lambda ids: h2h_key(ids["home"], ids["away"]) if ids.get("home") and ids.get("away") else None,
+                load=lambda ids: api.get_h2h_statistics(ids["home"], ids["away"]),
+                slot=("h2h", None)
+            ))
+
+        return plan
+
+    def _fetch_task(self, fetch: PlannedFetch) -> Callable[[Dict[str, Any]], Awaitable[Any]]:
+        """PlannedFetch → func ל-FetchTask (המזהים מגיעים מ-task "teams")"""
+        async def run(inputs: Dict[str, Any]) -> Any:
+            ids = inputs.get("teams", {})
+            cache_key = fetch.key(ids)
+            if cache_key is None:
+                return _NOT_FETCHED
+            return await self._get_cached_or_fetch(cache_key, lambda: fetch.load(ids), fetch.endpoint)
+        return run
+
+    async def _resolve_team_id(self, team_name: str, league_id: int) -> Optional[int]:
+        """🆔 שם קבוצה → מזהה (None אם לא נמצא - הפורמה / H2H שלה ידולגו)"""
+        try:
+            team_id = await self.sports_api.resolve_team_id(team_name, league_id)
+        except Exception as e:
+            logger.error(f"🔧 Fail-soft: team id resolution failed for {team_name}: {e}")
+            team_id = None
+
+        if team_id is None:
+            logger.warning(f"⚠️ Team id not found for '{team_name}' (league {league_id})")
+        return team_id
+
     async def _get_cached_or_fetch(
         self,
         cache_key: str,
         fetch_func,
-        ttl: int,
         endpoint: EndpointType
     ) -> Optional[Dict]:
         """
         🔍 Helper: בדוק Cache → אם לא קיים, משוך מ-API
 
+        ה-Cache עצמו (TTL, stale-while-revalidate, single-flight) מנוהל ב-SportsAPIManager
+        לפי CACHE_POLICY, תחת אותו cache_key - כאן רק בודקים אם הערך כבר שם,
+        כדי לדווח from_cache. התקציב נרשם ב-SportsAPIManager לכל קריאה שיצאה בפועל.
+
         Args:
-            cache_key: מפתח ייחודי
-            fetch_func: פונקציה למשיכה מ-API
-            ttl: Time To Live
-            endpoint: סוג ה-endpoint (למעקב)
+            cache_key: המפתח ש-SportsAPIManager שומר תחתיו (standings_key וכו')
+            fetch_func: פונקציה למשיכה דרך SportsAPIManager
+            endpoint: סוג ה-endpoint (ללוגים)
 
         Returns:
             {"data": ..., "from_cache": bool} או None אם נכשל
         """
-        # 1. בדוק Cache
-        cached = await cache_manager.get(cache_key, ttl)
-
-        if cached:
-            logger.info(f"💨 Cache HIT: {cache_key}")
-            return {"data": cached, "from_cache": True}
-
-        # 2. Cache MISS - משוך מ-API
-        logger.info(f"🌐 Cache MISS: {cache_key} - Fetching from API")
+        # הנתונים תמיד דרך SportsAPIManager (ה-Cache שם) - לא ערך גולמי מה-Cache:
+        # H2H נשמר תחת מפתח ממוין ומסובב לפי הקבוצה המבוקשת רק ב-get_h2h_statistics
+        from_cache = self.sports_api.is_cached(cache_key)
+        if from_cache:
+            logger.info(f"💨 Cache HIT: {cache_key} ({endpoint.value})")
+        else:
+            logger.info(f"🌐 Cache MISS: {cache_key} - Fetching from API")
 
         try:
             data = await fetch_func()
-
-            if data:
-                # שמור ב-Cache
-                await cache_manager.set(cache_key, data, ttl)
-
-                # רשום קריאת API
-                await api_budget_tracker.record_call(endpoint, from_cache=False)
-
-                return {"data": data, "from_cache": False}
-            else:
-                logger.warning(f"⚠️ API returned empty data for {cache_key}")
-                return None
-
         except Exception as e:
             logger.error(f"❌ Error fetching {cache_key}: {e}")
             return None
 
+        if not data:
+            logger.warning(f"⚠️ API returned empty data for {cache_key}")
+            return None
+
+        # הקריאות עצמן נרשמות בתקציב ב-SportsAPIManager (לפי כותרות ה-upstream)
+        return {"data": data, "from_cache": from_cache}
+
 
 # 🌍 Global instance
 prediction_context_fetcher = PredictionContextFetcher()
@@ -348,7 +527,9 @@ async def fetch_prediction_context(
     away: str,
     league_id: int,
     match_date: Optional[str] = None,
-    tier: str = "free"
+    tier: str = "free",
+    deadline: Optional[float] = None,
+    timeout: Optional[float] = None
 ) -> Dict[str, Any]:
     """
     🎯 Convenience function - קיצור דרך
@@ -368,7 +549,9 @@ async def fetch_prediction_context(
         away=away,
         league_id=league_id,
         match_date=match_date,
-        tier=tier
+        tier=tier,
+        deadline=deadline,
+        timeout=timeout
     )
 
 
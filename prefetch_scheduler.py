@@ -0,0 +1,279 @@
+"""
+🔥 Prefetch Scheduler - חימום Cache למשחקים הקרובים
+Created by: Rafael & AI Assistant (Phase 2)
+Version: 1.0
+
+מטרה:
+לפני סופ"ש עמוס, המשתמשים הראשונים ב-/api/ai-analyze-match ו-/api/predict
+משלמים על Cache קר (טבלה, סטטיסטיקות קבוצה, פורמה, H2H).
+ה-Scheduler רץ ברקע, קורא את המשחקים של N הימים הקרובים וטוען מראש
+את כל ה-context שכל משחק יצטרך - כך שבקשות תחזית הן בעיקר Cache HIT.
+
+עקרונות:
+✅ אותם מפתחות Cache כמו ai_analyze_match (דרך SportsAPIManager)
+✅ ערך שכבר ב-Cache לא עולה כלום - מדלגים עליו
+✅ תקציב: לכל היותר budget_share מהמכסה היומית של api_budget_tracker
+✅ משחקים קרובים קודם (לפי kickoff) - התקציב הולך למה שיתבקש ראשון
+✅ כישלון לא מפיל כלום - רק נרשם בלוג, והסבב הבא ינסה שוב
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+try:
+    from api_budget_tracker import api_budget_tracker, APIBudgetTracker, EndpointType
+    from sports_api import (
+        SportsAPIManager, current_season, fixtures_key, h2h_key,
+        standings_key, team_last_key, team_stats_key
+    )
+except ImportError:
+    from backend.api_budget_tracker import api_budget_tracker, APIBudgetTracker, EndpointType
+    from backend.sports_api import (
+        SportsAPIManager, current_season, fixtures_key, h2h_key,
+        standings_key, team_last_key, team_stats_key
+    )
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class PrefetchScheduler:
+    """
+    🔥 טעינה מראש של context למשחקים הקרובים
+
+    Usage:
+        scheduler = PrefetchScheduler(sports_api, days_ahead=3, budget_share=0.25)
+        scheduler.start()      # ב-lifespan (STARTUP)
+        ...
+        await scheduler.stop() # ב-lifespan (SHUTDOWN)
+
+        # או סבב בודד:
+        stats = await scheduler.run_once()
+    """
+
+    def __init__(
+        self,
+        sports_api: SportsAPIManager,
+        budget_tracker: APIBudgetTracker = api_budget_tracker,
+        days_ahead: int = 2,
+        budget_share: float = 0.25,
+        interval_minutes: int = 60,
+        leagues: Optional[List[int]] = None
+    ):
+        """
+        Args:
+            sports_api: ה-client שדרכו נטענים הנתונים (ושומר אותם ב-Cache)
+            budget_tracker: מעקב תקציב API
+            days_ahead: כמה ימים קדימה (0 = רק היום)
+            budget_share: איזה חלק מהמכסה היומית מותר ל-prefetch (0.0-1.0)
+            interval_minutes: כל כמה דקות להריץ סבב
+            leagues: רק ליגות אלו (None / ריק = כל המשחקים)
+        """
+        self.sports_api = sports_api
+        self.budget_tracker = budget_tracker
+        self.days_ahead = days_ahead
+        self.budget_share = min(max(budget_share, 0.0), 1.0)
+        self.interval_minutes = interval_minutes
+        self.leagues = set(leagues) if leagues else None
+
+        self._task: Optional[asyncio.Task] = None
+
+        # מונה יומי של קריאות prefetch (מתאפס בחצות)
+        self._budget_date = datetime.now().date()
+        self._calls_today = 0
+
+        # Statistics
+        self._runs = 0
+        self._fixtures_seen = 0
+        self._prefetched = 0
+        self._already_cached = 0
+        self._skipped_budget = 0
+        self._errors = 0
+        self._last_run: Optional[datetime] = None
+
+        logger.info(
+            f"🔥 PrefetchScheduler initialized "
+            f"(days_ahead={days_ahead}, budget_share={self.budget_share:.0%}, "
+            f"interval={interval_minutes}min)"
+        )
+
+    # ============================================================
+    # 🔄 Lifecycle
+    # ============================================================
+
+    def start(self) -> None:
+        """הפעל את הלולאה ברקע (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+            logger.info("🔥 Prefetch scheduler started")
+
+    async def stop(self) -> None:
+        """עצור את הלולאה (ב-SHUTDOWN)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("🛑 Prefetch scheduler stopped")
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"❌ Prefetch run failed: {e}")
+            await asyncio.sleep(self.interval_minutes * 60)
+
+    # ============================================================
+    # 🎯 Prefetch
+    # ============================================================
+
+    def budget_cap(self) -> int:
+        """כמה קריאות API מותר ל-prefetch היום"""
+        return int(self.budget_tracker.daily_limit * self.budget_share)
+
+    def _reset_budget_if_needed(self) -> None:
+        today = datetime.now().date()
+        if today != self._budget_date:
+            self._budget_date = today
+            self._calls_today = 0
+
+    async def _fetch(
+        self,
+        cache_key: str,
+        endpoint: EndpointType,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> bool:
+        """
+        טען מפתח אחד אם הוא לא ב-Cache ויש תקציב
+
+        Returns:
+            False אם נגמר התקציב (כדי לעצור את הסבב), אחרת True
+        """
+        if self.sports_api.is_cached(cache_key):
+            self._already_cached += 1
+            return True
+
+        if self._calls_today >= self.budget_cap() or not await self.budget_tracker.can_make_call(endpoint):
+            self._skipped_budget += 1
+            return False
+
+        calls_before = self.budget_tracker.calls_used
+        try:
+            await loader()
+            self._prefetched += 1
+        except Exception as e:
+            self._errors += 1
+            logger.warning(f"⚠️ Prefetch failed for {cache_key}: {e}")
+        finally:
+            # רק קריאות שיצאו בפועל ל-upstream (כולל pagination / retries) - לא loader calls
+            self._calls_today += max(0, self.budget_tracker.calls_used - calls_before)
+        return True
+
+    async def _upcoming_fixtures(self) -> List[Dict]:
+        """משחקים שעוד לא התחילו ב-N הימים הקרובים, ממוינים לפי kickoff"""
+        fixtures: List[Dict] = []
+        today = datetime.now()
+
+        for day_offset in range(self.days_ahead + 1):
+            date = (today + timedelta(days=day_offset)).strftime("%Y-%m-%d")
+            day_fixtures: List[Dict] = []
+
+            async def load_day(date=date):
+                day_fixtures.extend(await self.sports_api.get_fixtures_by_date(date=date))
+
+            if self.sports_api.is_cached(fixtures_key(date)):
+                await load_day()
+            elif not await self._fetch(fixtures_key(date), EndpointType.FIXTURES, load_day):
+                break
+
+            fixtures.extend(
+                fixture for fixture in day_fixtures
+                if fixture.get("status") == "NS"
+                and fixture.get("home_id") and fixture.get("away_id") and fixture.get("league_id")
+                and (self.leagues is None or fixture["league_id"] in self.leagues)
+            )
+
+        fixtures.sort(key=lambda fixture: fixture.get("timestamp") or 0)
+        return fixtures
+
+    async def run_once(self) -> Dict[str, Any]:
+        """
+        🔥 סבב prefetch אחד
+
+        לכל משחק (לפי סדר kickoff): טבלה → סטטיסטיקות קבוצה → פורמה → H2H.
+        נעצר כשהתקציב של ה-prefetch נגמר.
+
+        Returns:
+            סטטיסטיקות הסבב
+        """
+        self._reset_budget_if_needed()
+        self._runs += 1
+        self._last_run = datetime.now()
+        prefetched_before = self._prefetched
+        api = self.sports_api
+
+        fixtures = await self._upcoming_fixtures()
+        self._fixtures_seen += len(fixtures)
+
+        for fixture in fixtures:
+            league_id = fixture["league_id"]
+            season = fixture.get("season") or current_season()
+            home_id = fixture["home_id"]
+            away_id = fixture["away_id"]
+
+            plan = [
+                (standings_key(league_id, season), EndpointType.STANDINGS,
+                 lambda: api.get_league_standings(league_id, season)),
+                (team_stats_key(home_id, league_id, season), EndpointType.STATISTICS,
+                 lambda: api.get_team_statistics(home_id, league_id, season)),
+                (team_stats_key(away_id, league_id, season), EndpointType.STATISTICS,
+                 lambda: api.get_team_statistics(away_id, league_id, season)),
+                (team_last_key(home_id, 5), EndpointType.FIXTURES,
+                 lambda: api.get_team_last_matches(home_id, 5)),
+                (team_last_key(away_id, 5), EndpointType.FIXTURES,
+                 lambda: api.get_team_last_matches(away_id, 5)),
+                (h2h_key(home_id, away_id), EndpointType.H2H,
+                 lambda: api.get_h2h_statistics(home_id, away_id)),
+            ]
+
+            for cache_key, endpoint, loader in plan:
+                if not await self._fetch(cache_key, endpoint, loader):
+                    logger.info(
+                        f"💰 Prefetch budget reached ({self._calls_today}/{self.budget_cap()}) - "
+                        f"stopping run"
+                    )
+                    return self._run_summary(len(fixtures), prefetched_before)
+
+        return self._run_summary(len(fixtures), prefetched_before)
+
+    def _run_summary(self, fixtures: int, prefetched_before: int) -> Dict[str, Any]:
+        summary = {
+            "fixtures": fixtures,
+            "prefetched": self._prefetched - prefetched_before,
+            "calls_today": self._calls_today,
+            "budget_cap": self.budget_cap()
+        }
+        logger.info(f"🔥 Prefetch run #{self._runs}: {summary}")
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        """📊 סטטיסטיקות ה-Scheduler"""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "runs": self._runs,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "days_ahead": self.days_ahead,
+            "fixtures_seen": self._fixtures_seen,
+            "prefetched": self._prefetched,
+            "already_cached": self._already_cached,
+            "skipped_budget": self._skipped_budget,
+            "errors": self._errors,
+            "calls_today": self._calls_today,
+            "budget_cap": self.budget_cap()
+        }
@@ -0,0 +1,291 @@
+"""
+🧱 Records - רשומות קומפקטיות למשחקים ולטבלאות דירוג
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+כל משחק מפורסר היה dict של ~20 מפתחות, עם עותק נפרד של שם הליגה, המדינה,
+הסטטוס וכתובות הלוגו - ואלפי משחקים כאלה יושבים ב-FixturesStore וב-Cache.
+כאן:
+
+✅ dataclass(slots=True) - בלי __dict__ לכל רשומה (פי כמה פחות זיכרון מ-dict)
+✅ מחרוזות חוזרות (ליגה, מדינה, סטטוס, לוגו, קבוצה) עוברות sys.intern -
+   עותק אחד בזיכרון לכל הרשומות ולכל ה-dicts שנבנים מהן
+✅ Mapping לקריאה בלבד - record["home_team"] / record.get("status") כמו dict,
+   כך שה-Cache, FixturesStore וכל הצרכנים מחזיקים את אותה רשומה (בלי עותק dict)
+✅ to_dict() - אותו מבנה שה-endpoints תמיד החזירו; נבנה רק בקצה (to_json)
+✅ to_json() - orjson (כבר ב-requirements) עם fallback ל-json
+
+Usage:
+    record = FixtureRecord.from_api(api_item)
+    payload = to_json({"matches": records})
+"""
+
+import json
+import sys
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+LIVE_STATUSES = {"1H", "HT", "2H", "ET", "BT", "P", "LIVE"}
+
+
+def json_default(value: Any) -> Any:
+    """default ל-orjson / json: רשומה → to_dict() (כולל time / score / live), אחרת str"""
+    to_dict = getattr(value, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return str(value)
+
+
+def to_json(payload: Any) -> bytes:
+    """JSON מהיר (orjson אם מותקן) - bytes מוכנים ל-Response"""
+    if orjson is not None:
+        return orjson.dumps(payload, default=json_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+    return json.dumps(payload, ensure_ascii=False, default=json_default).encode("utf-8")
+
+
+def intern_str(value: Any) -> Any:
+    """sys.intern למחרוזות בלבד (None / מספרים חוזרים כמו שהם)"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _intern_fields(record: Any, names: tuple) -> None:
+    for name in names:
+        setattr(record, name, intern_str(getattr(record, name)))
+
+
+class _RecordMapping(Mapping):
+    """
+    📖 רשומה כ-Mapping לקריאה בלבד - אותם מפתחות כמו to_dict()
+
+    מפתח שהוא שדה נקרא ישירות מה-slot; מפתח מחושב (time / score / live) דרך to_dict.
+    """
+    __slots__ = ()
+
+    _FIELDS: frozenset = frozenset()
+    _KEYS: tuple = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELDS:
+            return getattr(self, key)
+        if key in self._KEYS:
+            return self.to_dict()[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def __repr__(self) -> str:
+        # כמו ה-dict שהיה כאן קודם (לוגים / context שנכנס ל-prompt)
+        return repr(self.to_dict())
+
+
+# ============================================================
+# ⚽ Fixture
+# ============================================================
+
+@dataclass(slots=True, repr=False)
+class FixtureRecord(_RecordMapping):
+    """
+    📄 משחק אחד - השדות מ-/fixtures בלבד (time / score / live מחושבים ב-to_dict)
+    """
+    id: Optional[int]
+    date: Optional[str]
+    timestamp: Optional[int]
+    league: str
+    league_id: Optional[int]
+    season: Optional[int]
+    league_logo: str
+    country: str
+    home_team: str
+    away_team: str
+    home_id: Optional[int]
+    away_id: Optional[int]
+    home_logo: str
+    away_logo: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    minute: Any
+    status: str
+    status_long: str
+    venue: Optional[str]
+
+    # מחרוזות שחוזרות בין משחקים - עותק אחד לכולם
+    _INTERNED = (
+        "league", "league_logo", "country", "home_team", "away_team",
+        "home_logo", "away_logo", "status", "status_long", "venue"
+    )
+
+    def __post_init__(self):
+        _intern_fields(self, self._INTERNED)
+
+    @classmethod
+    def from_api(cls, match: Dict) -> "FixtureRecord":
+        """פרסור פריט אחד מ-response של /fixtures"""
+        fixture = match.get("fixture", {})
+        teams = match.get("teams", {})
+        goals = match.get("goals", {})
+        league = match.get("league", {})
+        status = fixture.get("status", {})
+        home = teams.get("home", {})
+        away = teams.get("away", {})
+
+        return cls(
+            id=fixture.get("id"),
+            date=fixture.get("date"),
+            timestamp=fixture.get("timestamp"),
+            league=league.get("name", "Unknown"),
+            league_id=league.get("id"),
+            season=league.get("season"),
+            league_logo=league.get("logo", ""),
+            country=league.get("country", ""),
+            home_team=home.get("name", "Unknown"),
+            away_team=away.get("name", "Unknown"),
+            home_id=home.get("id"),
+            away_id=away.get("id"),
+            home_logo=home.get("logo", ""),
+            away_logo=away.get("logo", ""),
+            home_score=goals.get("home"),
+            away_score=goals.get("away"),
+            minute=status.get("elapsed"),
+            status=status.get("short", "NS"),
+            status_long=status.get("long", "Not Started"),
+            venue=fixture.get("venue", {}).get("name", "Unknown")
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FixtureRecord":
+        """מה-dict של to_dict (לדוגמה ערך שחזר מה-L2)"""
+        return cls(**{name: data.get(name) for name in _FIXTURE_FIELDS})
+
+    @classmethod
+    def coerce(cls, value: Any) -> "FixtureRecord":
+        """רשומה כמו שהיא, dict (מה-L2 / mock) → from_dict"""
+        return value if isinstance(value, cls) else cls.from_dict(value)
+
+    @property
+    def day(self) -> str:
+        """YYYY-MM-DD"""
+        return (self.date or "")[:10]
+
+    @property
+    def kickoff_time(self) -> str:
+        """HH:MM (לפי ה-offset שחזר מה-API)"""
+        if not self.date:
+            return ""
+        try:
+            return datetime.fromisoformat(self.date.replace("Z", "+00:00")).strftime("%H:%M")
+        except ValueError:
+            return ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """המבנה האחיד שכל ה-endpoints מחזירים"""
+        return {
+            "id": self.id,
+            "date": self.date,
+            "timestamp": self.timestamp,
+            "time": self.kickoff_time,
+            "league": self.league,
+            "league_id": self.league_id,
+            "season": self.season,
+            "league_logo": self.league_logo,
+            "country": self.country,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "home_id": self.home_id,
+            "away_id": self.away_id,
+            "home_logo": self.home_logo,
+            "away_logo": self.away_logo,
+            "home_score": self.home_score,
+            "away_score": self.away_score,
+            "score": f"{self.home_score}-{self.away_score}",
+            "minute": self.minute,
+            "status": self.status,
+            "status_long": self.status_long,
+            "venue": self.venue,
+            "live": self.status in LIVE_STATUSES
+        }
+
+    def to_json(self) -> bytes:
+        return to_json(self.to_dict())
+
+
+_FIXTURE_FIELDS = tuple(field.name for field in fields(FixtureRecord))
+FixtureRecord._FIELDS = frozenset(_FIXTURE_FIELDS)
+FixtureRecord._KEYS = (
+    "id", "date", "timestamp", "time", "league", "league_id", "season", "league_logo", "country",
+    "home_team", "away_team", "home_id", "away_id", "home_logo", "away_logo",
+    "home_score", "away_score", "score", "minute", "status", "status_long", "venue", "live"
+)
+
+
+# ============================================================
+# 📊 Standing
+# ============================================================
+
+@dataclass(slots=True, repr=False)
+class StandingRecord(_RecordMapping):
+    """
+    📊 שורה אחת בטבלת הדירוג (/standings)
+    """
+    rank: Optional[int]
+    team: Optional[str]
+    logo: Optional[str]
+    points: Optional[int]
+    played: int
+    win: int
+    draw: int
+    lose: int
+    goals_for: int
+    goals_against: int
+    goal_diff: int
+    form: str
+
+    _INTERNED = ("team", "logo", "form")
+
+    def __post_init__(self):
+        _intern_fields(self, self._INTERNED)
+
+    @classmethod
+    def from_api(cls, row: Dict) -> "StandingRecord":
+        """פרסור שורה אחת מ-league.standings[0]"""
+        team = row.get("team", {})
+        all_stats = row.get("all", {})
+        goals = all_stats.get("goals", {})
+
+        return cls(
+            rank=row.get("rank"),
+            team=team.get("name"),
+            logo=team.get("logo"),
+            points=row.get("points"),
+            played=all_stats.get("played", 0),
+            win=all_stats.get("win", 0),
+            draw=all_stats.get("draw", 0),
+            lose=all_stats.get("lose", 0),
+            goals_for=goals.get("for", 0),
+            goals_against=goals.get("against", 0),
+            goal_diff=row.get("goalsDiff", 0),
+            form=row.get("form", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in _STANDING_FIELDS}
+
+    def to_json(self) -> bytes:
+        return to_json(self.to_dict())
+
+
+_STANDING_FIELDS = tuple(field.name for field in fields(StandingRecord))
+StandingRecord._FIELDS = frozenset(_STANDING_FIELDS)
+StandingRecord._KEYS = _STANDING_FIELDS
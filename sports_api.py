@@ -7,11 +7,38 @@ import os
 import httpx
 import logging
 import random
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from urllib.parse import urlencode
 import asyncio
+import time
 from dotenv import load_dotenv
 
+try:
+    from http_client import RetryPolicy, http_client, parse_retry_after
+except ImportError:
+    from backend.http_client import RetryPolicy, http_client, parse_retry_after
+
+try:
+    from cache_manager import SingleFlight, cache_manager, CacheTTL, make_key, make_tag
+except ImportError:
+    from backend.cache_manager import SingleFlight, cache_manager, CacheTTL, make_key, make_tag
+
+try:
+    from api_budget_tracker import api_budget_tracker, EndpointType
+    from api_replay import ResponseRecorder
+    from fixture_index import FixtureIndex, fixtures_store
+    from match_aggregates import FixtureHistory, h2h_summary, orient_h2h
+    from records import FixtureRecord, StandingRecord
+    from team_index import team_index
+except ImportError:
+    from backend.api_budget_tracker import api_budget_tracker, EndpointType
+    from backend.api_replay import ResponseRecorder
+    from backend.fixture_index import FixtureIndex, fixtures_store
+    from backend.match_aggregates import FixtureHistory, h2h_summary, orient_h2h
+    from backend.records import FixtureRecord, StandingRecord
+    from backend.team_index import team_index
+
 
 # טען את קובץ .env
 load_dotenv()
@@ -24,13 +51,90 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ⏱️ מדיניות Cache לכל endpoint: (ttl, stale_ttl) - מקור אחד לכל המערכת
+# (prediction_context_fetcher משתמש באותם מפתחות, כך שאין עותק כפול)
+CACHE_POLICY: Dict[str, Tuple[int, int]] = {
+    "live": (CacheTTL.LIVE_MATCH, CacheTTL.stale_window(CacheTTL.LIVE_MATCH)),
+    "fixtures": (CacheTTL.MATCH_DETAILS, CacheTTL.stale_window(CacheTTL.MATCH_DETAILS)),
+    "standings": (CacheTTL.STANDINGS, CacheTTL.stale_window(CacheTTL.STANDINGS)),
+    "top_scorers": (CacheTTL.STANDINGS, CacheTTL.stale_window(CacheTTL.STANDINGS)),
+    "team_stats": (CacheTTL.LAST_5_MATCHES, CacheTTL.stale_window(CacheTTL.LAST_5_MATCHES)),
+    "team_last": (CacheTTL.LAST_5_MATCHES, CacheTTL.stale_window(CacheTTL.LAST_5_MATCHES)),
+    "h2h": (CacheTTL.H2H, CacheTTL.stale_window(CacheTTL.H2H)),
+    "leagues": (CacheTTL.H2H, CacheTTL.stale_window(CacheTTL.H2H)),  # 24h
+    "teams": (CacheTTL.STATIC, CacheTTL.stale_window(CacheTTL.STATIC)),  # סגל ליגה כמעט לא משתנה
+}
+
+
+def current_season(now: Optional[datetime] = None) -> int:
+    """
+    📅 העונה הנוכחית לפי API-Sports
+
+    עונת כדורגל Aug 2025 - May 2026 היא "season 2025":
+    Aug-Dec → השנה הנוכחית, Jan-Jul → השנה הקודמת.
+    """
+    now = now or datetime.now()
+    return now.year if now.month >= 8 else now.year - 1
+
+
+# 🔑 Key builders - אותם מפתחות בכל מקום שקורא לנתונים האלה ("namespace:part:part")
+def live_matches_key(league_id: Optional[int] = None) -> str:
+    return make_key("live", league_id or "all")
+
+
+def fixtures_key(date: str, league_id: Optional[int] = None) -> str:
+    return make_key("fixtures", date, league_id or "all")
+
+
+def standings_key(league_id: int, season: Optional[int] = None) -> str:
+    return make_key("standings", league_id, season or current_season())
+
+
+def top_scorers_key(league_id: int, season: Optional[int] = None) -> str:
+    return make_key("top_scorers", league_id, season or current_season())
+
+
+def team_stats_key(team_id: Any, league_id: int, season: Optional[int] = None) -> str:
+    return make_key("team_stats", team_id, league_id, season or current_season())
+
+
+def team_last_key(team_id: Any, limit: int = 5) -> str:
+    return make_key("team_last", team_id, limit)
+
+
+def h2h_key(team1_id: Any, team2_id: Any) -> str:
+    first, second = sorted((team1_id, team2_id), key=str)
+    return make_key("h2h", first, second)
+
+
+def leagues_key() -> str:
+    return make_key("leagues", "current")
+
+
+def teams_key(league_id: int, season: Optional[int] = None) -> str:
+    return make_key("teams", league_id, season or current_season())
+
+
+# 🏷️ Tags - לביטול קבוצתי (משחק הסתיים → טבלה, פורמה ו-H2H של הקבוצות)
+def league_tag(league_id: Any) -> str:
+    return make_tag("league", league_id)
+
+
+def team_tag(team_id: Any) -> str:
+    return make_tag("team", team_id)
+
+
+def fixture_tag(fixture_id: Any) -> str:
+    return make_tag("fixture", fixture_id)
+
+
 class SportsAPIManager:
     """
     🏆 מנהל API מתקדם לנתוני ספורט בזמן אמת
 
     Features:
     ✅ Async/await for high performance
-    ✅ Smart caching with TTL
+    ✅ Smart caching - דרך cache_manager עם TTL לכל endpoint (CACHE_POLICY)
     ✅ Rate limiting protection
     ✅ Retry mechanism with exponential backoff
     ✅ Comprehensive error handling
@@ -61,6 +165,12 @@ class SportsAPIManager:
                 "x-apisports-key": api_key
             }
 
+        # הפניה לשרת אחר (לדוגמה שרת ה-replay של api_replay.py לבדיקות עומס)
+        base_url_override = os.getenv("API_SPORTS_BASE_URL")
+        if base_url_override:
+            self.base_url = base_url_override.rstrip("/")
+            logger.info(f"📼 API base URL overridden: {self.base_url}")
+
         if api_key == "DEMO_KEY":
             logger.warning("⚠️ Using DEMO_KEY - API calls will use mock data!")
         else:
@@ -68,114 +178,228 @@ class SportsAPIManager:
 
         self.api_key = api_key
 
-        # Cache configuration
-        self.cache: Dict[str, tuple] = {}
-        self.cache_duration = 30  # seconds for live data
-        self.standings_cache_duration = 300  # 5 minutes
+        # Cache - משותף (cache_manager), מדיניות TTL לפי endpoint
+        self.cache = cache_manager
+        self.cache_policy = CACHE_POLICY
+
+        # Rate limiting - מכסה יומית + token bucket לדקה, מסונכרנים מכותרות x-ratelimit-*
+        self.budget = api_budget_tracker
 
-        # Rate limiting
-        self.request_count = 0
-        self.max_requests_per_day = 100
-        self.last_reset = datetime.now()
+        # Retry - backoff אקספוננציאלי עם jitter, deadline כולל לקריאה
+        # (+ circuit breaker ל-host ב-http_client)
+        self.retry_policy = RetryPolicy(
+            max_attempts=int(os.getenv("API_MAX_ATTEMPTS", "3")),
+            deadline=float(os.getenv("API_REQUEST_DEADLINE", "15"))
+        )
 
-        # Retry configuration
-        self.max_retries = 3
-        self.retry_delay = 1  # seconds
+        # הקלטת תשובות אמיתיות לדיסק (API_RECORD_DIR) - לשרת ה-replay
+        record_dir = os.getenv("API_RECORD_DIR")
+        self.recorder = ResponseRecorder(record_dir) if record_dir else None
 
-        logger.info("🚀 SportsAPIManager initialized successfully!")
+        # Request coalescing - בקשות זהות מקבילות חולקות קריאה אחת
+        self._flights = SingleFlight()
 
-    def _check_rate_limit(self) -> bool:
-        """בדוק האם ניתן לבצע בקשה (7500/יום)"""
-        # Reset counter daily
-        if (datetime.now() - self.last_reset).days >= 1:
-            self.request_count = 0
-            self.last_reset = datetime.now()
-            logger.info("🔄 Rate limit counter reset")
+        # טבלת משחקים מאונדקסת (תאריך / ליגה / קבוצה) + חיפוש לפי קבוצות
+        self.fixture_index = FixtureIndex(load_day=self._fetch_fixtures, store=fixtures_store)
 
-        if self.request_count >= self.max_requests_per_day:
-            logger.warning(f"🚫 Rate limit reached: {self.request_count}/{self.max_requests_per_day}")
-            return False
+        # רשימות משחקים ב-Cache הן FixtureRecord (אותם מופעים כמו בטבלה) - גם אחרי הלוך-חזור ל-L2
+        for namespace in ("fixtures", "live", "team_last"):
+            self.cache.register_decoder(namespace, self._as_records)
 
-        self.request_count += 1
-        return True
+        # שם קבוצה → מזהה (מתעדכן מכל טבלה / סגל / משחקים שנטענים)
+        self.team_index = team_index
 
-    def _get_from_cache(self, key: str, max_age: int) -> Optional[List[Dict]]:
-        """קבל נתונים מה-cache אם הם עדיין רלוונטיים"""
-        if key in self.cache:
-            cached_time, cached_data = self.cache[key]
-            age_seconds = (datetime.now() - cached_time).total_seconds()
+        logger.info("🚀 SportsAPIManager initialized successfully!")
 
-            if age_seconds < max_age:
-                logger.debug(f"💨 Cache HIT: {key} (age: {age_seconds:.1f}s)")
-                return cached_data
+    @staticmethod
+    def _endpoint_type(url: str, params: Optional[Dict] = None) -> EndpointType:
+        """סוג ה-endpoint לפי ה-path (לפירוט התקציב)"""
+        path = url.rstrip("/")
+        if path.endswith("/fixtures/headtohead"):
+            return EndpointType.H2H
+        if path.endswith("/fixtures"):
+            return EndpointType.LIVE if (params or {}).get("live") else EndpointType.FIXTURES
+        if path.endswith("/standings"):
+            return EndpointType.STANDINGS
+        if path.endswith("/teams/statistics"):
+            return EndpointType.STATISTICS
+        if path.endswith("/teams"):
+            return EndpointType.TEAMS
+        return EndpointType.OTHER
+
+    async def _cached(
+            self,
+            endpoint: str,
+            cache_key: str,
+            loader: Callable[[], Awaitable[Any]],
+            tags: Tuple[str, ...] = ()
+    ) -> Any:
+        """
+        קבל מה-Cache המשותף, ואם חסר - טען דרך loader (פעם אחת, single-flight)
 
-        return None
+        loader מחזיר None בכישלון - None לא נשמר, כך שנתוני mock לא "ננעלים" ב-Cache.
+        """
+        ttl, stale_ttl = self.cache_policy[endpoint]
+        return await self.cache.get_or_load(cache_key, loader, ttl, stale_ttl=stale_ttl, tags=tags)
 
-    def _save_to_cache(self, key: str, data: List[Dict]) -> None:
-        """שמור נתונים ב-cache"""
-        self.cache[key] = (datetime.now(), data)
-        logger.debug(f"💾 Saved to cache: {key}")
+    async def invalidate_finished_fixture(
+            self,
+            league_id: Optional[int],
+            home_id: Optional[int],
+            away_id: Optional[int],
+            fixture_id: Optional[int] = None
+    ) -> int:
+        """
+        🏁 משחק הסתיים - מחק בדיוק את מה שתלוי בו
 
-        # Auto-cleanup: Keep only last 50 entries
-        if len(self.cache) > 50:
-            oldest_keys = sorted(self.cache.keys(), key=lambda k: self.cache[k][0])[:10]
-            for old_key in oldest_keys:
-                del self.cache[old_key]
-            logger.debug(f"🧹 Cleaned {len(oldest_keys)} old cache entries")
+        טבלה ומלכי שערים של הליגה, סטטיסטיקות, פורמה ו-H2H של שתי הקבוצות,
+        וכל מה שמסומן במשחק עצמו. שאר ה-Cache לא נוגע.
+
+        Returns:
+            מספר הערכים שנמחקו
+        """
+        tags = []
+        if league_id is not None:
+            tags.append(league_tag(league_id))
+        for team_id in (home_id, away_id):
+            if team_id is not None:
+                tags.append(team_tag(team_id))
+        if fixture_id is not None:
+            tags.append(fixture_tag(fixture_id))
+        return await self.cache.invalidate_tags(tags)
+
+    def is_cached(self, cache_key: str) -> bool:
+        """האם המפתח נמצא כרגע ב-Cache ועוד בתוקף (בלי לספור hit/miss)"""
+        return self.cache.contains(cache_key)
 
     async def _make_request_with_retry(
             self,
             url: str,
             params: Dict = None
     ) -> Optional[Dict]:
-        """בצע בקשה ל-API עם retry mechanism"""
+        """
+        בצע בקשה ל-API עם retry mechanism
 
-        # Check rate limit first
-        if not self._check_rate_limit():
-            logger.warning("Rate limit exceeded, skipping API call")
-            return None
+        בקשות זהות (url + params) שרצות במקביל מאוחדות לקריאה אחת (single-flight),
+        כך שגל של MISS-ים על אותו מפתח עולה קריאת API אחת בלבד.
+        """
+        flight_key = f"{url}?{urlencode(sorted((params or {}).items()))}"
+        return await self._flights.do(flight_key, lambda: self._request_with_retry(url, params))
+
+    async def _request_with_retry(
+            self,
+            url: str,
+            params: Dict = None
+    ) -> Optional[Dict]:
+        """בקשה בודדת ל-API (כולל retries) - נקראת רק דרך _make_request_with_retry"""
 
         # Demo mode - skip API call
         if self.api_key == "DEMO_KEY":
             logger.info("Demo mode - using mock data")
             return None
 
-        for attempt in range(self.max_retries):
-            try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    response = await client.get(url, params=params, headers=self.headers)
+        # upstream שנפל - נכשלים מיד; ה-Cache (stale) וה-fallback מגישים במקומו
+        breaker = http_client.breaker_for(url)
+        if not breaker.allow():
+            logger.warning(f"🔌 Circuit open for {breaker.host} - skipping API call ({breaker.retry_in():.0f}s)")
+            return None
 
-                    if response.status_code == 200:
-                        logger.info(f"✅ API request successful: {url}")
-                        return response.json()
+        # client משותף עם keep-alive - retry לא פותח חיבור/TLS חדש
+        client = http_client.client
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        endpoint = self._endpoint_type(url, params)
+
+        for attempt in range(policy.max_attempts):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            retry_after = None
+
+            # כל ניסיון עולה קריאה - ממתינים לטוקן מקומית במקום 429 מה-upstream
+            if not await self.budget.acquire(endpoint, max_wait=remaining):
+                logger.warning(f"🚫 API budget exhausted - skipping {url}")
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
 
-                    elif response.status_code == 429:
-                        logger.error("🚫 API rate limit exceeded")
+            try:
+                response = await client.get(
+                    url, params=params, headers=self.headers,
+                    timeout=min(policy.attempt_timeout, remaining)
+                )
+                await self.budget.record_call(endpoint)
+                self.budget.update_from_headers(response.headers)
+
+                if response.status_code == 200:
+                    breaker.record_success()
+                    logger.info(f"✅ API request successful: {url}")
+                    data = response.json()
+                    if self.recorder is not None:
+                        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+                        await asyncio.to_thread(
+                            self.recorder.record, path, params, response.status_code, response.headers, data
+                        )
+                    return data
+
+                if response.status_code in (429, 503):
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    logger.warning(f"🚫 API returned {response.status_code} (Retry-After: {retry_after})")
+                    if retry_after is not None and retry_after > deadline - time.monotonic():
+                        # לא נספיק לחכות - לא מציפים את ה-upstream עד שיפתח
+                        breaker.trip(retry_after)
                         return None
+                    breaker.record_failure()
 
-                    else:
-                        logger.warning(f"⚠️ API returned status {response.status_code}")
-                        if attempt < self.max_retries - 1:
-                            await asyncio.sleep(self.retry_delay * (attempt + 1))
-                            continue
-                        return None
+                elif response.status_code >= 500:
+                    logger.warning(f"⚠️ API returned status {response.status_code}")
+                    breaker.record_failure()
+
+                else:
+                    # 4xx - הבקשה שגויה, retry לא יעזור (וה-host תקין)
+                    logger.warning(f"⚠️ API returned status {response.status_code}")
+                    breaker.record_success()
+                    return None
 
             except httpx.TimeoutException:
-                logger.error(f"⏱️ Request timeout (attempt {attempt + 1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                return None
+                logger.error(f"⏱️ Request timeout (attempt {attempt + 1}/{policy.max_attempts})")
+                breaker.record_failure()
 
             except Exception as e:
-                logger.error(f"❌ Request error: {e} (attempt {attempt + 1}/{self.max_retries})")
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                return None
+                logger.error(f"❌ Request error: {e} (attempt {attempt + 1}/{policy.max_attempts})")
+                breaker.record_failure()
 
+            if attempt == policy.max_attempts - 1 or breaker.state == breaker.OPEN:
+                break
+            delay = retry_after if retry_after is not None else policy.backoff(attempt)
+            if delay >= deadline - time.monotonic():
+                break
+            await asyncio.sleep(delay)
+
+        logger.error(f"❌ API request failed: {url}")
         return None
 
+    async def _iter_pages(self, url: str, params: Dict) -> AsyncIterator[List[Dict]]:
+        """
+        📄 כל הדפים של endpoint (לפי paging.total), דף אחרי דף
+
+        הדף הראשון בלי פרמטר page (endpoints בלי pagination דוחים אותו);
+        דף שנכשל עוצר את הזרם - מה שכבר התקבל נשאר.
+        """
+        data = await self._make_request_with_retry(url, params=params)
+        if not data or data.get("response") is None:
+            return
+        yield data["response"]
+
+        total_pages = (data.get("paging") or {}).get("total") or 1
+        for page in range(2, total_pages + 1):
+            data = await self._make_request_with_retry(url, params={**params, "page": page})
+            if not data or not data.get("response"):
+                logger.warning(f"⚠️ Pagination stopped at page {page}/{total_pages} for {url}")
+                return
+            yield data["response"]
+
     async def get_live_matches(self, league_id: Optional[int] = None) -> List[Dict]:
         """
         🔴 קבל משחקים חיים כרגע
@@ -186,33 +410,53 @@ class SportsAPIManager:
         Returns:
             List[Dict]: רשימת משחקים חיים
         """
-        cache_key = f"live_matches_{league_id or 'all'}"
-
-        # Check cache
-        cached_data = self._get_from_cache(cache_key, self.cache_duration)
-        if cached_data:
-            return cached_data
-
-        # Make API request
-        params = {"live": "all"}
-        if league_id:
-            params["league"] = league_id
-
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/fixtures",
-            params=params
-        )
-
-        if data and data.get("response"):
+        async def load():
+            params = {"live": "all"}
+            if league_id:
+                params["league"] = league_id
+
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/fixtures",
+                params=params
+            )
+
+            if data is None or "response" not in data:
+                return None  # כישלון - לא נשמר ב-Cache (אין משחקים חיים = [] ונשמר)
             matches = self._parse_matches(data["response"])
-            self._save_to_cache(cache_key, matches)
             logger.info(f"✅ Fetched {len(matches)} live matches from API")
             return matches
 
+        tags = (league_tag(league_id),) if league_id else ()
+        matches = await self._cached("live", live_matches_key(league_id), load, tags)
+        if matches is not None:
+            return matches
+
         # Fallback to mock data
         logger.info("Using mock data for live matches")
         return self._get_mock_live_matches()
 
+    async def refresh_live_matches(self) -> Optional[List[Dict]]:
+        """
+        🔴 משוך את כל המשחקים החיים מה-API (עוקף את ה-Cache) ושמור ב-Cache
+
+        בשביל LiveScorePoller - קריאה אחת לכל interval, וכל מי שקורא
+        get_live_matches() מקבל את אותה תוצאה מה-Cache.
+
+        Returns:
+            רשימת משחקים ([] = אין משחקים חיים), או None בכישלון (בלי mock)
+        """
+        data = await self._make_request_with_retry(
+            f"{self.base_url}/fixtures",
+            params={"live": "all"}
+        )
+        if data is None or "response" not in data:
+            return None
+
+        matches = self._parse_matches(data["response"]) if data["response"] else []
+        ttl, stale_ttl = self.cache_policy["live"]
+        await self.cache.set(live_matches_key(), matches, ttl, stale_ttl=stale_ttl)
+        return matches
+
     async def get_league_standings(self, league_id: int = 271, season: Optional[int] = None) -> List[Dict]:
         """
         📊 קבל טבלת דירוג ליגה
@@ -225,35 +469,26 @@ class SportsAPIManager:
             List[Dict]: טבלת דירוג
         """
         # ✅ Football seasons: Aug 2025 - May 2026 is "season 2025"
-        # Current date: 27/01/2026 → We're in season 2025!
-        now = datetime.now()
-        if season:
-            current_year = season
-        elif now.month >= 8:
-            # Aug-Dec → current year's season (Aug 2026 → season 2026)
-            current_year = now.year
-        else:
-            # Jan-Jul → previous year's season (Jan 2026 → season 2025)
-            current_year = now.year - 1
-
-        cache_key = f"standings_{league_id}_{current_year}"
-
-        # Check cache
-        cached_data = self._get_from_cache(cache_key, self.standings_cache_duration)
-        if cached_data:
-            return cached_data
+        current_year = season or current_season()
+
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/standings",
+                params={"league": league_id, "season": current_year}
+            )
+
+            if data and data.get("response") and len(data["response"]) > 0:
+                # ✅ החזר את הנתונים האמיתיים ישירות מ-API!
+                logger.info(f"✅ Fetched REAL standings for league {league_id} - {len(data['response'])} results")
+                self.team_index.add_standings(data["response"], league_id)
+                return data["response"]
+            return None
 
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/standings",
-            params={"league": league_id, "season": current_year}
+        standings = await self._cached(
+            "standings", standings_key(league_id, current_year), load, (league_tag(league_id),)
         )
-
-        if data and data.get("response") and len(data["response"]) > 0:
-            # ✅ החזר את הנתונים האמיתיים ישירות מ-API!
-            logger.info(f"✅ Fetched REAL standings for league {league_id} - {len(data['response'])} results")
-            self._save_to_cache(cache_key, data["response"])
-            return data["response"]
+        if standings:
+            return standings
 
         # Fallback to mock data ONLY if API failed
         logger.warning(f"⚠️ API returned no data for league {league_id}, using mock data")
@@ -275,33 +510,55 @@ class SportsAPIManager:
             List[Dict]: רשימת משחקים
         """
         target_date = date or datetime.now().strftime("%Y-%m-%d")
-        cache_key = f"fixtures_{target_date}_{league_id or 'all'}"
 
-        # Check cache
-        cached_data = self._get_from_cache(cache_key, 3600)  # 1 hour
-        if cached_data:
-            return cached_data
+        # כל היום כבר בטבלה - קוראים מ-FixturesStore (ליגה אחת = סינון באינדקס),
+        # בלי Cache ובלי קריאת API נוספת
+        if self.fixture_index.is_fresh(target_date):
+            return self.fixture_index.fixtures_on(target_date, league_id)
 
-        # Make API request
-        params = {"date": target_date}
-        if league_id:
-            params["league"] = league_id
-
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/fixtures",
-            params=params
-        )
-
-        if data and data.get("response"):
-            fixtures = self._parse_matches(data["response"])
-            self._save_to_cache(cache_key, fixtures)
-            logger.info(f"✅ Fetched {len(fixtures)} fixtures for {target_date}")
-            return fixtures
+        fixtures = await self._fetch_fixtures(target_date, league_id)
+        if fixtures is not None:
+            return fixtures  # [] = יום אמיתי בלי משחקים, לא mock
 
         # Fallback
         logger.info("Using mock data for fixtures")
         return self._get_mock_live_matches()
 
+    async def _fetch_fixtures(self, date: str, league_id: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        משחקים של תאריך מה-API / Cache, בלי mock fallback (None = כישלון)
+
+        כל הדפים, כל המשחקים (בלי חיתוך), ויום מלא נכנס ל-FixturesStore.
+        """
+
+        async def load():
+            params = {"date": date}
+            if league_id:
+                params["league"] = league_id
+
+            records: List[FixtureRecord] = []
+            pages = 0
+            async for page in self._iter_pages(f"{self.base_url}/fixtures", params):
+                records.extend(self._parse_records(page))
+                pages += 1
+
+            if not pages:
+                return None  # כישלון - לא נשמר ב-Cache (יום בלי משחקים = [] ונשמר)
+            # ה-Cache שומר את הרשומות עצמן - אותם מופעים כמו ב-FixturesStore, בלי עותק dict
+            records = self.fixture_index.store.canonical(records)
+            logger.info(f"✅ Fetched {len(records)} fixtures for {date}")
+            self.team_index.add_fixtures(records)
+            if not league_id:
+                # גם רענון SWR ברקע עובר כאן - הטבלה מתעדכנת מיד, לא אחרי refresh_seconds
+                self.fixture_index.ingest(date, records)
+            return records
+
+        tags = (league_tag(league_id),) if league_id else ()
+        fixtures = await self._cached("fixtures", fixtures_key(date, league_id), load, tags)
+        if fixtures is not None and not league_id:
+            self.fixture_index.observe(date, fixtures)  # ערך מה-Cache (L2 / worker אחר)
+        return fixtures
+
     async def find_match_by_teams(
             self,
             home_team: str,
@@ -311,6 +568,9 @@ class SportsAPIManager:
         """
         🔍 חיפוש משחק לפי שמות קבוצות
 
+        דרך FixtureIndex: תאריכים חסרים בטווח נטענים במקביל (פעם אחת),
+        והחיפוש עצמו הוא dict hit על שמות מנורמלים.
+
         Args:
             home_team: שם קבוצת הבית
             away_team: שם הקבוצה האורחת
@@ -320,22 +580,13 @@ class SportsAPIManager:
             Dict: נתוני המשחק אם נמצא, None אם לא
         """
         try:
-            # חיפוש במספר ימים (היום ± days_range)
-            from datetime import timedelta
-            today = datetime.now()
-
-            for day_offset in range(-days_range, days_range + 1):
-                search_date = (today + timedelta(days=day_offset)).strftime("%Y-%m-%d")
-                fixtures = await self.get_fixtures_by_date(date=search_date)
-
-                # חיפוש התאמה בשמות הקבוצות (case-insensitive, חלקי)
-                for fixture in fixtures:
-                    home_match = home_team.lower() in fixture.get("home_team", "").lower()
-                    away_match = away_team.lower() in fixture.get("away_team", "").lower()
-
-                    if home_match and away_match:
-                        logger.info(f"✅ Found match: {fixture.get('home_team')} vs {fixture.get('away_team')} on {search_date}")
-                        return fixture
+            fixture = await self.fixture_index.find(home_team, away_team, days_range=days_range)
+            if fixture:
+                logger.info(
+                    f"✅ Found match: {fixture.get('home_team')} vs {fixture.get('away_team')} "
+                    f"on {(fixture.get('date') or '')[:10]}"
+                )
+                return fixture
 
             logger.info(f"⚠️ No match found for {home_team} vs {away_team}")
             return None
@@ -344,57 +595,74 @@ class SportsAPIManager:
             logger.error(f"❌ Error finding match: {e}")
             return None
 
-    def _parse_matches(self, matches_data: List[Dict]) -> List[Dict]:
-        """המר נתוני API למבנה אחיד"""
-        parsed = []
+    async def get_teams(self, league_id: int, season: Optional[int] = None) -> List[Dict]:
+        """
+        👥 קבל את כל הקבוצות בליגה (/teams) - גם מעדכן את team_index
 
-        for match in matches_data[:20]:  # Top 20
-            try:
-                fixture = match.get("fixture", {})
-                teams = match.get("teams", {})
-                goals = match.get("goals", {})
-                league = match.get("league", {})
-
-                # Format time nicely
-                time_str = ""
-                if fixture.get("date"):
-                    try:
-                        from datetime import datetime
-                        match_time = datetime.fromisoformat(fixture.get("date").replace("Z", "+00:00"))
-                        time_str = match_time.strftime("%H:%M")
-                    except:
-                        time_str = ""
-
-                parsed.append({
-                    "id": fixture.get("id"),
-                    "date": fixture.get("date"),
-                    "timestamp": fixture.get("timestamp"),
-                    "time": time_str,
-                    "league": league.get("name", "Unknown"),
-                    "league_logo": league.get("logo", ""),
-                    "country": league.get("country", ""),
-                    "home_team": teams.get("home", {}).get("name", "Unknown"),
-                    "away_team": teams.get("away", {}).get("name", "Unknown"),
-                    "home_logo": teams.get("home", {}).get("logo", ""),
-                    "away_logo": teams.get("away", {}).get("logo", ""),
-                    "home_score": goals.get("home"),
-                    "away_score": goals.get("away"),
-                    "score": f"{goals.get('home', 0)}-{goals.get('away', 0)}",
-                    "minute": fixture.get("status", {}).get("elapsed"),
-                    "status": fixture.get("status", {}).get("short", "NS"),
-                    "status_long": fixture.get("status", {}).get("long", "Not Started"),
-                    "venue": fixture.get("venue", {}).get("name", "Unknown"),
-                    "live": fixture.get("status", {}).get("short") in ["1H", "HT", "2H", "ET", "BT", "P", "LIVE"]
-                })
+        Args:
+            league_id: מזהה ליגה
+            season: עונה (None = השנה הנוכחית)
+
+        Returns:
+            List[Dict]: [{"team": {...}, "venue": {...}}]
+        """
+        current_year = season or current_season()
+
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/teams",
+                params={"league": league_id, "season": current_year}
+            )
+
+            if data and data.get("response"):
+                logger.info(f"✅ Fetched {len(data['response'])} teams for league {league_id}")
+                self.team_index.add_teams(data["response"], league_id)
+                return data["response"]
+            return None
+
+        return await self._cached("teams", teams_key(league_id, current_year), load) or []
+
+    async def resolve_team_id(self, team_name: str, league_id: Optional[int] = None) -> Optional[int]:
+        """
+        🆔 שם קבוצה → מזהה API-Sports
 
+        סדר: שם / כינוי מדויק ב-team_index (dict hit, בלי רשת) → סגל הליגה
+        (/teams, נשמר ב-Cache לשבוע) ושוב התאמה מדויקת → רק אז התאמה עמומה.
+        כך שגיאת כתיב לא "תופסת" קבוצה אחרת לפני שהשם האמיתי נטען מה-API.
+        """
+        team_id = self.team_index.resolve(team_name, league_id, fuzzy=False)
+        if team_id is None and league_id:
+            await self.get_teams(league_id)
+            team_id = self.team_index.resolve(team_name, league_id, fuzzy=False)
+        if team_id is None:
+            team_id = self.team_index.resolve(team_name, league_id)
+        return team_id
+
+    def _parse_records(self, matches_data: List[Dict]) -> List[FixtureRecord]:
+        """המר נתוני API ל-FixtureRecord (כל המשחקים; פריט פגום מדולג)"""
+        records = []
+        for match in matches_data:
+            try:
+                records.append(FixtureRecord.from_api(match))
             except Exception as e:
                 logger.error(f"❌ Error parsing match: {e}")
-                continue
+        return records
+
+    def _parse_matches(self, matches_data: List[Dict]) -> List[FixtureRecord]:
+        """
+        המר נתוני API לרשומות (רשימה ריקה אם אין משחקים - בלי mock)
+
+        FixtureRecord נקרא כמו dict (match["home_team"], match.get("status")),
+        ומשחק שכבר בטבלה ולא השתנה חוזר כמופע מהטבלה.
+        """
+        return self.fixture_index.store.canonical(self._parse_records(matches_data))
 
-        return parsed if parsed else self._get_mock_live_matches()
+    def _as_records(self, matches: List[Any]) -> List[FixtureRecord]:
+        """רשימת משחקים מה-L2 (dicts) → FixtureRecord (interning מחדש, מופעים מהטבלה)"""
+        return self.fixture_index.store.canonical(FixtureRecord.coerce(match) for match in matches)
 
     def _parse_standings(self, standings_data: List[Dict]) -> List[Dict]:
-        """המר טבלת דירוג למבנה נקי"""
+        """המר טבלת דירוג ל-StandingRecord (נקרא כמו dict; to_dict רק בקצה)"""
         parsed = []
 
         try:
@@ -405,22 +673,7 @@ class SportsAPIManager:
             standings = league_data.get("standings", [[]])[0]
 
             for team in standings[:20]:
-                all_stats = team.get("all", {})
-
-                parsed.append({
-                    "rank": team.get("rank"),
-                    "team": team.get("team", {}).get("name"),
-                    "logo": team.get("team", {}).get("logo"),
-                    "points": team.get("points"),
-                    "played": all_stats.get("played", 0),
-                    "win": all_stats.get("win", 0),
-                    "draw": all_stats.get("draw", 0),
-                    "lose": all_stats.get("lose", 0),
-                    "goals_for": all_stats.get("goals", {}).get("for", 0),
-                    "goals_against": all_stats.get("goals", {}).get("against", 0),
-                    "goal_diff": team.get("goalsDiff", 0),
-                    "form": team.get("form", "")
-                })
+                parsed.append(StandingRecord.from_api(team))
 
         except Exception as e:
             logger.error(f"❌ Error parsing standings: {e}")
@@ -515,20 +768,15 @@ class SportsAPIManager:
         Returns:
             List[Dict]: רשימת ליגות עם מזהים
         """
-        cache_key = "available_leagues"
-
-        # Check cache (24 hours)
-        cached_data = self._get_from_cache(cache_key, 86400)
-        if cached_data:
-            return cached_data
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/leagues",
+                params={"current": "true"}
+            )
 
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/leagues",
-            params={"current": "true"}
-        )
+            if not (data and data.get("response")):
+                return None
 
-        if data and data.get("response"):
             leagues = []
             for item in data["response"][:50]:  # Top 50 active leagues
                 league_data = item.get("league", {})
@@ -544,10 +792,13 @@ class SportsAPIManager:
                     "country_flag": country_data.get("flag")
                 })
 
-            self._save_to_cache(cache_key, leagues)
             logger.info(f"✅ Fetched {len(leagues)} leagues from API")
             return leagues
 
+        leagues = await self._cached("leagues", leagues_key(), load)
+        if leagues:
+            return leagues
+
         # Fallback
         logger.info("Using fallback league list")
         return self._get_fallback_leagues()
@@ -569,32 +820,28 @@ class SportsAPIManager:
         Returns:
             Dict: סטטיסטיקות מפורטות
         """
-        current_year = season or datetime.now().year
-        cache_key = f"team_stats_{team_id}_{league_id}_{current_year}"
-
-        # Check cache (1 hour)
-        cached_data = self._get_from_cache(cache_key, 3600)
-        if cached_data:
-            return cached_data
+        current_year = season or current_season()
+
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/teams/statistics",
+                params={
+                    "team": team_id,
+                    "league": league_id,
+                    "season": current_year
+                }
+            )
+
+            if data and data.get("response"):
+                logger.info(f"✅ Fetched team statistics for team {team_id}")
+                return data["response"]
+            return None
 
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/teams/statistics",
-            params={
-                "team": team_id,
-                "league": league_id,
-                "season": current_year
-            }
+        return await self._cached(
+            "team_stats", team_stats_key(team_id, league_id, current_year), load,
+            (team_tag(team_id), league_tag(league_id))
         )
 
-        if data and data.get("response"):
-            stats = data["response"]
-            self._save_to_cache(cache_key, stats)
-            logger.info(f"✅ Fetched team statistics for team {team_id}")
-            return stats
-
-        return None
-
     async def get_top_scorers(
             self,
             league_id: int,
@@ -610,21 +857,17 @@ class SportsAPIManager:
         Returns:
             List[Dict]: רשימת שחקנים מובילים
         """
-        current_year = season or datetime.now().year
-        cache_key = f"top_scorers_{league_id}_{current_year}"
+        current_year = season or current_season()
 
-        # Check cache (6 hours)
-        cached_data = self._get_from_cache(cache_key, 21600)
-        if cached_data:
-            return cached_data
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/players/topscorers",
+                params={"league": league_id, "season": current_year}
+            )
 
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/players/topscorers",
-            params={"league": league_id, "season": current_year}
-        )
+            if not (data and data.get("response")):
+                return None
 
-        if data and data.get("response"):
             scorers = []
             for item in data["response"][:20]:  # Top 20
                 player = item.get("player", {})
@@ -645,10 +888,15 @@ class SportsAPIManager:
                     "minutes": statistics.get("games", {}).get("minutes", 0)
                 })
 
-            self._save_to_cache(cache_key, scorers)
             logger.info(f"✅ Fetched {len(scorers)} top scorers")
             return scorers
 
+        scorers = await self._cached(
+            "top_scorers", top_scorers_key(league_id, current_year), load, (league_tag(league_id),)
+        )
+        if scorers:
+            return scorers
+
         # Fallback
         return self._get_mock_top_scorers()
 
@@ -667,69 +915,27 @@ class SportsAPIManager:
         Returns:
             Dict: סטטיסטיקות מפגשים ישירים
         """
-        cache_key = f"h2h_{min(team1_id, team2_id)}_{max(team1_id, team2_id)}"
-
-        # Check cache (24 hours)
-        cached_data = self._get_from_cache(cache_key, 86400)
-        if cached_data:
-            return cached_data
-
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/fixtures/headtohead",
-            params={"h2h": f"{team1_id}-{team2_id}"}
-        )
-
-        if data and data.get("response"):
-            h2h_data = {
-                "total_matches": len(data["response"]),
-                "team1_wins": 0,
-                "team2_wins": 0,
-                "draws": 0,
-                "last_5_matches": [],
-                "total_goals_team1": 0,
-                "total_goals_team2": 0
-            }
-
-            for match in data["response"][:10]:  # Last 10 matches
-                fixture = match.get("fixture", {})
-                teams = match.get("teams", {})
-                goals = match.get("goals", {})
-
-                home_id = teams.get("home", {}).get("id")
-                home_goals = goals.get("home", 0)
-                away_goals = goals.get("away", 0)
-
-                # Count wins
-                if home_goals > away_goals:
-                    if home_id == team1_id:
-                        h2h_data["team1_wins"] += 1
-                    else:
-                        h2h_data["team2_wins"] += 1
-                elif away_goals > home_goals:
-                    if home_id == team1_id:
-                        h2h_data["team2_wins"] += 1
-                    else:
-                        h2h_data["team1_wins"] += 1
-                else:
-                    h2h_data["draws"] += 1
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/fixtures/headtohead",
+                params={"h2h": f"{team1_id}-{team2_id}"}
+            )
 
-                # Add to last 5
-                if len(h2h_data["last_5_matches"]) < 5:
-                    h2h_data["last_5_matches"].append({
-                        "date": fixture.get("date"),
-                        "home_team": teams.get("home", {}).get("name"),
-                        "away_team": teams.get("away", {}).get("name"),
-                        "score": f"{home_goals}-{away_goals}"
-                    })
+            if not (data and data.get("response")):
+                return None
 
-                h2h_data["total_goals_team1"] += home_goals if home_id == team1_id else away_goals
-                h2h_data["total_goals_team2"] += away_goals if home_id == team1_id else home_goals
+            # אגרגציה וקטורית (match_aggregates); team1 = מי שטען, orient_h2h מסובב בקריאה
+            h2h_data = h2h_summary(FixtureHistory.from_api(data["response"]), team1_id, team2_id)
 
-            self._save_to_cache(cache_key, h2h_data)
             logger.info(f"✅ Fetched H2H data")
             return h2h_data
 
+        h2h_data = await self._cached(
+            "h2h", h2h_key(team1_id, team2_id), load, (team_tag(team1_id), team_tag(team2_id))
+        )
+        if h2h_data:
+            return orient_h2h(h2h_data, team1_id)
+
         return self._get_mock_h2h()
 
     async def get_team_last_matches(
@@ -747,26 +953,21 @@ class SportsAPIManager:
         Returns:
             List[Dict]: רשימת משחקים אחרונים
         """
-        cache_key = f"team_last_{team_id}_{limit}"
-
-        # Check cache (1 hour)
-        cached_data = self._get_from_cache(cache_key, 3600)
-        if cached_data:
-            return cached_data
-
-        # Make API request
-        data = await self._make_request_with_retry(
-            f"{self.base_url}/fixtures",
-            params={"team": team_id, "last": limit, "status": "FT"}
-        )
-
-        if data and data.get("response"):
-            matches = self._parse_matches(data["response"])
-            self._save_to_cache(cache_key, matches)
-            logger.info(f"✅ Fetched last {len(matches)} matches for team {team_id}")
-            return matches
+        async def load():
+            data = await self._make_request_with_retry(
+                f"{self.base_url}/fixtures",
+                params={"team": team_id, "last": limit, "status": "FT"}
+            )
+
+            if data and data.get("response"):
+                matches = self._parse_matches(data["response"])
+                logger.info(f"✅ Fetched last {len(matches)} matches for team {team_id}")
+                return matches
+            return None
 
-        return []
+        return await self._cached(
+            "team_last", team_last_key(team_id, limit), load, (team_tag(team_id),)
+        ) or []
 
     def _get_mock_top_scorers(self) -> List[Dict]:
         """רשימת מלכי שערים מדומה"""
@@ -813,18 +1014,47 @@ class SportsAPIManager:
         Returns:
             Dict: סטטיסטיקות מפורטות
         """
+        cache_stats = self.cache.get_stats()
+        quota = self.budget.quota()
         return {
-            "cache_entries": len(self.cache),
-            "request_count": self.request_count,
-            "max_requests": self.max_requests_per_day,
-            "remaining_requests": self.max_requests_per_day - self.request_count,
+            "cache_entries": cache_stats["cache_size"],
+            "cache_hit_ratio": cache_stats["hit_ratio"],
+            "request_count": quota["calls_used"],
+            "coalesced_requests": self._flights.coalesced,
+            "max_requests": quota["daily_limit"],
+            "remaining_requests": quota["calls_remaining"],
+            "rate_limit": quota,
             "api_mode": "LIVE" if self.api_key != "DEMO_KEY" else "DEMO",
-            "last_reset": self.last_reset.isoformat()
+            "fixture_index": self.fixture_index.get_stats(),
+            "team_index": self.team_index.get_stats(),
+            "circuit_breakers": http_client.get_stats()["circuit_breakers"],
+            "recorder": self.recorder.get_stats() if self.recorder is not None else None
         }
 
 
-# יצירת מופע גלובלי
-sports_api = SportsAPIManager()
+# ============================================================================
+# מופע גלובלי - client אחד לכל התהליך
+# ============================================================================
+# Cache, single-flight, circuit breakers, מונים וסטטיסטיקות - הכל על אותו מופע.
+# app, PredictionContextFetcher, ai_predictor, ה-poller וה-prefetcher מקבלים
+# אותו client דרך get_sports_api() - לא יוצרים SportsAPIManager() משלהם.
+_sports_api_instance: Optional[SportsAPIManager] = None
+
+
+def get_sports_api() -> SportsAPIManager:
+    """
+    Get Sports API manager singleton
+
+    Returns:
+        SportsAPIManager: המופע המשותף (נוצר בקריאה הראשונה)
+    """
+    global _sports_api_instance
+    if _sports_api_instance is None:
+        _sports_api_instance = SportsAPIManager()
+    return _sports_api_instance
+
+
+sports_api = get_sports_api()
 
 
 # ============================================================================
@@ -197,16 +197,18 @@ async def get_live_scores():
     --------
     Dict with success, scores list, and timestamp
     """
-    from backend.app import logger
+    from backend.app import logger, live_poller, json_response
     
     try:
-        # TODO: אינטגרציה עם Sports API לתוצאות חיות
-        # כרגע מחזיר mock data
-        return {
+        # מה-LiveScorePoller (זיכרון, בלי קריאת API); push: /api/live/stream או /ws/live
+        # FixtureRecord מקודד דרך to_json (to_dict) - ה-encoder של FastAPI מאבד את התוצאה והזמן
+        scores = live_poller.snapshot() if live_poller is not None else []
+        return json_response({
             "success": True,
-            "scores": [],
+            "scores": scores,
+            "seq": live_poller.seq if live_poller is not None else None,
             "timestamp": datetime.now(timezone.utc).isoformat()
-        }
+        })
     except Exception as e:
         logger.error(f"❌ Live scores error: {e}")
         return {"success": False, "scores": []}
@@ -0,0 +1,513 @@
+"""
+🆔 Team Index - שם קבוצה → מזהה API-Sports
+Created by: Rafael & AI Assistant
+Version: 1.0
+
+מטרה:
+prediction_context_fetcher דילג על פורמה ו-H2H ("need team_id"), ו-ai_analyze_match
+מצא מזהי קבוצות בסריקת כל הטבלה עם substring דו-כיווני. כאן יש אינדקס אחד:
+
+✅ נבנה מ-payloads של /standings, /teams ו-/fixtures (כל מה שכבר עובר דרך SportsAPIManager)
+✅ כינויים: עברית ("מכבי חיפה"), קיצורים ("Man City", "PSG") ושמות מ-Dictionary_of_groups.json
+✅ שם מנורמל → מזהה ב-dict hit; שגיאות כתיב → אינדקס trigrams (בלי לסרוק את כל הקבוצות)
+✅ נשמר ל-JSON (TEAM_INDEX_PATH) ונטען באתחול - המזהים לא הולכים לאיבוד ב-restart
+   השמירה מרוכזת (debounce) ב-thread ברקע - ingest מתוך ה-event loop לא כותב לדיסק
+
+Usage:
+    from team_index import team_index
+
+    team_index.add_standings(standings, league_id=39)
+    team_id = team_index.resolve("מנצ'סטר סיטי", league_id=39)   # → 50
+"""
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+try:
+    from fixture_index import normalize_team_name
+except ImportError:
+    from backend.fixture_index import normalize_team_name
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+BASE_DIR = Path(__file__).resolve().parent
+DEFAULT_INDEX_PATH = os.getenv("TEAM_INDEX_PATH", str(BASE_DIR / "data" / "team_index.json"))
+
+# כמה שניות לחכות אחרי שינוי לפני כתיבה לדיסק (כל השינויים בחלון = כתיבה אחת)
+SAVE_DELAY_SECONDS = float(os.getenv("TEAM_INDEX_SAVE_DELAY", "5"))
+DICTIONARY_CANDIDATES = (
+    BASE_DIR / "Dictionary_of_groups.json",
+    BASE_DIR.parent / "Dictionary_of_groups.json",
+)
+
+# 🔤 כינוי → השם ב-API-Sports (עברית, קיצורים, ושמות מהמילון ששונים מה-API)
+TEAM_ALIASES: Dict[str, str] = {
+    # ישראל
+    "מכבי תל אביב": "Maccabi Tel Aviv",
+    "מכבי חיפה": "Maccabi Haifa",
+    "הפועל באר שבע": "Hapoel Beer Sheva",
+    "בית\"ר ירושלים": "Beitar Jerusalem",
+    "ביתר ירושלים": "Beitar Jerusalem",
+    "הפועל תל אביב": "Hapoel Tel Aviv",
+    "הפועל ירושלים": "Hapoel Jerusalem",
+    "הפועל חיפה": "Hapoel Haifa",
+    "מכבי נתניה": "Maccabi Netanya",
+    "מכבי פתח תקווה": "Maccabi Petah Tikva",
+    "בני סכנין": "Bnei Sakhnin",
+    "בני יהודה": "Bnei Yehuda",
+    "עירוני קריית שמונה": "Ironi Kiryat Shmona",
+    # אירופה
+    "ריאל מדריד": "Real Madrid",
+    "ברצלונה": "Barcelona",
+    "אתלטיקו מדריד": "Atletico Madrid",
+    "מנצ'סטר סיטי": "Manchester City",
+    "מנצ'סטר יונייטד": "Manchester United",
+    "ליברפול": "Liverpool",
+    "ארסנל": "Arsenal",
+    "צ'לסי": "Chelsea",
+    "טוטנהאם": "Tottenham",
+    "באיירן מינכן": "Bayern München",
+    "בורוסיה דורטמונד": "Borussia Dortmund",
+    "פריז סן ז'רמן": "Paris Saint Germain",
+    "מרסיי": "Marseille",
+    "יובנטוס": "Juventus",
+    "אינטר מילאן": "Inter",
+    "מילאן": "AC Milan",
+    "נאפולי": "Napoli",
+    # קיצורים נפוצים
+    "Man City": "Manchester City",
+    "Man United": "Manchester United",
+    "Man Utd": "Manchester United",
+    "Spurs": "Tottenham",
+    "PSG": "Paris Saint Germain",
+    "Barca": "Barcelona",
+    "Atleti": "Atletico Madrid",
+    "Inter Milan": "Inter",
+    "Bayern Munich": "Bayern München",
+    # שמות מ-Dictionary_of_groups.json ששונים מה-API
+    "Tottenham Hotspur": "Tottenham",
+    "West Ham United": "West Ham",
+    "Newcastle United": "Newcastle",
+    "Brighton & Hove Albion": "Brighton",
+    "Wolverhampton Wanderers": "Wolves",
+    "Athletic Bilbao": "Athletic Club",
+    "Paris Saint-Germain": "Paris Saint Germain",
+}
+
+# התאמה עמומה: ציון Dice מינימלי, ופער מינימלי מהמועמד השני ("Hapoel Tel Aviv" ≠ "Maccabi Tel Aviv")
+FUZZY_THRESHOLD = 0.75
+FUZZY_MARGIN = 0.15
+
+
+def _trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamIndex:
+    """
+    🆔 אינדקס קבוצות: id → רשומה, שם מנורמל → ids, trigram → שמות
+
+    רשומה: {"id", "name", "code", "country", "logo", "leagues": [...]}
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = DEFAULT_INDEX_PATH,
+        dictionary_path: Optional[Path] = None,
+        save_delay: float = SAVE_DELAY_SECONDS
+    ):
+        """
+        Args:
+            path: קובץ JSON לשמירה (None = בזיכרון בלבד)
+            dictionary_path: Dictionary_of_groups.json (None = חיפוש אוטומטי)
+            save_delay: שניות מהשינוי הראשון עד הכתיבה לדיסק (debounce)
+        """
+        self.path = Path(path) if path else None
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._saves = 0
+
+        self._teams: Dict[int, Dict[str, Any]] = {}
+        self._by_name: Dict[str, List[int]] = {}
+        self._aliases: Dict[str, str] = {}
+        self._custom_aliases: Dict[str, str] = {}
+        self._trigram_index: Dict[str, Set[str]] = {}
+
+        # Statistics
+        self._lookups = 0
+        self._exact_hits = 0
+        self._fuzzy_hits = 0
+        self._misses = 0
+
+        for alias, name in TEAM_ALIASES.items():
+            self._register_alias(alias, name)
+        self.load_dictionary(dictionary_path)
+        self._load()
+
+    # ============================================================
+    # 📥 Ingestion
+    # ============================================================
+
+    def add_team(
+        self,
+        team_id: Optional[int],
+        name: Optional[str],
+        league_id: Optional[int] = None,
+        **details: Any
+    ) -> bool:
+        """
+        הוסף / עדכן קבוצה
+
+        Returns:
+            True אם משהו השתנה (קבוצה חדשה, שם חדש או ליגה חדשה)
+        """
+        if not team_id or not name:
+            return False
+
+        with self._lock:
+            record = self._teams.get(team_id)
+            changed = False
+
+            if record is None:
+                record = {"id": team_id, "name": name, "code": None, "country": None, "logo": None, "leagues": []}
+                self._teams[team_id] = record
+                changed = True
+            elif record["name"] != name:
+                self._unindex_name(record["name"], team_id)
+                record["name"] = name
+                changed = True
+
+            for field_name, value in details.items():
+                if value and record.get(field_name) != value:
+                    record[field_name] = value
+                    changed = True
+
+            if league_id and league_id not in record["leagues"]:
+                record["leagues"].append(league_id)
+                changed = True
+
+            if changed:
+                self._index_name(name, team_id)
+                if record.get("code"):
+                    self._index_name(record["code"], team_id)
+            return changed
+
+    def add_standings(self, standings: Any, league_id: Optional[int] = None) -> int:
+        """
+        הוסף קבוצות מ-/standings (התשובה הגולמית או רשימת השורות)
+
+        Returns:
+            כמה רשומות השתנו
+        """
+        changed = 0
+        for row in self.standing_rows(standings):
+            team = row.get("team")
+            if isinstance(team, dict):
+                changed += self.add_team(team.get("id"), team.get("name"), league_id, logo=team.get("logo"))
+        return self._finish_batch(changed)
+
+    def add_teams(self, teams: Iterable[Dict], league_id: Optional[int] = None) -> int:
+        """הוסף קבוצות מ-/teams ([{"team": {...}, "venue": {...}}])"""
+        changed = 0
+        for item in teams or ():
+            team = item.get("team", item) if isinstance(item, dict) else None
+            if team:
+                changed += self.add_team(
+                    team.get("id"), team.get("name"), league_id,
+                    code=team.get("code"), country=team.get("country"), logo=team.get("logo")
+                )
+        return self._finish_batch(changed)
+
+    def add_fixtures(self, fixtures: Iterable[Dict]) -> int:
+        """הוסף קבוצות ממשחקים מפורסרים (home_id / away_id / league_id)"""
+        changed = 0
+        for fixture in fixtures or ():
+            league_id = fixture.get("league_id")
+            changed += self.add_team(fixture.get("home_id"), fixture.get("home_team"), league_id,
+                                     logo=fixture.get("home_logo"))
+            changed += self.add_team(fixture.get("away_id"), fixture.get("away_team"), league_id,
+                                     logo=fixture.get("away_logo"))
+        return self._finish_batch(changed)
+
+    def add_alias(self, alias: str, name: str) -> None:
+        """הוסף כינוי (נשמר לקובץ)"""
+        with self._lock:
+            self._register_alias(alias, name)
+            self._custom_aliases[alias] = name
+        self._schedule_save()
+
+    def load_dictionary(self, dictionary_path: Optional[Path] = None) -> int:
+        """טען שמות מ-Dictionary_of_groups.json כמילון לחיפוש fuzzy"""
+        candidates = (dictionary_path,) if dictionary_path else DICTIONARY_CANDIDATES
+        for path in candidates:
+            if path and Path(path).exists():
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        dictionary = json.load(f)
+                except Exception as e:
+                    logger.warning(f"⚠️ Team index: failed to read {path}: {e}")
+                    return 0
+
+                count = 0
+                for league in dictionary.get("leagues", {}).values():
+                    for competition in league.get("competitions", []):
+                        for name in competition.get("teams", []):
+                            self._register_alias(name, TEAM_ALIASES.get(name, name))
+                            count += 1
+                return count
+        return 0
+
+    @staticmethod
+    def standing_rows(standings: Any) -> List[Dict]:
+        """שורות הטבלה מתוך התשובה הגולמית של /standings (או רשימת שורות)"""
+        if not standings or not isinstance(standings, list):
+            return []
+        first = standings[0]
+        if isinstance(first, dict) and "league" in first:
+            groups = first["league"].get("standings") or []
+            return [row for group in groups for row in group]
+        return [row for row in standings if isinstance(row, dict)]
+
+    def _finish_batch(self, changed: int) -> int:
+        if changed:
+            self._schedule_save()
+        return changed
+
+    # ============================================================
+    # 🗂️ Internal indexes
+    # ============================================================
+
+    def _index_term(self, term: str) -> None:
+        for gram in _trigrams(term):
+            self._trigram_index.setdefault(gram, set()).add(term)
+
+    def _index_name(self, name: str, team_id: int) -> None:
+        term = normalize_team_name(name)
+        if not term:
+            return
+        ids = self._by_name.setdefault(term, [])
+        if team_id not in ids:
+            ids.append(team_id)
+        self._index_term(term)
+
+    def _unindex_name(self, name: str, team_id: int) -> None:
+        term = normalize_team_name(name)
+        ids = self._by_name.get(term)
+        if ids and team_id in ids:
+            ids.remove(team_id)
+            if not ids:
+                del self._by_name[term]
+
+    def _register_alias(self, alias: str, name: str) -> None:
+        alias_term, target = normalize_team_name(alias), normalize_team_name(name)
+        if alias_term and target:
+            self._aliases[alias_term] = target
+            self._index_term(alias_term)
+
+    # ============================================================
+    # 🔍 Lookup
+    # ============================================================
+
+    def _pick(self, ids: List[int], league_id: Optional[int]) -> Optional[int]:
+        """כמה קבוצות עם אותו שם ("Barcelona", "Barcelona SC") - עדיפות לליגה המבוקשת"""
+        if league_id:
+            for team_id in ids:
+                if league_id in self._teams[team_id]["leagues"]:
+                    return team_id
+        return ids[0] if ids else None
+
+    def _exact(self, term: str, league_id: Optional[int]) -> Optional[int]:
+        ids = self._by_name.get(term) or self._by_name.get(self._aliases.get(term, ""))
+        return self._pick(ids, league_id) if ids else None
+
+    def _fuzzy(self, term: str, league_id: Optional[int]) -> Optional[int]:
+        """
+        התאמה לפי trigrams (Dice) - רק על שמות שחולקים trigram עם השאילתה
+
+        עם league_id רק קבוצות מהליגה המבוקשת נחשבות. מחזיר מזהה רק אם הציון
+        עובר את FUZZY_THRESHOLD ועוקף את הקבוצה השנייה ב-FUZZY_MARGIN לפחות -
+        שם דו-משמעי ("Hapoel Haifa" מול "Hapoel Hadera") עדיף None על פני קבוצה שגויה.
+        """
+        grams = _trigrams(term)
+        shared = Counter(
+            candidate
+            for gram in grams
+            for candidate in self._trigram_index.get(gram, ())
+        )
+
+        scores: Dict[int, float] = {}
+        for candidate, common in shared.items():
+            ids = self._by_name.get(candidate) or self._by_name.get(self._aliases.get(candidate, ""))
+            if not ids:
+                continue
+            score = 2 * common / (len(grams) + len(_trigrams(candidate)))
+            for team_id in ids:
+                if league_id and league_id not in self._teams[team_id]["leagues"]:
+                    continue
+                if score > scores.get(team_id, 0.0):
+                    scores[team_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] < FUZZY_THRESHOLD:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < FUZZY_MARGIN:
+            return None
+        return ranked[0][0]
+
+    def resolve(self, name: str, league_id: Optional[int] = None, fuzzy: bool = True) -> Optional[int]:
+        """
+        🔍 שם קבוצה (עברית / אנגלית / כינוי / עם שגיאת כתיב) → מזהה API-Sports
+
+        Args:
+            name: שם הקבוצה
+            league_id: ליגה מועדפת כשיש כמה קבוצות מתאימות (בהתאמה עמומה - רק ממנה)
+            fuzzy: False = רק שם / כינוי מדויק (למשל לפני טעינת /teams של הליגה)
+
+        Returns:
+            מזהה הקבוצה, או None אם לא נמצאה
+        """
+        term = normalize_team_name(name)
+        if not term:
+            return None
+
+        with self._lock:
+            self._lookups += 1
+            team_id = self._exact(term, league_id)
+            if team_id is not None:
+                self._exact_hits += 1
+                return team_id
+
+            team_id = self._fuzzy(term, league_id) if fuzzy else None
+            if team_id is not None:
+                self._fuzzy_hits += 1
+                return team_id
+
+            self._misses += 1
+            return None
+
+    def get_team(self, team_id: int) -> Optional[Dict[str, Any]]:
+        """רשומת הקבוצה לפי מזהה"""
+        record = self._teams.get(team_id)
+        return dict(record) if record else None
+
+    def lookup(self, name: str, league_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """רשומת הקבוצה לפי שם"""
+        team_id = self.resolve(name, league_id)
+        return self.get_team(team_id) if team_id is not None else None
+
+    def teams_in_league(self, league_id: int) -> List[Dict[str, Any]]:
+        return [dict(record) for record in self._teams.values() if league_id in record["leagues"]]
+
+    # ============================================================
+    # 💾 Persistence
+    # ============================================================
+
+    def _schedule_save(self) -> None:
+        """סמן שינוי ותזמן flush אחד בעוד save_delay שניות (thread ברקע)"""
+        if self.path is None:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.save_delay, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> bool:
+        """
+        💾 שמור עכשיו אם יש שינויים שלא נשמרו (מה-timer, ב-SHUTDOWN וב-atexit)
+
+        Returns:
+            True אם נכתב קובץ
+        """
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty, self._dirty = self._dirty, False
+        if timer is not None and timer is not threading.current_thread():
+            timer.cancel()
+        if dirty:
+            self.save()
+        return dirty
+
+    def save(self) -> None:
+        """שמירה ל-JSON (כתיבה אטומית) - snapshot תחת lock, הכתיבה עצמה בלעדיו"""
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {
+                "version": 1,
+                "teams": [dict(record, leagues=list(record["leagues"])) for record in self._teams.values()],
+                "aliases": dict(self._custom_aliases)
+            }
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # קובץ זמני ייחודי לכל כתיבה - כמה workers ששומרים יחד לא כותבים לאותו .tmp
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent,
+                prefix=f".{self.path.name}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._saves += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Team index: save failed: {e}")
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Team index: load failed: {e}")
+            return
+
+        for record in payload.get("teams", []):
+            leagues = record.get("leagues") or [None]
+            for league_id in leagues:
+                self.add_team(
+                    record.get("id"), record.get("name"), league_id,
+                    code=record.get("code"), country=record.get("country"), logo=record.get("logo")
+                )
+        for alias, name in payload.get("aliases", {}).items():
+            self._register_alias(alias, name)
+            self._custom_aliases[alias] = name
+
+        logger.info(f"🆔 Team index loaded: {len(self._teams)} teams from {self.path}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "teams": len(self._teams),
+            "names": len(self._by_name),
+            "aliases": len(self._aliases),
+            "lookups": self._lookups,
+            "exact_hits": self._exact_hits,
+            "fuzzy_hits": self._fuzzy_hits,
+            "misses": self._misses,
+            "saves": self._saves,
+            "pending_save": self._dirty
+        }
+
+
+# 🌍 Global instance (singleton)
+team_index = TeamIndex()
+atexit.register(team_index.flush)
@@ -0,0 +1,63 @@
+"""
+🧪 CacheManager - תקציב בתים (max_bytes): LRU, ערכים גדולים מחלק ה-shard, דחייה
+"""
+
+import asyncio
+
+from cache_manager import CacheManager, estimate_size
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def total_bytes(cache: CacheManager) -> int:
+    return sum(shard.total_bytes for shard in cache._shards)
+
+
+def test_byte_budget_evicts_least_recently_used():
+    value = {"payload": "x" * 200}
+    size = estimate_size("key:0", value)
+    cache = CacheManager(max_entries=None, max_bytes=size * 3)
+
+    async def scenario():
+        for i in range(3):
+            await cache.set(f"key:{i}", value, ttl=60)
+        await cache.get("key:0")                      # key:0 חוזר לסוף ה-LRU
+        await cache.set("key:3", value, ttl=60)       # מפנה את key:1
+
+    run(scenario())
+    assert cache.contains("key:0")
+    assert not cache.contains("key:1")
+    assert cache.contains("key:2") and cache.contains("key:3")
+    assert total_bytes(cache) <= size * 3
+
+
+def test_value_larger_than_shard_share_is_cached():
+    small = {"payload": "x" * 100}
+    large = {"payload": "x" * 5000}
+    budget = estimate_size("fixtures:2026-03-14", large) * 2
+    cache = CacheManager(max_entries=None, max_bytes=budget, shards=16)
+
+    async def scenario():
+        for i in range(100):
+            await cache.set(f"key:{i}", small, ttl=60)
+        await cache.set("fixtures:2026-03-14", large, ttl=60)
+
+    run(scenario())
+    assert cache.contains("fixtures:2026-03-14")
+    assert total_bytes(cache) <= budget
+    assert cache.get_stats()["rejected_oversize"] == 0
+
+
+def test_value_larger_than_budget_is_rejected_and_counted():
+    cache = CacheManager(max_entries=None, max_bytes=100)
+
+    async def scenario():
+        await cache.set("small", {"a": 1}, ttl=60)
+        await cache.set("huge", {"payload": "x" * 1000}, ttl=60)
+
+    run(scenario())
+    assert cache.contains("small")
+    assert not cache.contains("huge")
+    assert cache.get_stats()["rejected_oversize"] == 1
@@ -0,0 +1,42 @@
+"""
+🧪 CacheManager - ביטול ערכים תלויים (dependency_tag) ב-L1 ובין workers
+"""
+
+import asyncio
+
+from cache_manager import CacheManager, dependency_tag
+from cache_store import SQLiteCacheStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_set_invalidates_dependents_in_l1():
+    cache = CacheManager(shards=4)
+
+    async def scenario():
+        await cache.set("standings:39:2025", [1], ttl=60)
+        await cache.set("context:39:a:b", {"bundle": 1}, ttl=60, tags=[dependency_tag("standings:39:2025")])
+        await cache.set("context:39:c:d", {"bundle": 2}, ttl=60)
+        await cache.set("standings:39:2025", [2], ttl=60)
+
+    run(scenario())
+    assert not cache.contains("context:39:a:b")
+    assert cache.contains("context:39:c:d")
+
+
+def test_set_invalidates_dependents_across_workers(tmp_path):
+    path = str(tmp_path / "l2.sqlite3")
+    worker_a = CacheManager(l2=SQLiteCacheStore(path))
+    worker_b = CacheManager(l2=SQLiteCacheStore(path))
+    worker_b._worker_id = "worker-b"
+
+    async def scenario():
+        await worker_a.set("context:39:a:b", {"bundle": 1}, ttl=60, tags=[dependency_tag("standings:39:2025")])
+        await worker_b.set("standings:39:2025", [2], ttl=60)
+        await worker_a.sync_with_backend()
+
+    run(scenario())
+    assert worker_a._l2.get("context:39:a:b") is None
+    assert not worker_a.contains("context:39:a:b")
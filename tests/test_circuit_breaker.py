@@ -0,0 +1,66 @@
+"""
+🧪 CircuitBreaker - closed → open → half_open → closed / open
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from http_client import CircuitBreaker  # noqa: E402
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("api.test", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.get_stats()["rejected"] == 1
+    assert breaker.retry_in() > 0
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker("api.test", failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_single_probe_then_closes():
+    breaker = CircuitBreaker("api.test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()        # probe
+    assert not breaker.allow()    # probe אחד בכל פעם
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens():
+    breaker = CircuitBreaker("api.test", failure_threshold=5, reset_timeout=0.05)
+    breaker.trip()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+    breaker.record_failure()      # כישלון אחד ב-half_open מספיק
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.get_stats()["times_opened"] == 2
+
+
+def test_trip_honours_retry_after():
+    breaker = CircuitBreaker("api.test", reset_timeout=0.01)
+    breaker.trip(60)
+    time.sleep(0.02)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in() > 50
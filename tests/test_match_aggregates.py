@@ -0,0 +1,95 @@
+"""
+🧪 match_aggregates - פורמה ו-H2H זהים במסלול הווקטורי (NumPy) וב-fallback ב-Python
+"""
+
+import pytest
+
+import match_aggregates
+from match_aggregates import FixtureHistory, batch_form, batch_h2h
+
+
+@pytest.fixture(params=["numpy", "python"])
+def path(request, monkeypatch):
+    """כל טסט רץ פעמיים: עם NumPy ועם ה-fallback"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+        monkeypatch.setattr(match_aggregates, "NUMPY_AVAILABLE", True)
+    else:
+        monkeypatch.setattr(match_aggregates, "NUMPY_AVAILABLE", False)
+    return request.param
+
+
+def _api_item(fixture_id, home, away, home_goals, away_goals, timestamp, status="FT"):
+    return {
+        "fixture": {"id": fixture_id, "timestamp": timestamp, "date": "2026-01-01", "status": {"short": status}},
+        "teams": {"home": {"id": home, "name": str(home)}, "away": {"id": away, "name": str(away)}},
+        "goals": {"home": home_goals, "away": away_goals}
+    }
+
+
+def test_equal_timestamps_ordered_by_fixture_id(path):
+    history = FixtureHistory([
+        (1, 2, 1, 0, 100, 7),   # W
+        (2, 1, 0, 0, 100, 9),   # D - אותו זמן, מזהה גבוה יותר = אחרון
+        (1, 3, 0, 2, 50, 3),    # L
+    ], [{}, {}, {}])
+    assert batch_form(history, [1])[1]["form"] == "DWL"
+    assert batch_form(history, [1], last=1)[1]["form"] == "D"
+
+
+def test_equal_timestamps_h2h_keeps_latest_by_fixture_id(path):
+    history = FixtureHistory([(1, 2, 2, 0, 100, 4), (2, 1, 1, 0, 100, 5), (1, 2, 0, 0, 90, 6)], [{}, {}, {}])
+    summary = batch_h2h(history, [(1, 2)], last=1)[0]
+    assert (summary["total_matches"], summary["matches_analyzed"]) == (3, 1)
+    assert (summary["team1_wins"], summary["team2_wins"]) == (0, 1)   # fixture 5 (ts=100, id גבוה)
+
+
+def test_h2h_oriented_by_requested_team(path):
+    history = FixtureHistory([(10, 20, 2, 0, 3, 1), (20, 10, 1, 1, 2, 2), (10, 20, 3, 1, 1, 3)], [{}, {}, {}])
+    forward, backward = batch_h2h(history, [(10, 20), (20, 10)])
+    assert (forward["team1_wins"], forward["team2_wins"], forward["draws"]) == (2, 0, 1)
+    assert (backward["team1_wins"], backward["team2_wins"], backward["draws"]) == (0, 2, 1)
+    assert forward["total_goals_team1"] == backward["total_goals_team2"] == 6
+
+
+def test_unfinished_and_scoreless_fixtures_are_ignored(path):
+    history = FixtureHistory.from_api([
+        _api_item(1, 1, 2, 2, 1, 300),
+        _api_item(2, 1, 2, None, None, 400, status="NS"),
+        _api_item(3, 2, 1, 1, 1, 500, status="1H"),
+        _api_item(4, 1, 2, None, 0, 200),
+        _api_item(5, 2, 1, 0, 3, 100, status="AET"),
+    ])
+    assert len(history) == 2
+    assert batch_form(history, [1])[1]["form"] == "WW"
+    assert batch_h2h(history, [(1, 2)])[0]["total_matches"] == 2
+
+    from_matches = FixtureHistory.from_matches([
+        {"id": 1, "home_id": 1, "away_id": 2, "home_score": 2, "away_score": 1, "timestamp": 300, "status": "FT"},
+        {"id": 2, "home_id": 1, "away_id": 2, "home_score": None, "away_score": None, "timestamp": 400, "status": "NS"},
+        {"id": 3, "home_id": None, "away_id": 2, "home_score": 1, "away_score": 0, "timestamp": 500, "status": "FT"},
+    ])
+    assert len(from_matches) == 1
+
+
+def test_team_without_history(path):
+    history = FixtureHistory([(1, 2, 1, 0, 100, 1)], [{}])
+    assert batch_form(history, [99])[99]["form"] == ""
+    assert batch_h2h(history, [(1, 99)])[0]["total_matches"] == 0
+
+
+def test_numpy_matches_python_fallback(monkeypatch):
+    pytest.importorskip("numpy")
+    items = [
+        _api_item(11, 1, 2, 1, 0, 100), _api_item(12, 2, 1, 2, 2, 100), _api_item(13, 3, 1, 0, 1, 100),
+        _api_item(14, 1, 3, 3, 3, 90), _api_item(15, 2, 3, 1, 2, 80), _api_item(16, 3, 2, 0, 0, 80),
+        _api_item(17, 1, 2, 4, 1, 70, status="PEN"), _api_item(18, 2, 1, 1, 0, 60, status="NS"),
+    ]
+    pairs = [(1, 2), (2, 1), (1, 3), (2, 3), (1, 99)]
+
+    results = {}
+    for numpy_enabled in (True, False):
+        monkeypatch.setattr(match_aggregates, "NUMPY_AVAILABLE", numpy_enabled)
+        history = FixtureHistory.from_api(items)
+        results[numpy_enabled] = (batch_form(history, [1, 2, 3, 99], 3), batch_h2h(history, pairs, 2))
+    assert results[True] == results[False]
@@ -0,0 +1,40 @@
+"""
+🧪 CacheManager - single-flight: טעינה אחת לכל מפתח גם תחת עומס
+"""
+
+import asyncio
+
+from cache_manager import CacheManager
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_single_flight_coalesces_concurrent_misses():
+    cache = CacheManager()
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": calls}
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get_or_load("standings:39:2025", loader, ttl=60) for _ in range(50)))
+
+    results = run(scenario())
+    assert calls == 1
+    assert all(result == {"value": 1} for result in results)
+
+
+def test_failed_load_is_not_cached():
+    cache = CacheManager()
+
+    async def scenario():
+        first = await cache.get_or_load("live:all", lambda: asyncio.sleep(0, result=None), ttl=60)
+        second = await cache.get_or_load("live:all", lambda: asyncio.sleep(0, result=[1]), ttl=60)
+        return first, second
+
+    assert run(scenario()) == (None, [1])
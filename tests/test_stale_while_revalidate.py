@@ -0,0 +1,51 @@
+"""
+🧪 CacheManager - stale-while-revalidate: soft / hard TTL ורענון אחד ברקע
+"""
+
+import asyncio
+import time
+
+from cache_manager import CacheManager
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_stale_value_served_while_refreshing_once():
+    cache = CacheManager()
+    loads = []
+
+    async def loader():
+        loads.append(len(loads) + 1)
+        await asyncio.sleep(0.01)
+        return len(loads)
+
+    async def scenario():
+        assert await cache.get_or_load("h2h:1:2", loader, ttl=60, stale_ttl=600) == 1
+        entry = cache._shard_for("h2h:1:2").entries["h2h:1:2"]
+        entry.expires_at = time.monotonic() - 1  # soft TTL עבר, hard TTL עוד לא
+
+        stale = await asyncio.gather(*(cache.get_or_load("h2h:1:2", loader, ttl=60, stale_ttl=600)
+                                       for _ in range(10)))
+        await asyncio.sleep(0.05)
+        return stale, await cache.get("h2h:1:2")
+
+    stale, refreshed = run(scenario())
+    assert stale == [1] * 10          # הערך הישן מוגש מיד
+    assert refreshed == 2             # רענון אחד ברקע
+    assert loads == [1, 2]
+    assert cache.get_stats()["background_refreshes"] == 1
+
+
+def test_hard_expired_value_is_not_served():
+    cache = CacheManager()
+
+    async def scenario():
+        await cache.set("team_stats:1", {"goals": 3}, ttl=60, stale_ttl=60)
+        entry = cache._shard_for("team_stats:1").entries["team_stats:1"]
+        entry.expires_at = entry.hard_expires_at = time.monotonic() - 1
+        return await cache.get("team_stats:1")
+
+    assert run(scenario()) is None
+    assert not cache.contains("team_stats:1")